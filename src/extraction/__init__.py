@@ -92,6 +92,7 @@ from .local_analyst import (
     CAMPOS_PROBATORIOS,
     AnalysisNotes,
     analyze_evidence,
+    analyze_evidence_batch,
 )
 
 __all__ = [
@@ -114,6 +115,7 @@ __all__ = [
     # local_analyst.py (Capa C)
     "AnalysisNotes",
     "analyze_evidence",
+    "analyze_evidence_batch",
     "CAMPOS_PROBATORIOS",
     # confidence_router.py (Tarea #18)
     "VERSION_ROUTER",
@@ -874,7 +874,6 @@ class EscribanoFiel:
 
                 doc = fitz.open(str(path))
                 num_paginas = len(doc)
-                doc.close()
             except ImportError:
                 # Sin PyMuPDF, no podemos renderizar
                 return ResultadoPaso(
@@ -892,35 +891,42 @@ class EscribanoFiel:
                 context={"num_paginas": num_paginas},
             )
 
-            for i in range(num_paginas):
-                page_num = i + 1
-                img = renderizar_pagina(path, page_num, dpi=self._config.dpi_render)
-                if img is None:
+            # Un solo documento abierto y una sola matriz de render para todas
+            # las páginas (evita re-parsear el PDF en cada página).
+            dpi = self._config.dpi_render
+            matriz = fitz.Matrix(dpi / 72, dpi / 72)
+            try:
+                for i in range(num_paginas):
+                    page_num = i + 1
+                    img = renderizar_pagina(doc, page_num, dpi=dpi, matrix=matriz)
+                    if img is None:
+                        paginas_resultado.append(
+                            {
+                                "pagina": page_num,
+                                "texto": "",
+                                "confianza": 0.0,
+                                "error": "No se pudo renderizar",
+                            }
+                        )
+                        continue
+
+                    resultado_ocr = ejecutar_ocr(
+                        img,
+                        lang=self._config.idioma_ocr,
+                        trace_logger=self._logger,
+                    )
                     paginas_resultado.append(
                         {
                             "pagina": page_num,
-                            "texto": "",
-                            "confianza": 0.0,
-                            "error": "No se pudo renderizar",
+                            "texto": resultado_ocr.get("texto_completo", ""),
+                            "confianza": resultado_ocr.get("confianza_promedio", 0.0),
+                            "motor": resultado_ocr.get("motor_ocr", "none"),
+                            "lineas": resultado_ocr.get("lineas", []),
+                            "num_palabras": resultado_ocr.get("num_palabras", 0),
                         }
                     )
-                    continue
-
-                resultado_ocr = ejecutar_ocr(
-                    img,
-                    lang=self._config.idioma_ocr,
-                    trace_logger=self._logger,
-                )
-                paginas_resultado.append(
-                    {
-                        "pagina": page_num,
-                        "texto": resultado_ocr.get("texto_completo", ""),
-                        "confianza": resultado_ocr.get("confianza_promedio", 0.0),
-                        "motor": resultado_ocr.get("motor_ocr", "none"),
-                        "lineas": resultado_ocr.get("lineas", []),
-                        "num_palabras": resultado_ocr.get("num_palabras", 0),
-                    }
-                )
+            finally:
+                doc.close()
 
             total_palabras = sum(p.get("num_palabras", 0) for p in paginas_resultado)
             self._logger.info(
@@ -37,9 +37,10 @@ import hashlib
 import json
 import os
 import sys
+from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 # Asegurar que el directorio raíz del proyecto esté en el path
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -58,6 +59,24 @@ from src.extraction.abstencion import (
 VERSION_CONTRATO = "1.0.0"
 TOLERANCIA_ARITMETICA = 0.02  # ±0.02 soles
 
+# Dataclasses hoja instanciadas en volumen usan __slots__ (sin __dict__ por
+# instancia) cuando el intérprete lo soporta (Python 3.10+).
+_DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _intern(valor: Any) -> Any:
+    """
+    Interna strings de baja cardinalidad (status, naturaleza, categoría)
+    para compartir una sola copia entre miles de expedientes y acelerar
+    comparaciones. Valores no-str se devuelven sin cambios.
+    """
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+# Default inmutable para iterar listas ausentes en from_dict sin asignar
+# una lista nueva por llamada. Solo se itera; nunca se almacena.
+_SIN_ELEMENTOS: tuple = ()
+
 
 # ==============================================================================
 # ENUMERACIONES ESPECÍFICAS DEL CONTRATO
@@ -602,7 +621,7 @@ class ComprobanteExtraido:
             grupo_b=DatosComprobante.from_dict(data.get("grupo_b")),
             grupo_c=DatosAdquirente.from_dict(data.get("grupo_c")),
             grupo_d=CondicionesComerciales.from_dict(data.get("grupo_d")),
-            grupo_e=[ItemDetalle.from_dict(i) for i in data.get("grupo_e", [])],
+            grupo_e=[ItemDetalle.from_dict(i) for i in data.get("grupo_e", _SIN_ELEMENTOS)],
             grupo_f=TotalesTributos.from_dict(data.get("grupo_f")),
             grupo_g=ClasificacionGasto.from_dict(data.get("grupo_g")),
             grupo_h=DatosHospedaje.from_dict(data.get("grupo_h")) if data.get("grupo_h") else None,
@@ -831,18 +850,74 @@ class DatosAnexo3:
         kwargs = {}
         for f in campo_fields:
             kwargs[f] = CampoExtraido.from_dict(data[f]) if data.get(f) else None
-        kwargs["items"] = [ItemAnexo3.from_dict(i) for i in data.get("items", [])]
+        kwargs["items"] = [ItemAnexo3.from_dict(i) for i in data.get("items", _SIN_ELEMENTOS)]
         kwargs["metadatos"] = MetadatosExtraccion.from_dict(data.get("metadatos"))
         return cls(**kwargs)
 
 
+# ==============================================================================
+# SERIALIZACIÓN POR ESQUEMA (contenedores de nivel expediente)
+# ==============================================================================
+
+# Tipos de entrada en _SCHEMA: (nombre, tipo, conversor)
+_PLANO = 0  # valor tal cual; conversor opcional al leer (ej. _intern)
+_ANIDADO = 1  # Optional[X]: X.to_dict() / X.from_dict() si hay dato, sino None
+_LISTA = 2  # List[X]
+_ANIDADO_REQUERIDO = 3  # X siempre presente; X.from_dict() maneja dato vacío
+
+
+class FastSerializableMixin:
+    """
+    to_dict()/from_dict() genéricos guiados por una tabla _SCHEMA de clase.
+
+    Cada clase declara _SCHEMA = ((nombre, tipo, conversor), ...) en orden
+    de declaración de campos; un único bucle serializa todos los campos en
+    lugar de un cuerpo escrito a mano por clase. Las claves ausentes en
+    from_dict conservan el default de la dataclass.
+    """
+
+    __slots__ = ()
+    _SCHEMA: ClassVar[Tuple[Tuple[str, int, Any], ...]] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {}
+        for nombre, tipo, _ in self._SCHEMA:
+            v = getattr(self, nombre)
+            if tipo == _PLANO:
+                result[nombre] = v
+            elif tipo == _LISTA:
+                result[nombre] = [x.to_dict() for x in v]
+            else:
+                result[nombre] = v.to_dict() if v is not None else None
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]):
+        if not data:
+            return cls()
+        kwargs = {}
+        for nombre, tipo, conv in cls._SCHEMA:
+            if nombre not in data:
+                continue
+            v = data[nombre]
+            if tipo == _PLANO:
+                kwargs[nombre] = conv(v) if conv is not None else v
+            elif tipo == _LISTA:
+                kwargs[nombre] = [conv.from_dict(x) for x in v]
+            elif tipo == _ANIDADO:
+                kwargs[nombre] = conv.from_dict(v) if v else None
+            else:
+                kwargs[nombre] = conv.from_dict(v)
+        return cls(**kwargs)
+
+
 # ==============================================================================
 # DOCUMENTOS CONVENIO (expedientes Estado-Estado — Pautas 5.1.11)
 # ==============================================================================
 
 
-@dataclass
-class DocumentosConvenio:
+@dataclass(**_DATACLASS_SLOTS)
+class DocumentosConvenio(FastSerializableMixin):
     """
     Documentos específicos de convenio interinstitucional.
     Ref: docs/CONVENIOS_INTERINSTITUCIONALES.md
@@ -861,49 +936,33 @@ class DocumentosConvenio:
     conformidad_funcional: bool = False
     coherencia_economica: bool = False
 
-    def to_dict(self) -> Dict[str, Any]:
-        result = {}
-        for k, v in self.__dict__.items():
-            if isinstance(v, bool):
-                result[k] = v
-            elif isinstance(v, CampoExtraido):
-                result[k] = v.to_dict()
-            else:
-                result[k] = v.to_dict() if v is not None and hasattr(v, "to_dict") else None
-        return result
-
-    @classmethod
-    def from_dict(cls, data: Optional[Dict]) -> "DocumentosConvenio":
-        if not data:
-            return cls()
-        campo_fields = [
-            "convenio_vigente",
-            "documento_cobranza",
-            "detalle_consumo",
-            "informe_tecnico",
-            "certificacion_presupuestal",
-            "derivacion_sinad",
-            "entidad_contraparte",
-            "periodo_convenio",
-        ]
-        kwargs = {}
-        for f in campo_fields:
-            kwargs[f] = CampoExtraido.from_dict(data[f]) if data.get(f) else None
-        kwargs["conformidad_funcional"] = data.get("conformidad_funcional", False)
-        kwargs["coherencia_economica"] = data.get("coherencia_economica", False)
-        return cls(**kwargs)
+    # Campos Optional[CampoExtraido], en orden de declaración
+    _CAMPO_FIELDS = (
+        "convenio_vigente",
+        "documento_cobranza",
+        "detalle_consumo",
+        "informe_tecnico",
+        "certificacion_presupuestal",
+        "derivacion_sinad",
+        "entidad_contraparte",
+        "periodo_convenio",
+    )
+
+    _SCHEMA = tuple((f, _ANIDADO, CampoExtraido) for f in _CAMPO_FIELDS) + (
+        ("conformidad_funcional", _PLANO, None),
+        ("coherencia_economica", _PLANO, None),
+    )
 
     def documentos_minimos_presentes(self) -> bool:
         """Verifica los 6 documentos mínimos exigibles (Sección IV)."""
-        return all(
-            [
-                self.convenio_vigente is not None,
-                self.documento_cobranza is not None,
-                self.detalle_consumo is not None,
-                self.informe_tecnico is not None,
-                self.certificacion_presupuestal is not None,
-                self.derivacion_sinad is not None,
-            ]
+        # Cadena de `and`: corta en el primer faltante, sin lista temporal
+        return (
+            self.convenio_vigente is not None
+            and self.documento_cobranza is not None
+            and self.detalle_consumo is not None
+            and self.informe_tecnico is not None
+            and self.certificacion_presupuestal is not None
+            and self.derivacion_sinad is not None
         )
 
     def apto_para_devengado(self) -> bool:
@@ -919,8 +978,8 @@ class DocumentosConvenio:
 # ==============================================================================
 
 
-@dataclass
-class ArchivoFuente:
+@dataclass(**_DATACLASS_SLOTS)
+class ArchivoFuente(FastSerializableMixin):
     """Un PDF fuente procesado con su hash SHA-256."""
 
     nombre: str = ""
@@ -930,21 +989,14 @@ class ArchivoFuente:
     total_paginas: int = 0
     fecha_procesamiento: str = ""
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "nombre": self.nombre,
-            "ruta_relativa": self.ruta_relativa,
-            "hash_sha256": self.hash_sha256,
-            "tamaño_bytes": self.tamaño_bytes,
-            "total_paginas": self.total_paginas,
-            "fecha_procesamiento": self.fecha_procesamiento,
-        }
-
-    @classmethod
-    def from_dict(cls, data: Optional[Dict]) -> "ArchivoFuente":
-        if not data:
-            return cls()
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+    _SCHEMA = (
+        ("nombre", _PLANO, None),
+        ("ruta_relativa", _PLANO, None),
+        ("hash_sha256", _PLANO, None),
+        ("tamaño_bytes", _PLANO, None),
+        ("total_paginas", _PLANO, None),
+        ("fecha_procesamiento", _PLANO, None),
+    )
 
 
 # ==============================================================================
@@ -952,8 +1004,8 @@ class ArchivoFuente:
 # ==============================================================================
 
 
-@dataclass
-class ResumenExtraccion:
+@dataclass(**_DATACLASS_SLOTS)
+class ResumenExtraccion(FastSerializableMixin):
     """Estadísticas de la extracción."""
 
     total_campos: int = 0
@@ -965,23 +1017,16 @@ class ResumenExtraccion:
     gastos_dj: int = 0
     boletos: int = 0
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "total_campos": self.total_campos,
-            "campos_ok": self.campos_ok,
-            "campos_abstencion": self.campos_abstencion,
-            "campos_incompletos": self.campos_incompletos,
-            "tasa_extraccion": self.tasa_extraccion,
-            "comprobantes_procesados": self.comprobantes_procesados,
-            "gastos_dj": self.gastos_dj,
-            "boletos": self.boletos,
-        }
-
-    @classmethod
-    def from_dict(cls, data: Optional[Dict]) -> "ResumenExtraccion":
-        if not data:
-            return cls()
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+    _SCHEMA = (
+        ("total_campos", _PLANO, None),
+        ("campos_ok", _PLANO, None),
+        ("campos_abstencion", _PLANO, None),
+        ("campos_incompletos", _PLANO, None),
+        ("tasa_extraccion", _PLANO, None),
+        ("comprobantes_procesados", _PLANO, None),
+        ("gastos_dj", _PLANO, None),
+        ("boletos", _PLANO, None),
+    )
 
 
 # ==============================================================================
@@ -989,8 +1034,8 @@ class ResumenExtraccion:
 # ==============================================================================
 
 
-@dataclass
-class IntegridadExpediente:
+@dataclass(**_DATACLASS_SLOTS)
+class IntegridadExpediente(FastSerializableMixin):
     """Estado de integridad del expediente procesado."""
 
     status: str = "OK"  # OK, WARNING, CRITICAL
@@ -998,24 +1043,12 @@ class IntegridadExpediente:
     cadena_custodia_verificada: bool = False
     alertas: List[str] = field(default_factory=list)
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "status": self.status,
-            "hash_expediente": self.hash_expediente,
-            "cadena_custodia_verificada": self.cadena_custodia_verificada,
-            "alertas": self.alertas,
-        }
-
-    @classmethod
-    def from_dict(cls, data: Optional[Dict]) -> "IntegridadExpediente":
-        if not data:
-            return cls()
-        return cls(
-            status=data.get("status", "OK"),
-            hash_expediente=data.get("hash_expediente", ""),
-            cadena_custodia_verificada=data.get("cadena_custodia_verificada", False),
-            alertas=data.get("alertas", []),
-        )
+    _SCHEMA = (
+        ("status", _PLANO, _intern),
+        ("hash_expediente", _PLANO, None),
+        ("cadena_custodia_verificada", _PLANO, None),
+        ("alertas", _PLANO, None),
+    )
 
 
 # ==============================================================================
@@ -1024,7 +1057,7 @@ class IntegridadExpediente:
 
 
 @dataclass
-class ExpedienteJSON:
+class ExpedienteJSON(FastSerializableMixin):
     """
     Contrato de datos completo de un expediente.
 
@@ -1063,55 +1096,27 @@ class ExpedienteJSON:
     # SERIALIZACIÓN
     # ------------------------------------------------------------------
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Serializa a diccionario para JSON."""
-        return {
-            "sinad": self.sinad,
-            "naturaleza": self.naturaleza,
-            "categoria": self.categoria,
-            "version_contrato": self.version_contrato,
-            "extraido_por": self.extraido_por,
-            "timestamp_generacion": self.timestamp_generacion,
-            "archivos_fuente": [a.to_dict() for a in self.archivos_fuente],
-            "anexo3": self.anexo3.to_dict() if self.anexo3 else None,
-            "comprobantes": [c.to_dict() for c in self.comprobantes],
-            "declaracion_jurada": [dj.to_dict() for dj in self.declaracion_jurada],
-            "boletos": [b.to_dict() for b in self.boletos],
-            "documentos_convenio": self.documentos_convenio.to_dict()
-            if self.documentos_convenio
-            else None,
-            "resumen_extraccion": self.resumen_extraccion.to_dict(),
-            "integridad": self.integridad.to_dict(),
-        }
+    _SCHEMA = (
+        ("sinad", _PLANO, None),
+        ("naturaleza", _PLANO, _intern),
+        ("categoria", _PLANO, _intern),
+        ("version_contrato", _PLANO, _intern),
+        ("extraido_por", _PLANO, None),
+        ("timestamp_generacion", _PLANO, None),
+        ("archivos_fuente", _LISTA, ArchivoFuente),
+        ("anexo3", _ANIDADO, DatosAnexo3),
+        ("comprobantes", _LISTA, ComprobanteExtraido),
+        ("declaracion_jurada", _LISTA, GastoDeclaracionJurada),
+        ("boletos", _LISTA, BoletoTransporte),
+        ("documentos_convenio", _ANIDADO, DocumentosConvenio),
+        ("resumen_extraccion", _ANIDADO_REQUERIDO, ResumenExtraccion),
+        ("integridad", _ANIDADO_REQUERIDO, IntegridadExpediente),
+    )
 
     def to_json(self, indent: int = 2) -> str:
         """Serializa a JSON string con indentación y UTF-8."""
         return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
 
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "ExpedienteJSON":
-        """Reconstruye desde diccionario con validación."""
-        return cls(
-            sinad=data.get("sinad", ""),
-            naturaleza=data.get("naturaleza", ""),
-            categoria=data.get("categoria", ""),
-            version_contrato=data.get("version_contrato", VERSION_CONTRATO),
-            extraido_por=data.get("extraido_por", ""),
-            timestamp_generacion=data.get("timestamp_generacion", ""),
-            archivos_fuente=[ArchivoFuente.from_dict(a) for a in data.get("archivos_fuente", [])],
-            anexo3=DatosAnexo3.from_dict(data.get("anexo3")) if data.get("anexo3") else None,
-            comprobantes=[ComprobanteExtraido.from_dict(c) for c in data.get("comprobantes", [])],
-            declaracion_jurada=[
-                GastoDeclaracionJurada.from_dict(dj) for dj in data.get("declaracion_jurada", [])
-            ],
-            boletos=[BoletoTransporte.from_dict(b) for b in data.get("boletos", [])],
-            documentos_convenio=DocumentosConvenio.from_dict(data.get("documentos_convenio"))
-            if data.get("documentos_convenio")
-            else None,
-            resumen_extraccion=ResumenExtraccion.from_dict(data.get("resumen_extraccion")),
-            integridad=IntegridadExpediente.from_dict(data.get("integridad")),
-        )
-
     @classmethod
     def from_json(cls, json_str: str) -> "ExpedienteJSON":
         """Reconstruye desde JSON string."""
@@ -1149,11 +1154,23 @@ class ExpedienteJSON:
         """
         Genera hash SHA-256 del contenido del expediente.
         Excluye el campo hash_expediente para evitar recursión.
+
+        Serializa sección por sección directamente en el digest, sin
+        materializar el JSON completo. Los bytes alimentados son idénticos
+        a json.dumps(data, sort_keys=True, ensure_ascii=False), por lo que
+        el hash es compatible con los ya registrados.
         """
         data = self.to_dict()
         data["integridad"]["hash_expediente"] = ""  # Excluir para cálculo
-        contenido = json.dumps(data, sort_keys=True, ensure_ascii=False)
-        hash_value = hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+        encoder = json.JSONEncoder(sort_keys=True, ensure_ascii=False)
+        h = hashlib.sha256()
+        h.update(b"{")
+        for i, key in enumerate(sorted(data)):
+            if i:
+                h.update(b", ")
+            h.update(f"{encoder.encode(key)}: {encoder.encode(data[key])}".encode("utf-8"))
+        h.update(b"}")
+        hash_value = h.hexdigest()
         self.integridad.hash_expediente = hash_value
         return hash_value
 
@@ -1198,17 +1215,19 @@ class ExpedienteJSON:
         Clave de unicidad: serie-número.
         Retorna lista de duplicados encontrados.
         """
-        vistos = {}
-        duplicados = []
-        for i, comp in enumerate(self.comprobantes):
-            clave = comp.get_serie_numero()
-            if clave in vistos and clave != "SIN_IDENTIFICAR":
-                duplicados.append(
-                    f"Comprobante duplicado: {clave} (posiciones {vistos[clave] + 1} y {i + 1})"
-                )
-            else:
-                vistos[clave] = i
-        return duplicados
+        posiciones: Dict[str, List[int]] = defaultdict(list)
+        for i, comp in enumerate(self.comprobantes, 1):
+            posiciones[comp.get_serie_numero()].append(i)
+        posiciones.pop("SIN_IDENTIFICAR", None)
+
+        # Mensajes en orden de aparición del duplicado
+        repetidos = sorted(
+            (p, clave, ps[0]) for clave, ps in posiciones.items() if len(ps) > 1 for p in ps[1:]
+        )
+        return [
+            f"Comprobante duplicado: {clave} (posiciones {primera} y {p})"
+            for p, clave, primera in repetidos
+        ]
 
     # ------------------------------------------------------------------
     # INTERNOS
@@ -30,9 +30,10 @@ Feature flag:
 
 import logging
 import os
+import re
 import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 # Asegurar path del proyecto
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -42,32 +43,89 @@ if _PROJECT_ROOT not in sys.path:
 
 logger = logging.getLogger(__name__)
 
+# __slots__ en dataclasses cuando el interprete lo soporta (Python 3.10+)
+_DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# ==============================================================================
+# FEATURE FLAG (resuelto una sola vez al importar)
+# ==============================================================================
+
+
+def _leer_flag_habilitado() -> bool:
+    """Lee LOCAL_ANALYST_CONFIG["enabled"] de config/settings.py."""
+    try:
+        from config.settings import LOCAL_ANALYST_CONFIG
+
+        return bool(LOCAL_ANALYST_CONFIG.get("enabled", False))
+    except (ImportError, AttributeError):
+        return False
+
+
+_ENABLED: bool = _leer_flag_habilitado()
+
+
+def reload_config() -> bool:
+    """
+    Vuelve a leer el feature flag desde config/settings.py.
+
+    Necesario solo si LOCAL_ANALYST_CONFIG se modifica en tiempo de
+    ejecucion; analyze_evidence() usa el valor resuelto al importar.
+
+    Returns:
+        Nuevo valor del flag.
+    """
+    global _ENABLED
+    _ENABLED = _leer_flag_habilitado()
+    return _ENABLED
+
 
 # ==============================================================================
 # CAMPOS PROBATORIOS BLOQUEADOS
 # ==============================================================================
 
-CAMPOS_PROBATORIOS: Set[str] = {
-    "ruc",
-    "monto",
-    "serie_numero",
-    "fecha",
-    "razon_social",
-    "igv",
-    "valor_venta",
-    "base_imponible",
-    "total",
-    "subtotal",
-    "numero_documento",
-    "ruc_proveedor",
-    "ruc_emisor",
-    "monto_total",
-    "monto_parcial",
-    "fecha_emision",
-    "fecha_pago",
-    "serie",
-    "numero",
-}
+CAMPOS_PROBATORIOS: FrozenSet[str] = frozenset(
+    {
+        "ruc",
+        "monto",
+        "serie_numero",
+        "fecha",
+        "razon_social",
+        "igv",
+        "valor_venta",
+        "base_imponible",
+        "total",
+        "subtotal",
+        "numero_documento",
+        "ruc_proveedor",
+        "ruc_emisor",
+        "monto_total",
+        "monto_parcial",
+        "fecha_emision",
+        "fecha_pago",
+        "serie",
+        "numero",
+    }
+)
+
+# Matcher precompilado: un solo search() por clave en lugar de recorrer
+# CAMPOS_PROBATORIOS en Python. _CAMPOS_PROBATORIOS_RE cubre "campo in clave";
+# _CAMPOS_PROBATORIOS_UNIDOS cubre "clave in campo" (separador que no
+# aparece en los nombres de campo, para no casar a traves de dos campos).
+_SEPARADOR_CAMPOS = "\x00"
+_CAMPOS_PROBATORIOS_RE = re.compile(
+    "|".join(re.escape(c) for c in sorted(CAMPOS_PROBATORIOS, key=len, reverse=True))
+)
+_CAMPOS_PROBATORIOS_UNIDOS = _SEPARADOR_CAMPOS.join(sorted(CAMPOS_PROBATORIOS))
+
+
+def _es_campo_probatorio(key_lower: str) -> bool:
+    """Indica si la clave contiene o esta contenida en un campo probatorio."""
+    if key_lower in CAMPOS_PROBATORIOS:  # caso comun: coincidencia exacta
+        return True
+    if _CAMPOS_PROBATORIOS_RE.search(key_lower):
+        return True
+    return _SEPARADOR_CAMPOS not in key_lower and key_lower in _CAMPOS_PROBATORIOS_UNIDOS
 
 
 # ==============================================================================
@@ -75,7 +133,7 @@ CAMPOS_PROBATORIOS: Set[str] = {
 # ==============================================================================
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AnalysisNotes:
     """
     Resultado del analisis de la IA local.
@@ -141,13 +199,7 @@ def _bloquear_valores_probatorios(
         key_lower = key.lower().strip()
 
         # Verificar si la clave coincide con un campo probatorio
-        es_probatorio = False
-        for campo in CAMPOS_PROBATORIOS:
-            if campo in key_lower or key_lower in campo:
-                es_probatorio = True
-                break
-
-        if es_probatorio:
+        if _es_campo_probatorio(key_lower):
             clean[key] = "NO_AUTORIZADO"
             bloqueados.append(
                 {
@@ -212,25 +264,20 @@ def analyze_evidence(
     if flags is None:
         flags = []
 
-    # Verificar feature flag
-    try:
-        from config.settings import LOCAL_ANALYST_CONFIG
-
-        enabled = LOCAL_ANALYST_CONFIG.get("enabled", False)
-    except (ImportError, AttributeError):
-        enabled = False
-
-    if not enabled:
-        logger.debug("LOCAL_ANALYST_ENABLED=False, retornando analisis vacio")
+    if not _ENABLED:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LOCAL_ANALYST_ENABLED=False, retornando analisis vacio")
         return AnalysisNotes()
 
     # Motor de IA no implementado aun (Fase 3, Tareas #22-26)
-    # Por ahora retornamos vacio con log informativo
-    logger.info(
-        "analyze_evidence llamado con %d records, %d flags. Motor IA no implementado aun (Fase 3).",
-        len(records),
-        len(flags),
-    )
+    # Por ahora retornamos vacio con log informativo. El guard evita
+    # evaluar los len() y armar los argumentos si INFO no se emite.
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "analyze_evidence llamado con %d records, %d flags. Motor IA no implementado aun (Fase 3).",
+            len(records),
+            len(flags),
+        )
 
     return AnalysisNotes(
         notas=["Motor de IA local no implementado aun (Fase 3, Tareas #22-26)"],
@@ -238,6 +285,32 @@ def analyze_evidence(
     )
 
 
+def analyze_evidence_batch(
+    batches: Iterable[Tuple[List[Any], Optional[List[str]]]],
+    trace_logger: Any = None,
+) -> List[AnalysisNotes]:
+    """
+    Version por lotes de analyze_evidence() para varios expedientes.
+
+    Evalua el feature flag una sola vez para todo el lote. Con el flag
+    deshabilitado retorna un AnalysisNotes vacio (instancia propia) por
+    cada elemento, sin recorrer los records.
+
+    Args:
+        batches: Iterable de tuplas (records, flags), una por expediente.
+        trace_logger: TraceLogger opcional para auditoria.
+
+    Returns:
+        Lista de AnalysisNotes en el mismo orden que batches.
+    """
+    if not _ENABLED:
+        return [AnalysisNotes() for _ in batches]
+
+    return [
+        analyze_evidence(records, flags, trace_logger=trace_logger) for records, flags in batches
+    ]
+
+
 def _process_ia_output(
     raw_output: Dict[str, Any],
     trace_logger: Any = None,
@@ -259,7 +332,8 @@ def _process_ia_output(
 
     return AnalysisNotes(
         notas=clean_output.get("notas", []) if isinstance(clean_output.get("notas"), list) else [],
-        tags_riesgo=clean_output.get("tags_riesgo", [])
+        # Tags categoricos de baja cardinalidad: se internan
+        tags_riesgo=[sys.intern(t) if type(t) is str else t for t in clean_output["tags_riesgo"]]
         if isinstance(clean_output.get("tags_riesgo"), list)
         else [],
         sugerencias_revision=clean_output.get("sugerencias_revision", [])
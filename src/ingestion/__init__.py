@@ -7,7 +7,13 @@ Módulo de Ingestión — Extracción, Custodia y Trazabilidad de PDFs
 - Logger estructurado: trazabilidad JSONL con trace_id por expediente
 """
 
-from .custody_chain import CustodyChain, CustodyRecord, VerificationResult, compute_sha256
+from .custody_chain import (
+    CustodyChain,
+    CustodyRecord,
+    VerificationResult,
+    compute_hash,
+    compute_sha256,
+)
 from .pdf_text_extractor import extract_text_with_gating, get_texto_extraido
 from .trace_logger import LogEntry, TraceContext, TraceLogger
 
@@ -17,6 +23,7 @@ __all__ = [
     "CustodyChain",
     "CustodyRecord",
     "VerificationResult",
+    "compute_hash",
     "compute_sha256",
     "TraceLogger",
     "TraceContext",
@@ -6,7 +6,7 @@ Tarea #10 del Plan de Desarrollo (Fase 1: Trazabilidad + OCR)
 
 Garantiza la integridad de cada expediente desde su ingreso:
   1. Copia inmutable del PDF original a bóveda segura
-  2. Cálculo de hash SHA-256 como huella digital
+  2. Cálculo de hash SHA-256 (o BLAKE3, opcional) como huella digital
   3. Registro en archivo JSONL con metadata completa
   4. Verificación posterior de integridad
 
@@ -27,13 +27,43 @@ Uso:
 
 import hashlib
 import json
+import mmap
 import os
 import shutil
+import sqlite3
+import sys
+import threading
 import uuid
-from dataclasses import asdict, dataclass
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# fcntl solo existe en POSIX (ioctl FICLONE para copias reflink)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# orjson (opcional): serialización/parseo JSON en Rust, escribe bytes directo
+try:
+    import orjson
+
+    ORJSON_DISPONIBLE = True
+except ImportError:
+    orjson = None
+    ORJSON_DISPONIBLE = False
+
+# blake3 (opcional): hash alternativo, paralelizable por su estructura de árbol
+try:
+    import blake3
+
+    BLAKE3_DISPONIBLE = True
+except ImportError:
+    blake3 = None
+    BLAKE3_DISPONIBLE = False
 
 # ==============================================================================
 # CONFIGURACIÓN
@@ -49,7 +79,25 @@ _DEFAULT_REGISTRY_DIR = os.path.join(
 )
 
 HASH_ALGORITHM = "sha256"
+SUPPORTED_HASH_ALGORITHMS = ("sha256", "blake3")
 BUFFER_SIZE = 65536  # 64 KB para lectura eficiente de archivos grandes
+MMAP_THRESHOLD = 512 * 1024 * 1024  # Hasta 512 MB se hashea vía mmap
+COPY_CHUNK_SIZE = 1024 * 1024  # 1 MB por bloque en copia + hash simultáneos
+WRITER_BUFFER_SIZE = 1024 * 1024  # Buffer del handle persistente del JSONL
+
+
+def _dumps_jsonl(data: Dict) -> bytes:
+    """Serializa un dict a una línea JSON en UTF-8 (sin salto final)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str)
+    return json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _loads_jsonl(line: bytes) -> Dict:
+    """Parsea una línea JSON en UTF-8."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
 
 
 # ==============================================================================
@@ -63,7 +111,7 @@ class CustodyRecord:
     """
 
     # Identificación
-    custody_id: str  # UUID único del registro
+    custody_id: str  # UUID4 único del registro (hex; registros antiguos con guiones)
     sinad: str  # Identificador del expediente (SINAD)
 
     # Archivo original
@@ -73,8 +121,8 @@ class CustodyRecord:
     original_page_count: int  # Número de páginas (si es PDF)
 
     # Integridad
-    hash_sha256: str  # Hash SHA-256 del archivo original
-    hash_algorithm: str = HASH_ALGORITHM
+    hash_sha256: str  # Hash del archivo original (nombre histórico; ver hash_algorithm)
+    hash_algorithm: str = HASH_ALGORITHM  # "sha256" (default) o "blake3"
 
     # Bóveda
     vault_path: str = ""  # Ruta de la copia inmutable en bóveda
@@ -93,17 +141,26 @@ class CustodyRecord:
     is_verified: bool = False  # Resultado de última verificación
 
     def to_dict(self) -> Dict:
-        """Serializa a diccionario para JSON."""
-        return asdict(self)
+        """Serializa a diccionario para JSON (copia plana, campos primitivos)."""
+        return {name: getattr(self, name) for name in _CUSTODY_FIELD_NAMES}
 
     def to_jsonl_line(self) -> str:
         """Serializa a línea JSONL (una línea, sin salto al final)."""
-        return json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+        return _dumps_jsonl(self.to_dict()).decode("utf-8")
 
     @classmethod
     def from_dict(cls, data: Dict) -> "CustodyRecord":
-        """Reconstruye desde diccionario."""
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        """
+        Reconstruye desde diccionario.
+
+        Caso común (línea escrita por este mismo código): las claves son
+        exactamente los campos y se pasan directo. Si hay claves extra
+        (versiones futuras/antiguas), se filtran contra los campos.
+        """
+        try:
+            return cls(**data)
+        except TypeError:
+            return cls(**{k: data[k] for k in data.keys() & _CUSTODY_FIELDS})
 
 
 @dataclass
@@ -119,21 +176,78 @@ class VerificationResult:
     error: str = ""  # Mensaje de error si falló
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {name: getattr(self, name) for name in _VERIFICATION_FIELD_NAMES}
+
+
+# Nombres de campo precalculados: to_dict() itera una tupla en vez de usar
+# dataclasses.asdict(), que hace copia profunda recursiva.
+_CUSTODY_FIELD_NAMES = tuple(f.name for f in fields(CustodyRecord))
+_CUSTODY_FIELDS = frozenset(_CUSTODY_FIELD_NAMES)
+_VERIFICATION_FIELD_NAMES = tuple(f.name for f in fields(VerificationResult))
 
 
 # ==============================================================================
 # FUNCIONES DE HASH
 # ==============================================================================
-def compute_sha256(file_path: str) -> str:
+def _drop_page_cache(fd: int) -> None:
+    """
+    Sugiere al kernel descartar del page cache las páginas del archivo.
+
+    Evita que barridos de verificación o ingestas masivas desplacen
+    páginas útiles de otros procesos. No-op donde no hay posix_fadvise.
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _sha256_fileobj(f: BinaryIO) -> str:
+    """SHA-256 de un archivo abierto sin buffer (ver compute_sha256)."""
+    size = os.fstat(f.fileno()).st_size
+    if 0 < size <= MMAP_THRESHOLD:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                return hashlib.sha256(mm).hexdigest()
+        except (OSError, ValueError):
+            pass  # FS sin soporte de mmap: continuar por streaming
+
+    if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+    sha256 = hashlib.sha256()
+    buffer = memoryview(bytearray(BUFFER_SIZE))
+    while True:
+        n = f.readinto(buffer)
+        if not n:
+            break
+        sha256.update(buffer[:n])
+    return sha256.hexdigest()
+
+
+def compute_sha256(file_path: str, drop_cache: bool = False) -> str:
     """
     Calcula el hash SHA-256 de un archivo.
 
-    Lee en bloques de 64KB para soportar archivos grandes
-    sin consumir memoria excesiva.
+    Archivos de hasta MMAP_THRESHOLD bytes se mapean en memoria y se
+    pasan de una sola vez a hashlib: las páginas del page cache llegan
+    al motor de hash sin copiarse a un buffer de usuario.
+
+    Archivos mayores (o si mmap no es posible) se leen por streaming:
+    en Python 3.11+ con hashlib.file_digest(), que lee y hashea en C
+    (OpenSSL, con instrucciones SHA-NI/ARMv8 si el CPU las tiene); en
+    versiones anteriores en bloques de 64KB sobre un único buffer
+    reutilizado (readinto). El archivo se abre sin buffer
+    (buffering=0) para evitar la copia intermedia de BufferedReader.
 
     Args:
         file_path: Ruta absoluta al archivo.
+        drop_cache: Si True, al terminar pide al kernel descartar las
+            páginas leídas (posix_fadvise DONTNEED). Útil cuando el
+            archivo no se volverá a leer pronto (copias en bóveda).
 
     Returns:
         String hexadecimal del hash SHA-256.
@@ -142,25 +256,210 @@ def compute_sha256(file_path: str) -> str:
         FileNotFoundError: Si el archivo no existe.
         PermissionError: Si no hay permisos de lectura.
     """
-    sha256 = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        while True:
-            data = f.read(BUFFER_SIZE)
-            if not data:
-                break
-            sha256.update(data)
-    return sha256.hexdigest()
+    with open(file_path, "rb", buffering=0) as f:
+        digest = _sha256_fileobj(f)
+        if drop_cache:
+            _drop_page_cache(f.fileno())
+    return digest
+
+
+def _check_hash_algorithm(algorithm: str) -> None:
+    """
+    Valida que el algoritmo de hash sea soportado y esté disponible.
+
+    Raises:
+        ValueError: Si el algoritmo no es soportado o falta su paquete.
+    """
+    if algorithm not in SUPPORTED_HASH_ALGORITHMS:
+        raise ValueError(
+            f"Algoritmo de hash no soportado: {algorithm}. "
+            f"Opciones: {', '.join(SUPPORTED_HASH_ALGORITHMS)}"
+        )
+    if algorithm == "blake3" and blake3 is None:
+        raise ValueError("Algoritmo blake3 requiere el paquete 'blake3' (pip install blake3)")
+
+
+def _new_hasher(algorithm: str) -> Any:
+    """Crea un contexto de hash incremental (update/hexdigest)."""
+    _check_hash_algorithm(algorithm)
+    if algorithm == "blake3":
+        return blake3.blake3()
+    return hashlib.sha256()
+
+
+def compute_hash(file_path: str, algorithm: str = HASH_ALGORITHM, drop_cache: bool = False) -> str:
+    """
+    Calcula el hash de un archivo con el algoritmo indicado.
+
+    - "sha256": ver compute_sha256().
+    - "blake3": mmap del archivo + hash multihilo (blake3.AUTO).
+
+    Args:
+        file_path: Ruta absoluta al archivo.
+        algorithm: "sha256" (default) o "blake3".
+        drop_cache: Descartar del page cache lo leído (ver compute_sha256).
+
+    Returns:
+        String hexadecimal del hash.
+
+    Raises:
+        ValueError: Si el algoritmo no es soportado o no está disponible.
+        FileNotFoundError: Si el archivo no existe.
+    """
+    _check_hash_algorithm(algorithm)
+    if algorithm == "blake3":
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        hasher.update_mmap(file_path)
+        if drop_cache:
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                _drop_page_cache(fd)
+            finally:
+                os.close(fd)
+        return hasher.hexdigest()
+    return compute_sha256(file_path, drop_cache=drop_cache)
 
 
-def _get_pdf_page_count(file_path: str) -> int:
+_FITZ_LOCK = threading.Lock()
+_FICLONE = 0x40049409  # ioctl de Linux para clonar un archivo (reflink)
+
+
+def _try_reflink(src: Path, dst: Path) -> bool:
+    """
+    Intenta crear dst como clon reflink (copy-on-write) de src.
+
+    En Btrfs/XFS (reflink=1) y similares el clon es instantáneo y
+    comparte bloques con el original, así que no hay I/O de datos.
+    Preserva metadata como shutil.copy2. En otros sistemas o
+    plataformas retorna False sin dejar archivo creado.
+
+    Returns:
+        True si dst quedó creado como clon de src.
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            clonado = False
+        else:
+            clonado = True
+    if not clonado:
+        dst.unlink(missing_ok=True)
+        return False
+
+    shutil.copystat(str(src), str(dst))
+    return True
+
+
+def _copy_and_hash(src: Path, dst: Path, algorithm: str = HASH_ALGORITHM) -> str:
+    """
+    Copia src a dst y calcula el hash en la misma pasada.
+
+    Cada bloque leído del original se escribe en la copia y se pasa
+    al hash, de modo que el original se lee una sola vez. Preserva
+    metadata como shutil.copy2 (vía shutil.copystat). Si la copia
+    falla, elimina el archivo parcial.
+
+    Returns:
+        String hexadecimal del hash de los bytes copiados.
+    """
+    hasher = _new_hasher(algorithm)
+    buffer = memoryview(bytearray(COPY_CHUNK_SIZE))
+    try:
+        with open(src, "rb", buffering=0) as fsrc, open(dst, "xb", buffering=0) as fdst:
+            while True:
+                n = fsrc.readinto(buffer)
+                if not n:
+                    break
+                chunk = buffer[:n]
+                hasher.update(chunk)
+                while chunk:
+                    chunk = chunk[fdst.write(chunk) :]
+        shutil.copystat(str(src), str(dst))
+    except BaseException:
+        dst.unlink(missing_ok=True)
+        raise
+    return hasher.hexdigest()
+
+
+def _verify_one(
+    custody_id: str, vault_path: str, expected_hash: str, algorithm: str = HASH_ALGORITHM
+) -> VerificationResult:
+    """
+    Recalcula el hash de una copia en bóveda y lo compara con el esperado.
+
+    No toca el registro JSONL: es segura para ejecutarse en paralelo.
+    """
+    timestamp = datetime.now(timezone.utc).isoformat()
+    path = Path(vault_path)
+    if not path.exists():
+        return VerificationResult(
+            custody_id=custody_id,
+            is_intact=False,
+            expected_hash=expected_hash,
+            actual_hash="",
+            vault_path=str(path),
+            verified_at=timestamp,
+            error=f"Archivo en bóveda no encontrado: {path}",
+        )
+
+    try:
+        actual_hash = compute_hash(str(path), algorithm, drop_cache=True)
+    except Exception as e:
+        return VerificationResult(
+            custody_id=custody_id,
+            is_intact=False,
+            expected_hash=expected_hash,
+            actual_hash="",
+            vault_path=str(path),
+            verified_at=timestamp,
+            error=f"Error al calcular hash: {e}",
+        )
+
+    return VerificationResult(
+        custody_id=custody_id,
+        is_intact=actual_hash == expected_hash,
+        expected_hash=expected_hash,
+        actual_hash=actual_hash,
+        vault_path=str(path),
+        verified_at=timestamp,
+    )
+
+
+def _duplicate_error(existing: CustodyRecord) -> ValueError:
+    """Error de ingesta duplicada, con los datos del registro existente."""
+    return ValueError(
+        f"Archivo ya registrado. custody_id existente: {existing.custody_id}, "
+        f"sinad: {existing.sinad}, ingresado: {existing.ingested_at}"
+    )
+
+
+def _discard_vault_copy(record: CustodyRecord) -> None:
+    """Elimina la copia en bóveda de una ingesta rechazada."""
+    vault_path = Path(record.vault_path)
+    try:
+        os.chmod(str(vault_path), 0o644)  # Windows no borra read-only
+    except OSError:
+        pass
+    vault_path.unlink(missing_ok=True)
+
+
+def _get_pdf_page_count(file_path: str, doc: Optional[Any] = None) -> int:
     """
     Obtiene el número de páginas de un PDF.
     Usa PyMuPDF (fitz) si está disponible, sino retorna 0.
+    Si se pasa un fitz.Document ya abierto, lo usa sin reabrir el archivo.
     """
+    if doc is not None:
+        return len(doc)
     try:
         import fitz  # PyMuPDF
 
-        with fitz.open(file_path) as doc:
+        # PyMuPDF no es thread-safe: serializar aperturas (ingest_many)
+        with _FITZ_LOCK, fitz.open(file_path) as doc:
             return len(doc)
     except ImportError:
         return 0
@@ -177,8 +476,9 @@ class CustodyChain:
 
     Responsabilidades:
       - Copiar el PDF original a una bóveda inmutable
-      - Calcular y almacenar el hash SHA-256
+      - Calcular y almacenar el hash SHA-256 (o BLAKE3 si se configura)
       - Registrar cada ingesta en archivo JSONL
+      - Mantener un índice SQLite de hashes para detectar duplicados
       - Verificar integridad bajo demanda
 
     Ejemplo:
@@ -193,6 +493,7 @@ class CustodyChain:
         vault_dir: Optional[str] = None,
         registry_dir: Optional[str] = None,
         registry_filename: str = "custody_log.jsonl",
+        hash_algorithm: str = HASH_ALGORITHM,
     ):
         """
         Inicializa la cadena de custodia.
@@ -201,11 +502,46 @@ class CustodyChain:
             vault_dir: Directorio donde se almacenan las copias inmutables.
             registry_dir: Directorio donde se guarda el registro JSONL.
             registry_filename: Nombre del archivo JSONL de registro.
+            hash_algorithm: Algoritmo para nuevas ingestas ("sha256" o
+                "blake3"). Cada registro guarda el suyo, así que los
+                registros existentes se verifican con su algoritmo
+                original. La detección de duplicados compara hashes del
+                mismo algoritmo.
+
+        Raises:
+            ValueError: Si hash_algorithm no es soportado o no está disponible.
         """
+        _check_hash_algorithm(hash_algorithm)
+        self.hash_algorithm = hash_algorithm
         self.vault_dir = Path(vault_dir or _DEFAULT_VAULT_DIR)
         self.registry_dir = Path(registry_dir or _DEFAULT_REGISTRY_DIR)
         self.registry_file = self.registry_dir / registry_filename
 
+        # Caché en memoria del registro JSONL (append-only) con índices
+        # por hash, custody_id y SINAD. Se invalida si cambian mtime/tamaño
+        # del archivo en disco (p. ej. otra instancia escribió en él).
+        self._cache: Optional[List[CustodyRecord]] = None
+        self._cache_stat: Optional[Tuple[int, int]] = None
+        self._hash_index: Dict[str, CustodyRecord] = {}
+        self._id_index: Dict[str, CustodyRecord] = {}
+        self._sinad_index: Dict[str, CustodyRecord] = {}
+
+        # Verificaciones pendientes de escribir: custody_id -> (timestamp, ok).
+        # Dentro de batch_updates() se acumulan y se escriben una sola vez.
+        self._pending_updates: Dict[str, Tuple[str, bool]] = {}
+        self._batch_depth = 0
+
+        # Índice persistente hash -> custody_id (SQLite) junto al JSONL.
+        # Permite detectar duplicados sin cargar el registro completo.
+        self._index_path = self.registry_file.with_name(
+            f"{self.registry_file.stem}.hash_index.sqlite"
+        )
+        self._index_db: Optional[sqlite3.Connection] = None
+
+        # Handle persistente (append, binario, con buffer) del JSONL. Se
+        # abre en la primera escritura; fsync solo en flush()/close().
+        self._writer: Optional[BinaryIO] = None
+
         # Crear directorios si no existen
         self.vault_dir.mkdir(parents=True, exist_ok=True)
         self.registry_dir.mkdir(parents=True, exist_ok=True)
@@ -220,16 +556,19 @@ class CustodyChain:
         source: str = "manual",
         operator: str = "",
         notes: str = "",
+        verify_copy: bool = False,
     ) -> CustodyRecord:
         """
         Ingresa un expediente PDF a la cadena de custodia.
 
         Pasos:
           1. Valida que el archivo existe y es PDF
-          2. Calcula hash SHA-256 del original
-          3. Genera ID de custodia único
-          4. Copia el archivo a la bóveda con nombre basado en custody_id
-          5. Verifica que la copia es idéntica (hash)
+          2. Genera ID de custodia único
+          3. Copia el archivo a la bóveda con nombre basado en custody_id:
+             clon reflink si el filesystem lo soporta; si no, copia
+             calculando el hash del original en la misma lectura
+          4. Verifica la copia: tamaño siempre; re-hash solo con verify_copy
+          5. Rechaza duplicados (y elimina la copia recién creada)
           6. Registra en JSONL
 
         Args:
@@ -238,15 +577,116 @@ class CustodyChain:
             source: Origen de la ingesta (manual, api, batch).
             operator: Identificador del operador.
             notes: Notas opcionales.
+            verify_copy: Si True, vuelve a hashear la copia en bóveda y la
+                compara con el original. Por defecto solo se compara el
+                tamaño: el hash del original se calcula sobre los mismos
+                bytes que se escriben en la bóveda, así que la segunda
+                lectura solo detectaría corrupción del disco entre escritura
+                y lectura, a costa de duplicar el I/O de la ingesta.
 
         Returns:
             CustodyRecord con todos los datos del registro.
 
         Raises:
             FileNotFoundError: Si el PDF no existe.
-            ValueError: Si el archivo no es PDF o está vacío.
+            ValueError: Si el archivo no es PDF, está vacío o ya fue registrado.
             RuntimeError: Si la copia en bóveda falla la verificación.
         """
+        record = self._stage_ingest(path_pdf, sinad, source, operator, notes, verify_copy)
+
+        # --- Verificar duplicados ---
+        existing = self._find_by_hash(record.hash_sha256)
+        if existing:
+            _discard_vault_copy(record)
+            raise _duplicate_error(existing)
+
+        # --- Escribir en JSONL ---
+        self._append_record(record)
+
+        return record
+
+    def ingest_many(
+        self,
+        items: Iterable[Tuple[str, str]],
+        source: str = "batch",
+        operator: str = "",
+        max_workers: Optional[int] = None,
+        verify_copy: bool = False,
+    ) -> List[Union[CustodyRecord, Exception]]:
+        """
+        Ingresa varios PDFs, copiando y hasheando en paralelo.
+
+        La copia a bóveda, el hash y la verificación de cada archivo se
+        ejecutan en un pool de hilos (hashlib libera el GIL). La detección
+        de duplicados (contra el registro y dentro del lote) y la escritura
+        del JSONL ocurren después, en serie, en el hilo que llama: todos los
+        registros nuevos se escriben en una sola escritura seguida de un
+        único fsync.
+
+        Args:
+            items: Pares (path_pdf, sinad).
+            source: Origen de la ingesta (default: "batch").
+            operator: Identificador del operador.
+            max_workers: Hilos para copia + hash (default: os.cpu_count()).
+            verify_copy: Re-hashear cada copia en bóveda (ver ingest()).
+
+        Returns:
+            Lista alineada con ``items``: el CustodyRecord registrado o la
+            excepción que rechazó ese archivo (las mismas que ingest()).
+        """
+        items = list(items)
+
+        def stage(item: Tuple[str, str]) -> Union[CustodyRecord, Exception]:
+            try:
+                return self._stage_ingest(item[0], item[1], source, operator, "", verify_copy)
+            except Exception as e:
+                return e
+
+        workers = min(max_workers or os.cpu_count() or 1, len(items))
+        if workers <= 1:
+            staged = [stage(item) for item in items]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                staged = list(executor.map(stage, items))
+
+        results: List[Union[CustodyRecord, Exception]] = []
+        nuevos: List[CustodyRecord] = []
+        en_lote: Dict[str, CustodyRecord] = {}
+        for record in staged:
+            if isinstance(record, Exception):
+                results.append(record)
+                continue
+
+            existing = en_lote.get(record.hash_sha256) or self._find_by_hash(record.hash_sha256)
+            if existing:
+                _discard_vault_copy(record)
+                results.append(_duplicate_error(existing))
+                continue
+
+            en_lote[record.hash_sha256] = record
+            nuevos.append(record)
+            results.append(record)
+
+        if nuevos:
+            self._append_records(nuevos)
+            self.flush(sync=True)
+        return results
+
+    def _stage_ingest(
+        self,
+        path_pdf: str,
+        sinad: str,
+        source: str,
+        operator: str,
+        notes: str,
+        verify_copy: bool = False,
+    ) -> CustodyRecord:
+        """
+        Valida, copia a bóveda, hashea y verifica un PDF (pasos 1-4 de ingest).
+
+        No consulta ni escribe el registro, así que puede ejecutarse en
+        paralelo para varios archivos.
+        """
         path = Path(path_pdf).resolve()
 
         # --- Validaciones ---
@@ -264,37 +704,43 @@ class CustodyChain:
             raise ValueError(f"Archivo vacío: {path}")
 
         # --- Generar identificadores ---
-        custody_id = str(uuid.uuid4())
+        custody_id = uuid.uuid4().hex
         timestamp = datetime.now(timezone.utc).isoformat()
 
-        # --- Hash del original ---
-        original_hash = compute_sha256(str(path))
-
-        # --- Verificar duplicados ---
-        existing = self._find_by_hash(original_hash)
-        if existing:
-            raise ValueError(
-                f"Archivo ya registrado. custody_id existente: {existing.custody_id}, "
-                f"sinad: {existing.sinad}, ingresado: {existing.ingested_at}"
-            )
-
-        # --- Página count ---
-        page_count = _get_pdf_page_count(str(path))
-
         # --- Copiar a bóveda ---
+        # Con reflink la copia es un clon COW (sin I/O de datos) y se hashea
+        # el clon; si no, copia + hash del original en una sola lectura.
         vault_filename = f"{custody_id}.pdf"
         vault_path = self.vault_dir / vault_filename
-        shutil.copy2(str(path), str(vault_path))
+        reflinked = _try_reflink(path, vault_path)
+        if reflinked:
+            original_hash = compute_hash(str(vault_path), self.hash_algorithm, drop_cache=True)
+        else:
+            original_hash = _copy_and_hash(path, vault_path, self.hash_algorithm)
+
+        # --- Página count ---
+        page_count = _get_pdf_page_count(str(path))
 
         # --- Verificar copia ---
-        vault_hash = compute_sha256(str(vault_path))
-        if vault_hash != original_hash:
-            # Eliminar copia corrupta
+        # El tamaño se compara siempre. Re-hashear la bóveda solo aporta si
+        # se pidió verify_copy y la copia no es un clon reflink (que
+        # comparte los bloques del original).
+        vault_size = vault_path.stat().st_size
+        if vault_size != file_size:
             vault_path.unlink(missing_ok=True)
             raise RuntimeError(
                 f"La copia en bóveda NO coincide con el original. "
-                f"Original: {original_hash}, Copia: {vault_hash}"
+                f"Tamaño original: {file_size}, copia: {vault_size}"
             )
+        if verify_copy and not reflinked:
+            vault_hash = compute_hash(str(vault_path), self.hash_algorithm, drop_cache=True)
+            if vault_hash != original_hash:
+                # Eliminar copia corrupta
+                vault_path.unlink(missing_ok=True)
+                raise RuntimeError(
+                    f"La copia en bóveda NO coincide con el original. "
+                    f"Original: {original_hash}, Copia: {vault_hash}"
+                )
 
         # --- Hacer la copia read-only ---
         try:
@@ -303,7 +749,7 @@ class CustodyChain:
             pass  # En algunos sistemas (Windows) puede fallar
 
         # --- Crear registro ---
-        record = CustodyRecord(
+        return CustodyRecord(
             custody_id=custody_id,
             sinad=sinad,
             original_filename=path.name,
@@ -311,7 +757,7 @@ class CustodyChain:
             original_size_bytes=file_size,
             original_page_count=page_count,
             hash_sha256=original_hash,
-            hash_algorithm=HASH_ALGORITHM,
+            hash_algorithm=self.hash_algorithm,
             vault_path=str(vault_path),
             vault_filename=vault_filename,
             ingested_at=timestamp,
@@ -320,11 +766,6 @@ class CustodyChain:
             notes=notes,
         )
 
-        # --- Escribir en JSONL ---
-        self._append_record(record)
-
-        return record
-
     # ------------------------------------------------------------------
     # VERIFICACIÓN
     # ------------------------------------------------------------------
@@ -332,7 +773,8 @@ class CustodyChain:
         """
         Verifica la integridad de un archivo en la bóveda.
 
-        Compara el hash SHA-256 actual del archivo en bóveda
+        Compara el hash actual del archivo en bóveda (con el algoritmo
+        del registro)
         con el hash registrado al momento de la ingesta.
 
         Args:
@@ -341,8 +783,6 @@ class CustodyChain:
         Returns:
             VerificationResult con el resultado de la verificación.
         """
-        timestamp = datetime.now(timezone.utc).isoformat()
-
         # Buscar registro
         record = self.get_record(custody_id)
         if record is None:
@@ -352,86 +792,97 @@ class CustodyChain:
                 expected_hash="",
                 actual_hash="",
                 vault_path="",
-                verified_at=timestamp,
+                verified_at=datetime.now(timezone.utc).isoformat(),
                 error=f"Registro no encontrado: {custody_id}",
             )
 
-        vault_path = Path(record.vault_path)
-        if not vault_path.exists():
-            return VerificationResult(
-                custody_id=custody_id,
-                is_intact=False,
-                expected_hash=record.hash_sha256,
-                actual_hash="",
-                vault_path=str(vault_path),
-                verified_at=timestamp,
-                error=f"Archivo en bóveda no encontrado: {vault_path}",
-            )
-
-        # Calcular hash actual
-        try:
-            actual_hash = compute_sha256(str(vault_path))
-        except Exception as e:
-            return VerificationResult(
-                custody_id=custody_id,
-                is_intact=False,
-                expected_hash=record.hash_sha256,
-                actual_hash="",
-                vault_path=str(vault_path),
-                verified_at=timestamp,
-                error=f"Error al calcular hash: {e}",
-            )
-
-        is_intact = actual_hash == record.hash_sha256
-
-        result = VerificationResult(
-            custody_id=custody_id,
-            is_intact=is_intact,
-            expected_hash=record.hash_sha256,
-            actual_hash=actual_hash,
-            vault_path=str(vault_path),
-            verified_at=timestamp,
+        result = _verify_one(
+            record.custody_id, record.vault_path, record.hash_sha256, record.hash_algorithm
         )
 
         # Actualizar registro con resultado de verificación
-        self._update_verification(custody_id, timestamp, is_intact)
+        if not result.error:
+            self._update_verification(custody_id, result.verified_at, result.is_intact)
 
         return result
 
-    def verify_all(self) -> List[VerificationResult]:
+    def verify_all(self, max_workers: Optional[int] = None) -> List[VerificationResult]:
         """
         Verifica la integridad de TODOS los archivos en la bóveda.
 
+        Los hashes se calculan en paralelo con un pool de hilos:
+        hashlib libera el GIL mientras hashea, así que los hilos escalan
+        hasta el ancho de banda del disco. Las actualizaciones del JSONL
+        se aplican después, en serie, desde el hilo principal.
+
+        Args:
+            max_workers: Hilos para el cálculo de hashes (default:
+                os.cpu_count()). Con 1 se verifica en serie.
+
         Returns:
             Lista de VerificationResult, uno por cada registro.
         """
         records = self.list_records()
-        results = []
-        for record in records:
-            result = self.verify(record.custody_id)
-            results.append(result)
+        workers = min(max_workers or os.cpu_count() or 1, len(records))
+        args = (
+            [r.custody_id for r in records],
+            [r.vault_path for r in records],
+            [r.hash_sha256 for r in records],
+            [r.hash_algorithm for r in records],
+        )
+
+        if workers <= 1:
+            results = list(map(_verify_one, *args))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_verify_one, *args))
+
+        with self.batch_updates():
+            for result in results:
+                if not result.error:
+                    self._update_verification(
+                        result.custody_id, result.verified_at, result.is_intact
+                    )
         return results
 
+    @contextmanager
+    def batch_updates(self) -> Iterator["CustodyChain"]:
+        """
+        Agrupa las actualizaciones de verificación en una sola reescritura.
+
+        Dentro del bloque, verify() actualiza los registros en memoria y
+        difiere la escritura del JSONL; al salir se reescribe una vez.
+        Los bloques pueden anidarse: escribe el más externo.
+
+        Ejemplo:
+            with chain.batch_updates():
+                for cid in ids:
+                    chain.verify(cid)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_updates()
+
     # ------------------------------------------------------------------
     # CONSULTAS
     # ------------------------------------------------------------------
     def get_record(self, custody_id: str) -> Optional[CustodyRecord]:
         """Busca un registro por custody_id."""
-        for record in self._read_all_records():
-            if record.custody_id == custody_id:
-                return record
-        return None
+        self._load_records()
+        return self._id_index.get(custody_id)
 
     def get_record_by_sinad(self, sinad: str) -> Optional[CustodyRecord]:
-        """Busca un registro por SINAD."""
-        for record in self._read_all_records():
-            if record.sinad == sinad:
-                return record
-        return None
+        """Busca un registro por SINAD (el primero registrado)."""
+        self._load_records()
+        return self._sinad_index.get(sinad)
 
     def list_records(self) -> List[CustodyRecord]:
         """Lista todos los registros de custodia."""
-        return self._read_all_records()
+        return list(self._load_records())
 
     def get_stats(self) -> Dict:
         """
@@ -440,7 +891,7 @@ class CustodyChain:
         Returns:
             Dict con total, verified, pending, size_total, etc.
         """
-        records = self._read_all_records()
+        records = self._load_records()
         total_size = sum(r.original_size_bytes for r in records)
         verified = sum(1 for r in records if r.is_verified)
 
@@ -457,62 +908,240 @@ class CustodyChain:
     # ------------------------------------------------------------------
     # INTERNOS
     # ------------------------------------------------------------------
+    def _registry_stat(self) -> Optional[Tuple[int, int]]:
+        """
+        Firma (mtime_ns, tamaño) del JSONL, o None si no existe.
+
+        Antes vuelca al SO el buffer del writer, para que la firma (y
+        cualquier lectura posterior) incluya lo ya escrito.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+        try:
+            st = os.stat(self.registry_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _index_record(self, record: CustodyRecord) -> None:
+        """Agrega un registro a los índices (gana la primera aparición)."""
+        self._hash_index.setdefault(record.hash_sha256, record)
+        self._id_index.setdefault(record.custody_id, record)
+        self._sinad_index.setdefault(record.sinad, record)
+
+    def _load_records(self) -> List[CustodyRecord]:
+        """
+        Retorna los registros desde la caché en memoria.
+
+        Solo relee y parsea el JSONL si su firma (mtime_ns, tamaño)
+        cambió desde la última lectura; en ese caso reconstruye índices.
+        """
+        stat = self._registry_stat()
+        if self._cache is None or stat != self._cache_stat:
+            self._cache = list(self._iter_records())
+            self._cache_stat = stat
+            self._hash_index = {}
+            self._id_index = {}
+            self._sinad_index = {}
+            for record in self._cache:
+                self._index_record(record)
+        return self._cache
+
+    def _hash_index_db(self) -> sqlite3.Connection:
+        """
+        Retorna la conexión al índice de hashes, sincronizada con el JSONL.
+
+        El índice guarda el tamaño del JSONL con el que está al día; si no
+        coincide con el actual (índice nuevo, borrado o desfasado) se
+        reconstruye con una lectura completa del registro.
+        """
+        if self._index_db is None:
+            conn = sqlite3.connect(str(self._index_path))
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "hash TEXT PRIMARY KEY, custody_id TEXT, sinad TEXT, ingested_at TEXT)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+            conn.commit()
+            self._index_db = conn
+
+        conn = self._index_db
+        row = conn.execute("SELECT value FROM meta WHERE key = 'registry_size'").fetchone()
+        stat = self._registry_stat()
+        size = stat[1] if stat else 0
+        if row is None or row[0] != size:
+            with conn:
+                conn.execute("DELETE FROM hashes")
+                # Si la caché no está vigente, recorrer el JSONL en streaming
+                # en vez de materializar todos los registros.
+                vigente = self._cache is not None and stat == self._cache_stat
+                conn.executemany(
+                    "INSERT OR IGNORE INTO hashes VALUES (?, ?, ?, ?)",
+                    (
+                        (r.hash_sha256, r.custody_id, r.sinad, r.ingested_at)
+                        for r in (self._cache if vigente else self._iter_records())
+                    ),
+                )
+                self._set_index_registry_size(conn)
+        return conn
+
+    def _set_index_registry_size(self, conn: sqlite3.Connection) -> None:
+        """Marca el índice como sincronizado con el tamaño actual del JSONL."""
+        stat = self._registry_stat()
+        conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('registry_size', ?)",
+            (stat[1] if stat else 0,),
+        )
+
+    def flush(self, sync: bool = True) -> None:
+        """
+        Vuelca los registros escritos al archivo JSONL.
+
+        Args:
+            sync: Si True, además hace fsync para garantizar durabilidad
+                ante cortes de energía. Llamar una vez al final de un lote.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+            if sync:
+                os.fsync(self._writer.fileno())
+
+    def _close_writer(self) -> None:
+        """Vuelca y cierra el handle persistente del JSONL."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def close(self) -> None:
+        """Sincroniza el JSONL y cierra el writer y el índice de hashes."""
+        self.flush(sync=True)
+        self._close_writer()
+        if self._index_db is not None:
+            self._index_db.close()
+            self._index_db = None
+
+    def __enter__(self) -> "CustodyChain":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _append_record(self, record: CustodyRecord) -> None:
-        """Agrega un registro al archivo JSONL."""
-        with open(self.registry_file, "a", encoding="utf-8") as f:
-            f.write(record.to_jsonl_line() + "\n")
-
-    def _read_all_records(self) -> List[CustodyRecord]:
-        """Lee todos los registros del archivo JSONL."""
-        records = []
-        if not self.registry_file.exists():
-            return records
-
-        with open(self.registry_file, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    records.append(CustodyRecord.from_dict(data))
-                except (json.JSONDecodeError, TypeError):
-                    # Log pero no detener la lectura
-                    pass
-
-        return records
+        """Agrega un registro al archivo JSONL y al índice de hashes."""
+        self._append_records([record])
+
+    def _append_records(self, records: List[CustodyRecord]) -> None:
+        """
+        Agrega varios registros con una sola escritura al JSONL y una
+        sola transacción en el índice de hashes.
+        """
+        conn = self._hash_index_db()
+        cache_vigente = self._cache is not None and self._registry_stat() == self._cache_stat
+        with conn:
+            if self._writer is None:
+                self._writer = open(self.registry_file, "ab", buffering=WRITER_BUFFER_SIZE)
+            self._writer.write(b"".join(_dumps_jsonl(r.to_dict()) + b"\n" for r in records))
+            conn.executemany(
+                "INSERT OR IGNORE INTO hashes VALUES (?, ?, ?, ?)",
+                [(r.hash_sha256, r.custody_id, r.sinad, r.ingested_at) for r in records],
+            )
+            self._set_index_registry_size(conn)
+
+        if cache_vigente:
+            self._cache.extend(records)
+            for record in records:
+                self._index_record(record)
+            self._cache_stat = self._registry_stat()
+        else:
+            self._cache = None
+
+    def _iter_records(self) -> Iterator[CustodyRecord]:
+        """
+        Recorre los registros del archivo JSONL sin materializar una lista.
+
+        Las líneas vacías o corruptas se omiten.
+        """
+        if self.registry_file.exists():
+            with open(self.registry_file, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        data = _loads_jsonl(line)
+                        yield CustodyRecord.from_dict(data)
+                    except (ValueError, TypeError):
+                        # Log pero no detener la lectura
+                        pass
 
     def _find_by_hash(self, hash_sha256: str) -> Optional[CustodyRecord]:
-        """Busca si un hash ya fue registrado (detección de duplicados)."""
-        for record in self._read_all_records():
-            if record.hash_sha256 == hash_sha256:
-                return record
-        return None
+        """
+        Busca si un hash ya fue registrado (detección de duplicados).
+
+        Consulta el índice SQLite; solo si hay coincidencia (caso raro)
+        se recupera el registro completo.
+        """
+        row = (
+            self._hash_index_db()
+            .execute("SELECT custody_id FROM hashes WHERE hash = ?", (hash_sha256,))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return self.get_record(row[0])
 
     def _update_verification(self, custody_id: str, timestamp: str, is_verified: bool) -> None:
         """
         Actualiza el registro de verificación.
-        Reescribe el JSONL completo (operación atómica con archivo temporal).
+
+        Fuera de batch_updates() escribe de inmediato; dentro, solo
+        actualiza la caché y deja la escritura para _flush_updates().
         """
-        records = self._read_all_records()
-        updated = False
+        record = self.get_record(custody_id)
+        if record is None:
+            return
 
-        for record in records:
-            if record.custody_id == custody_id:
+        record.verified_at = timestamp
+        record.is_verified = is_verified
+        self._pending_updates[custody_id] = (timestamp, is_verified)
+
+        if self._batch_depth == 0:
+            self._flush_updates()
+
+    def _flush_updates(self) -> None:
+        """
+        Escribe las verificaciones pendientes.
+        Reescribe el JSONL completo (operación atómica con archivo temporal).
+        """
+        if not self._pending_updates:
+            return
+
+        # Reaplicar sobre los registros vigentes por si el JSONL se
+        # releyó desde disco durante el lote.
+        conn = self._hash_index_db()
+        records = self._load_records()
+        for custody_id, (timestamp, is_verified) in self._pending_updates.items():
+            record = self._id_index.get(custody_id)
+            if record is not None:
                 record.verified_at = timestamp
                 record.is_verified = is_verified
-                updated = True
-                break
-
-        if updated:
-            # Escritura atómica: escribir a temporal y renombrar
-            tmp_file = self.registry_file.with_suffix(".jsonl.tmp")
-            with open(tmp_file, "w", encoding="utf-8") as f:
-                for record in records:
-                    f.write(record.to_jsonl_line() + "\n")
-
-            # Renombrar (atómico en la mayoría de sistemas)
-            tmp_file.replace(self.registry_file)
+        self._pending_updates = {}
+
+        # El handle de append apunta al archivo que se va a reemplazar
+        self._close_writer()
+
+        # Escritura atómica: escribir a temporal y renombrar
+        tmp_file = self.registry_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(b"".join(_dumps_jsonl(r.to_dict()) + b"\n" for r in records))
+
+        # Renombrar (atómico en la mayoría de sistemas)
+        tmp_file.replace(self.registry_file)
+        self._cache_stat = self._registry_stat()
+
+        # Los hashes no cambian; solo el tamaño del JSONL reescrito.
+        with conn:
+            self._set_index_registry_size(conn)
 
     # ------------------------------------------------------------------
     # REPRESENTACIÓN
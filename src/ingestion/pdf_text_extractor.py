@@ -13,8 +13,11 @@ Principio de gobernanza: NUNCA inventa contenido. Si falla, retorna
 estado NECESITA_REVISION_MANUAL con evidencia del fallo.
 """
 
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 
@@ -28,6 +31,7 @@ try:
         _validar_dimensiones,
         calcular_metricas_imagen,
         ejecutar_ocr,
+        ejecutar_ocr_lote,
         preprocesar_rotacion,
         renderizar_pagina,
         verificar_ocr,
@@ -46,17 +50,30 @@ try:
     import fitz
 
     FITZ_DISPONIBLE = True
+
+    # Flags explícitos para get_text("text"): solo espacios, ligaduras y
+    # recorte al mediabox. Sin TEXT_PRESERVE_IMAGES ni los flags que
+    # versiones recientes de PyMuPDF agregan al default.
+    _TEXT_FLAGS = (
+        fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_MEDIABOX_CLIP
+    )
 except ImportError:
     FITZ_DISPONIBLE = False
+    _TEXT_FLAGS = 0
 
 
 __version__ = "2.0.0"
 
 
-def _extraer_texto_directo(pdf_path: Path) -> Dict[str, Any]:
+def _extraer_texto_directo(pdf_path: Path, doc: Optional[Any] = None) -> Dict[str, Any]:
     """
     Extrae texto directamente del PDF usando PyMuPDF.
 
+    Args:
+        pdf_path: Ruta al PDF.
+        doc: fitz.Document ya abierto (opcional). Si se pasa, se reutiliza
+            y no se cierra aquí.
+
     Returns:
         Dict con: texto, num_chars, num_words, num_paginas, tiempo_ms, error
     """
@@ -75,15 +92,15 @@ def _extraer_texto_directo(pdf_path: Path) -> Dict[str, Any]:
 
     try:
         inicio = time.time()
-        doc = fitz.open(str(pdf_path))
+        doc_propio = doc is None
+        if doc_propio:
+            doc = fitz.open(str(pdf_path))
         resultado["num_paginas"] = len(doc)
 
-        textos_paginas = []
-        for page in doc:
-            texto_pagina = page.get_text("text")
-            textos_paginas.append(texto_pagina)
+        textos_paginas = [page.get_text("text", flags=_TEXT_FLAGS, sort=False) for page in doc]
 
-        doc.close()
+        if doc_propio:
+            doc.close()
 
         texto_completo = "\n".join(textos_paginas)
         resultado["texto"] = texto_completo
@@ -97,12 +114,57 @@ def _extraer_texto_directo(pdf_path: Path) -> Dict[str, Any]:
     return resultado
 
 
+def _ocr_una_pagina(
+    pdf: Any, page_num: int, lang: str, dpi: int, matrix: Optional[Any] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Renderiza, corrige rotación y ejecuta OCR sobre una página.
+
+    Es función de módulo para poder ejecutarse en un ProcessPoolExecutor.
+
+    Args:
+        pdf: Ruta al PDF (en workers) o fitz.Document ya abierto.
+        page_num: Número de página (1-indexed).
+        lang: Idioma OCR.
+        dpi: Resolución de renderizado.
+        matrix: fitz.Matrix precalculada para ``dpi`` (opcional).
+
+    Returns:
+        Dict con rotacion_info y ocr (resultado de ejecutar_ocr), o None
+        si la página no pudo renderizarse.
+    """
+    img = renderizar_pagina(pdf, page_num, dpi, matrix=matrix)
+    if img is None:
+        return None
+
+    # Preprocesar rotación
+    img_corregida, rot_info = preprocesar_rotacion(img, lang)
+
+    # Regla 2: validación post-rotación obligatoria
+    # La rotación con expand=True puede cambiar dimensiones
+    if _validar_dimensiones is not None:
+        img_corregida = _validar_dimensiones(img_corregida)
+
+    return {"rotacion_info": rot_info, "ocr": ejecutar_ocr(img_corregida, lang)}
+
+
 def _extraer_texto_ocr(
-    pdf_path: Path, lang: str = "spa", dpi: int = 200, sample_pages: int = 1
+    pdf_path: Path,
+    lang: str = "spa",
+    dpi: int = 200,
+    sample_pages: int = 1,
+    doc: Optional[Any] = None,
 ) -> Dict[str, Any]:
     """
     Extrae texto usando OCR (Tesseract) en páginas de muestra.
 
+    El PDF se abre una sola vez (o se reutiliza ``doc`` si se pasa). Con
+    más de una página de muestra y Tesseract, cada página se procesa en
+    paralelo en un ProcessPoolExecutor (OCR es CPU-bound; los procesos
+    evitan el GIL y las restricciones de thread-safety de Tesseract). Con
+    PaddleOCR se usa ejecutar_ocr_lote: un solo modelo en el proceso y el
+    render/preproceso de las páginas siguientes solapado con la inferencia.
+
     Returns:
         Dict con campos del OCR + metricas de rotación
     """
@@ -122,6 +184,8 @@ def _extraer_texto_ocr(
         resultado["error"] = "Ningun motor OCR disponible"
         return resultado
 
+    doc_propio = False
+
     try:
         inicio = time.time()
 
@@ -131,10 +195,11 @@ def _extraer_texto_ocr(
             resultado["error"] = f"OCR no disponible: {ocr_msg}"
             return resultado
 
-        # Abrir PDF para contar páginas
-        doc = fitz.open(str(pdf_path))
+        # Abrir PDF una vez: se usa para contar y para renderizar
+        doc_propio = doc is None
+        if doc_propio:
+            doc = fitz.open(str(pdf_path))
         num_paginas = len(doc)
-        doc.close()
 
         # Determinar qué páginas procesar
         paginas_a_procesar = list(range(1, min(sample_pages + 1, num_paginas + 1)))
@@ -144,23 +209,36 @@ def _extraer_texto_ocr(
         palabras_total = 0
         rotacion_info_ultima = {}
 
-        for page_num in paginas_a_procesar:
-            # Renderizar página
-            img = renderizar_pagina(pdf_path, page_num, dpi)
-            if img is None:
+        # Una sola página: en proceso, con el documento ya abierto. Varias
+        # con PaddleOCR: un solo modelo (GPU) y un pipeline que solapa el
+        # render/preproceso con la inferencia. Varias con Tesseract: en
+        # paralelo, cada worker abre el PDF por su cuenta.
+        if len(paginas_a_procesar) > 1 and PADDLEOCR_DISPONIBLE:
+            por_pagina = ejecutar_ocr_lote(doc, paginas_a_procesar, lang, dpi)
+        elif len(paginas_a_procesar) > 1:
+            workers = min(len(paginas_a_procesar), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                por_pagina = list(
+                    executor.map(
+                        _ocr_una_pagina,
+                        repeat(str(pdf_path)),
+                        paginas_a_procesar,
+                        repeat(lang),
+                        repeat(dpi),
+                    )
+                )
+        else:
+            matriz = fitz.Matrix(dpi / 72, dpi / 72)
+            por_pagina = [
+                _ocr_una_pagina(doc, n, lang, dpi, matrix=matriz) for n in paginas_a_procesar
+            ]
+
+        for page_num, pagina in zip(paginas_a_procesar, por_pagina):
+            if pagina is None:
                 continue
 
-            # Preprocesar rotación
-            img_corregida, rot_info = preprocesar_rotacion(img, lang)
-            rotacion_info_ultima = rot_info
-
-            # Regla 2: validación post-rotación obligatoria
-            # La rotación con expand=True puede cambiar dimensiones
-            if _validar_dimensiones is not None:
-                img_corregida = _validar_dimensiones(img_corregida)
-
-            # Ejecutar OCR
-            ocr_result = ejecutar_ocr(img_corregida, lang)
+            rotacion_info_ultima = pagina["rotacion_info"]
+            ocr_result = pagina["ocr"]
 
             if ocr_result.get("error"):
                 continue
@@ -193,9 +271,22 @@ def _extraer_texto_ocr(
     except Exception as e:
         resultado["error"] = str(e)
 
+    finally:
+        if doc_propio and doc is not None:
+            doc.close()
+
     return resultado
 
 
+def _direct_text_suficiente(direct_result: Dict[str, Any], thresholds: GatingThresholds) -> bool:
+    """True si la extracción directa cumple los umbrales de direct_text."""
+    return (
+        direct_result.get("error") is None
+        and direct_result.get("num_chars", 0) >= thresholds.direct_text_min_chars
+        and direct_result.get("num_words", 0) >= thresholds.direct_text_min_words
+    )
+
+
 def _decidir_metodo(
     direct_result: Dict[str, Any], ocr_result: Dict[str, Any], thresholds: GatingThresholds
 ) -> Dict[str, Any]:
@@ -208,11 +299,7 @@ def _decidir_metodo(
     decision = {"metodo": "fallback_manual", "razon": "", "metodo_alternativo": None}
 
     # Evaluar direct_text
-    direct_ok = (
-        direct_result.get("error") is None
-        and direct_result.get("num_chars", 0) >= thresholds.direct_text_min_chars
-        and direct_result.get("num_words", 0) >= thresholds.direct_text_min_words
-    )
+    direct_ok = _direct_text_suficiente(direct_result, thresholds)
 
     # Evaluar OCR
     ocr_ok = (
@@ -262,7 +349,10 @@ def _decidir_metodo(
 
 
 def extract_text_with_gating(
-    pdf_path: Union[str, Path], lang: str = "spa", thresholds: Optional[GatingThresholds] = None
+    pdf_path: Union[str, Path],
+    lang: str = "spa",
+    thresholds: Optional[GatingThresholds] = None,
+    force_ocr_metrics: bool = False,
 ) -> Dict[str, Any]:
     """
     Extrae texto de un PDF con gating automático.
@@ -272,10 +362,15 @@ def extract_text_with_gating(
     - ocr: PDF escaneado procesado con Tesseract
     - fallback_manual: Requiere revisión humana
 
+    Si direct_text ya cumple los umbrales, el OCR no se ejecuta y
+    resultado["ocr"] queda como {"skipped": True, "reason": ...}.
+
     Args:
         pdf_path: Ruta al archivo PDF
         lang: Idioma para OCR (default: "spa")
         thresholds: Umbrales de decisión (opcional)
+        force_ocr_metrics: Ejecutar OCR siempre, aunque direct_text sea
+            suficiente (auditorías que requieren métricas completas)
 
     Returns:
         Dict con estructura probatoria completa:
@@ -328,16 +423,36 @@ def extract_text_with_gating(
     resultado["metricas_documento"]["existe"] = True
     resultado["metricas_documento"]["tamano_bytes"] = pdf_path.stat().st_size
 
-    # Paso 1: Intentar extracción directa
-    direct_result = _extraer_texto_directo(pdf_path)
-    resultado["direct_text"] = direct_result
-    resultado["metricas_documento"]["num_paginas"] = direct_result.get("num_paginas", 0)
+    # Abrir el PDF una sola vez para ambos extractores. Si falla, cada
+    # extractor lo reintenta y registra su propio error.
+    doc = None
+    if FITZ_DISPONIBLE:
+        try:
+            doc = fitz.open(str(pdf_path))
+        except Exception:
+            doc = None
 
-    # Paso 2: Intentar OCR (siempre, para tener métricas completas)
-    ocr_result = _extraer_texto_ocr(
-        pdf_path, lang=lang, dpi=thresholds.ocr_dpi, sample_pages=thresholds.sample_pages
-    )
-    resultado["ocr"] = ocr_result
+    try:
+        # Paso 1: Intentar extracción directa
+        direct_result = _extraer_texto_directo(pdf_path, doc=doc)
+        resultado["direct_text"] = direct_result
+        resultado["metricas_documento"]["num_paginas"] = direct_result.get("num_paginas", 0)
+
+        # Paso 2: Intentar OCR solo si hace falta (o si se piden métricas completas)
+        if force_ocr_metrics or not _direct_text_suficiente(direct_result, thresholds):
+            ocr_result = _extraer_texto_ocr(
+                pdf_path,
+                lang=lang,
+                dpi=thresholds.ocr_dpi,
+                sample_pages=thresholds.sample_pages,
+                doc=doc,
+            )
+        else:
+            ocr_result = {"skipped": True, "reason": "direct_text_sufficient"}
+        resultado["ocr"] = ocr_result
+    finally:
+        if doc is not None:
+            doc.close()
 
     # Paso 3: Decidir método
     decision = _decidir_metodo(direct_result, ocr_result, thresholds)
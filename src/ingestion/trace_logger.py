@@ -31,14 +31,33 @@ Uso:
     logger.end_trace(status="success")
 """
 
+import atexit
+import collections
 import json
+import math
+import mmap
 import os
+import queue
+import sqlite3
+import sys
+import threading
 import time
 import uuid
-from dataclasses import asdict, dataclass, field
+import weakref
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# orjson (opcional): serialización JSON en Rust, escribe bytes directo
+try:
+    import orjson
+
+    ORJSON_DISPONIBLE = True
+except ImportError:
+    orjson = None
+    ORJSON_DISPONIBLE = False
 
 # ==============================================================================
 # CONFIGURACIÓN
@@ -53,11 +72,116 @@ LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
 # Mapeo de nivel a peso numérico para filtrado
 _LEVEL_WEIGHTS = {level: idx for idx, level in enumerate(LOG_LEVELS)}
 
+# Escritura asíncrona: un hilo escritor por logger drena la cola en lotes
+# de hasta WRITER_BATCH_SIZE líneas y termina tras WRITER_IDLE_S sin
+# eventos (se relanza con el siguiente). ERROR/CRITICAL esperan a disco.
+WRITER_BATCH_SIZE = 1024
+WRITER_IDLE_S = 1.0
+_FLUSH_LEVELS = frozenset(("ERROR", "CRITICAL"))
+
+# Apertura del archivo del día (O_BINARY: sin traducción de saltos en Windows)
+_APPEND_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+
+# Escritura vectorizada de lotes (POSIX); IOV_MAX acota los buffers por llamada
+_WRITEV = getattr(os, "writev", None)
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+# Tamaño de bloque para leer archivos desde el final (get_recent_entries)
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# Archivos más grandes que esto se leen completos vía mmap
+MMAP_READ_THRESHOLD = 1 << 20
+
+# TraceContext/LogEntry usan __slots__ (sin __dict__ por instancia) cuando el
+# intérprete lo soporta (Python 3.10+): las consultas materializan miles.
+_DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Campos sin default de LogEntry: una línea sin ellos no es una entrada válida
+_REQUIRED_ENTRY_KEYS = ("timestamp", "trace_id", "level", "logger", "message")
+
+# Pool de LogEntry reutilizables para eventos que nunca salen del logger
+# (inicio/cierre de trace). Las entradas devueltas por log() son siempre
+# instancias nuevas: quien las recibe puede conservarlas.
+_ENTRY_POOL_SIZE = 64
+
+# Loggers vivos, para volcar sus buffers al terminar el proceso
+_LIVE_LOGGERS: "weakref.WeakSet[TraceLogger]" = weakref.WeakSet()
+
+
+def _json_default(obj: Any) -> Any:
+    """Dataclasses anidadas en context como dict (igual que asdict); el resto, str."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    return str(obj)
+
+
+def _dumps_jsonl(data: Dict[str, Any]) -> bytes:
+    """Serializa un dict a una línea JSON en UTF-8 (sin salto final)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # p.ej. enteros de más de 64 bits: json estándar los soporta
+    return json.dumps(data, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+# Codifica un str como literal JSON (con comillas, sin escapar no-ASCII),
+# igual que json.dumps(ensure_ascii=False); implementación en C.
+_encode_json_str = json.encoder.encode_basestring
+
+
+def _loads_jsonl(line: bytes) -> Any:
+    """Parsea una línea JSON en UTF-8."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _write_all(fd: int, lines: List[bytes]) -> None:
+    """
+    Escribe un lote de líneas con una sola llamada al sistema.
+
+    Con os.writev (POSIX) el kernel recibe los buffers tal cual, sin
+    concatenarlos antes en Python; en otras plataformas, un write del
+    lote unido. Completa escrituras parciales.
+    """
+    if _WRITEV is not None and len(lines) <= _IOV_MAX:
+        written = _WRITEV(fd, lines)
+        total = sum(map(len, lines))
+        if written == total:
+            return
+        data = memoryview(b"".join(lines))[written:]
+    else:
+        data = memoryview(b"".join(lines))
+    while data:
+        data = data[os.write(fd, data) :]
+
+
+def _mmap_lines(mm: mmap.mmap) -> Iterator[bytes]:
+    """Líneas de un mmap (sin el salto final), copiando solo cada línea."""
+    pos = 0
+    size = len(mm)
+    while pos < size:
+        end = mm.find(b"\n", pos)
+        if end == -1:
+            end = size
+        yield mm[pos:end]
+        pos = end + 1
+
+
+@atexit.register
+def _close_live_loggers() -> None:
+    for trace_logger in list(_LIVE_LOGGERS):
+        trace_logger.close()
+
 
 # ==============================================================================
 # DATACLASSES
 # ==============================================================================
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TraceContext:
     """
     Contexto de un trace activo.
@@ -89,11 +213,20 @@ class TraceContext:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TraceContext":
-        """Reconstruye desde diccionario."""
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        """
+        Reconstruye desde diccionario.
+
+        Caso común (dict de to_dict() o línea escrita por este logger):
+        las claves son campos y se pasan directo. Si hay claves extra, se
+        filtran contra los campos precalculados.
+        """
+        try:
+            return cls(**data)
+        except TypeError:
+            return cls(**{k: data[k] for k in data.keys() & _TRACE_CONTEXT_FIELDS})
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class LogEntry:
     """
     Una entrada individual del log estructurado.
@@ -130,18 +263,152 @@ class LogEntry:
 
     def to_dict(self) -> Dict[str, Any]:
         """Serializa a diccionario para JSON."""
-        d = asdict(self)
-        # Eliminar campos None para líneas más limpias
-        return {k: v for k, v in d.items() if v is not None}
+        d = {
+            "timestamp": self.timestamp,
+            "trace_id": self.trace_id,
+            "level": self.level,
+            "logger": self.logger,
+            "message": self.message,
+            "agent_id": self.agent_id,
+            "operation": self.operation,
+            "sinad": self.sinad,
+            "context": self.context,
+        }
+        # Omitir campos None para líneas más limpias
+        if self.duration_ms is not None:
+            d["duration_ms"] = self.duration_ms
+        if self.error is not None:
+            d["error"] = self.error
+        return d
 
     def to_jsonl_line(self) -> str:
         """Serializa a línea JSONL (una línea, sin salto al final)."""
-        return json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+        return self.to_jsonl_bytes().decode("utf-8")
+
+    def to_jsonl_bytes(self, logger_json: Optional[str] = None) -> bytes:
+        """
+        Serializa a línea JSONL en UTF-8, lista para escribir a disco.
+
+        Sin orjson, las claves y separadores fijos se arman con una plantilla
+        y solo se codifican los valores (el contexto pasa por el serializador
+        JSON), evitando json.dumps sobre el dict completo. Con orjson, o si
+        algún campo no tiene el tipo esperado, se serializa el dict.
+
+        Args:
+            logger_json: Nombre del logger ya codificado como string JSON
+                (TraceLogger lo precalcula una vez). Si falta, se codifica aquí.
+        """
+        if orjson is not None:
+            return _dumps_jsonl(self.to_dict())
+        duration = self.duration_ms
+        error = self.error
+        if not (
+            type(self.timestamp) is str
+            and type(self.trace_id) is str
+            and type(self.level) is str
+            and type(self.logger) is str
+            and type(self.message) is str
+            and type(self.agent_id) is str
+            and type(self.operation) is str
+            and type(self.sinad) is str
+            and (error is None or type(error) is str)
+            and (duration is None or (type(duration) in (int, float) and math.isfinite(duration)))
+        ):
+            return _dumps_jsonl(self.to_dict())
+
+        enc = _encode_json_str
+        head = (
+            f'{{"timestamp":{enc(self.timestamp)},"trace_id":{enc(self.trace_id)},'
+            f'"level":{enc(self.level)},"logger":{logger_json or enc(self.logger)},'
+            f'"message":{enc(self.message)},"agent_id":{enc(self.agent_id)},'
+            f'"operation":{enc(self.operation)},"sinad":{enc(self.sinad)},"context":'
+        )
+        tail = "}"
+        if error is not None:
+            tail = f',"error":{enc(error)}}}'
+        if duration is not None:
+            tail = f',"duration_ms":{duration!r}{tail}'
+        context = self.context
+        if not context and type(context) is dict:
+            return (head + "{}" + tail).encode("utf-8")
+        return head.encode("utf-8") + _dumps_jsonl(context) + tail.encode("utf-8")
+
+    @classmethod
+    def acquire(
+        cls,
+        timestamp: str,
+        trace_id: str,
+        level: str,
+        logger: str,
+        message: str,
+        agent_id: str = "",
+        operation: str = "",
+        sinad: str = "",
+        context: Optional[Dict[str, Any]] = None,
+        duration_ms: Optional[float] = None,
+        error: Optional[str] = None,
+    ) -> "LogEntry":
+        """
+        Obtiene una entrada del pool (o una nueva si está vacío).
+
+        Debe devolverse con release() y no conservarse después.
+        """
+        try:
+            entry = _ENTRY_POOL.pop()
+        except IndexError:
+            return cls(
+                timestamp,
+                trace_id,
+                level,
+                logger,
+                message,
+                agent_id,
+                operation,
+                sinad,
+                context if context is not None else {},
+                duration_ms,
+                error,
+            )
+        entry.timestamp = timestamp
+        entry.trace_id = trace_id
+        entry.level = level
+        entry.logger = logger
+        entry.message = message
+        entry.agent_id = agent_id
+        entry.operation = operation
+        entry.sinad = sinad
+        entry.context = context if context is not None else {}
+        entry.duration_ms = duration_ms
+        entry.error = error
+        return entry
+
+    def release(self) -> None:
+        """Devuelve la entrada al pool, soltando referencias a sus datos."""
+        self.message = ""
+        self.context = {}
+        self.error = None
+        _ENTRY_POOL.append(self)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "LogEntry":
-        """Reconstruye desde diccionario."""
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        """
+        Reconstruye desde diccionario.
+
+        Caso común (dict de to_dict() o línea escrita por este logger):
+        las claves son campos y se pasan directo. Si hay claves extra, se
+        filtran contra los campos precalculados.
+        """
+        try:
+            return cls(**data)
+        except TypeError:
+            return cls(**{k: data[k] for k in data.keys() & _LOG_ENTRY_FIELDS})
+
+
+# Nombres de campo precalculados para from_dict()
+_TRACE_CONTEXT_FIELDS = frozenset(f.name for f in fields(TraceContext))
+_LOG_ENTRY_FIELDS = frozenset(f.name for f in fields(LogEntry))
+
+_ENTRY_POOL: "collections.deque[LogEntry]" = collections.deque(maxlen=_ENTRY_POOL_SIZE)
 
 
 # ==============================================================================
@@ -156,8 +423,11 @@ class TraceLogger:
       2. log/info/warning/error() → registra eventos dentro del trace
       3. end_trace() → cierra el trace con resultado final
 
-    Cada evento se escribe inmediatamente al archivo JSONL (append-only).
-    Los archivos se rotan por día automáticamente.
+    Los eventos se serializan en el hilo que llama y se encolan; un hilo
+    escritor los agrega en lotes (append-only) por un handle persistente
+    al archivo del día. ERROR/CRITICAL, end_trace() y las consultas
+    esperan a que lo encolado llegue a disco (flush()). Los archivos se
+    rotan por día automáticamente.
 
     Ejemplo:
         logger = TraceLogger(log_dir="data/traces")
@@ -190,13 +460,44 @@ class TraceLogger:
         self.log_dir = Path(log_dir or _DEFAULT_LOG_DIR)
         self.log_prefix = log_prefix
         self.logger_name = logger_name
+        # Nombre ya codificado para la plantilla de LogEntry.to_jsonl_bytes
+        self._logger_json = _encode_json_str(logger_name)
 
         # Contexto de trace activo
-        self._active_context: Optional[TraceContext] = None
-        self._trace_start_time: Optional[float] = None
+        # Trace activo por contexto de ejecución (hilo o tarea asyncio):
+        # (TraceContext, inicio monotónico). _open_traces registra todos los
+        # traces abiertos en este logger, por trace_id.
+        self._trace_var: ContextVar[Optional[Tuple[TraceContext, float]]] = ContextVar(
+            f"trace_logger_active_{id(self)}", default=None
+        )
+        self._open_traces: Dict[str, Tuple[TraceContext, float]] = {}
+
+        # Ruta del archivo del día, memoizada por día UTC (epoch // 86400)
+        self._cached_day = -1
+        self._cached_path = self.log_dir
+
+        # Cola de líneas serializadas → hilo escritor (único dueño del
+        # descriptor O_APPEND del archivo del día, abierto hasta la rotación)
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._write_error: Optional[OSError] = None
+        self._open_fd: Optional[int] = None
+        self._open_file: Optional[str] = None
+        self._lock = threading.Lock()
+
+        # Listado ordenado de archivos JSONL, válido mientras no cambie el
+        # mtime del directorio (crear/borrar/renombrar archivos lo cambia)
+        self._files_cache: Optional[List[Path]] = None
+        self._files_cache_mtime = 0
+
+        # Índice SQLite de entradas (trace_id, sinad, nivel → archivo/offset)
+        self._index_path = self.log_dir / f"{self.log_prefix}_index.sqlite"
+        self._index_db: Optional[sqlite3.Connection] = None
+        self._index_lock = threading.Lock()
 
         # Crear directorio si no existe
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        _LIVE_LOGGERS.add(self)
 
     # ------------------------------------------------------------------
     # PROPIEDADES
@@ -204,18 +505,25 @@ class TraceLogger:
     @property
     def active_trace(self) -> Optional[TraceContext]:
         """Retorna el contexto del trace activo, o None."""
-        return self._active_context
+        current = self._current_trace()
+        return current[0] if current else None
 
     @property
     def has_active_trace(self) -> bool:
         """Indica si hay un trace activo."""
-        return self._active_context is not None
+        return self._current_trace() is not None
 
     @property
     def current_log_file(self) -> Path:
-        """Retorna la ruta del archivo de log del día actual."""
-        date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        return self.log_dir / f"{self.log_prefix}_{date_str}.jsonl"
+        """Retorna la ruta del archivo de log del día actual (UTC)."""
+        # Se recalcula solo al cambiar el día: el resto de llamadas evita
+        # datetime.now() + strftime + Path por cada evento.
+        today = int(time.time()) // 86400
+        if today != self._cached_day:
+            date_str = time.strftime("%Y-%m-%d", time.gmtime(today * 86400))
+            self._cached_path = self.log_dir / f"{self.log_prefix}_{date_str}.jsonl"
+            self._cached_day = today
+        return self._cached_path
 
     # ------------------------------------------------------------------
     # CICLO DE VIDA DEL TRACE
@@ -245,12 +553,13 @@ class TraceLogger:
             TraceContext con el trace_id generado.
 
         Raises:
-            RuntimeError: Si ya hay un trace activo sin cerrar.
+            RuntimeError: Si este hilo/tarea ya tiene un trace activo sin cerrar.
         """
-        if self._active_context is not None:
+        own = self._own_trace()
+        if own is not None:
             raise RuntimeError(
-                f"Ya hay un trace activo: {self._active_context.trace_id} "
-                f"(sinad: {self._active_context.sinad}). "
+                f"Ya hay un trace activo: {own[0].trace_id} "
+                f"(sinad: {own[0].sinad}). "
                 f"Ciérralo con end_trace() antes de iniciar otro."
             )
 
@@ -267,8 +576,9 @@ class TraceLogger:
             metadata=metadata or {},
         )
 
-        self._active_context = context
-        self._trace_start_time = time.monotonic()
+        active = (context, time.monotonic())
+        self._trace_var.set(active)
+        self._open_traces[trace_id] = active
 
         # Registrar evento de inicio
         self._write_entry(
@@ -277,6 +587,7 @@ class TraceLogger:
             agent_id=agent_id,
             operation=operation or "start_trace",
             context={"source": source, **(metadata or {})},
+            pooled=True,
         )
 
         return context
@@ -299,16 +610,16 @@ class TraceLogger:
             Dict con resumen del trace (trace_id, sinad, duration_ms, status).
             None si no hay trace activo.
         """
-        if self._active_context is None:
+        current = self._current_trace()
+        if current is None:
             return None
+        active_context, start_time = current
 
         # Calcular duración total
-        duration_ms = None
-        if self._trace_start_time is not None:
-            duration_ms = round((time.monotonic() - self._trace_start_time) * 1000, 2)
+        duration_ms = round((time.monotonic() - start_time) * 1000, 2)
 
-        trace_id = self._active_context.trace_id
-        sinad = self._active_context.sinad
+        trace_id = active_context.trace_id
+        sinad = active_context.sinad
 
         close_message = message or f"Trace finalizado con status: {status}"
 
@@ -319,6 +630,7 @@ class TraceLogger:
             operation="end_trace",
             context={"status": status, **(context or {})},
             duration_ms=duration_ms,
+            pooled=True,
         )
 
         summary = {
@@ -326,14 +638,16 @@ class TraceLogger:
             "sinad": sinad,
             "status": status,
             "duration_ms": duration_ms,
-            "started_at": self._active_context.started_at,
+            "started_at": active_context.started_at,
             "ended_at": datetime.now(timezone.utc).isoformat(),
         }
 
         # Limpiar contexto
-        self._active_context = None
-        self._trace_start_time = None
+        self._open_traces.pop(trace_id, None)
+        if self._trace_var.get() is current:
+            self._trace_var.set(None)
 
+        self.flush()
         return summary
 
     # ------------------------------------------------------------------
@@ -415,10 +729,37 @@ class TraceLogger:
             agent_id: Nuevo agente activo (ej: "AG02").
             operation: Nueva operación (ej: "ocr_extract").
         """
-        if self._active_context is not None:
-            self._active_context.agent_id = agent_id
+        active_context = self.active_trace
+        if active_context is not None:
+            active_context.agent_id = agent_id
             if operation:
-                self._active_context.operation = operation
+                active_context.operation = operation
+
+    def _own_trace(self) -> Optional[Tuple[TraceContext, float]]:
+        """Trace abierto desde el contexto de ejecución actual, si sigue abierto."""
+        own = self._trace_var.get()
+        if own is not None and own[0].trace_id in self._open_traces:
+            return own
+        return None
+
+    def _current_trace(self) -> Optional[Tuple[TraceContext, float]]:
+        """
+        Trace activo para el contexto de ejecución actual.
+
+        Cada hilo/tarea ve el trace que abrió. Un hilo sin trace propio (p.ej.
+        un worker de ThreadPoolExecutor, que no hereda contextvars) ve el
+        único trace abierto en el logger, si hay exactamente uno; con varios
+        traces concurrentes no se le atribuye ninguno.
+        """
+        own = self._own_trace()
+        if own is not None:
+            return own
+        if len(self._open_traces) == 1:
+            try:
+                return next(iter(self._open_traces.values()))
+            except (StopIteration, RuntimeError):
+                return None  # Cerrado/abierto en paralelo
+        return None
 
     # ------------------------------------------------------------------
     # CONSULTAS
@@ -427,8 +768,8 @@ class TraceLogger:
         """
         Recupera todos los eventos de un trace específico.
 
-        Lee todos los archivos JSONL del directorio y filtra
-        por trace_id.
+        Busca en el índice SQLite las posiciones de sus líneas y lee
+        solo esas del JSONL.
 
         Args:
             trace_id: UUID del trace a buscar.
@@ -436,10 +777,10 @@ class TraceLogger:
         Returns:
             Lista de LogEntry ordenados cronológicamente.
         """
-        entries = []
-        for log_file in sorted(self.log_dir.glob(f"{self.log_prefix}_*.jsonl")):
-            entries.extend(self._read_entries_from_file(log_file, trace_id=trace_id))
-        return entries
+        self.flush()
+        if not trace_id:
+            return self._scan_entries()
+        return self._indexed_entries("trace_id", trace_id)
 
     def get_traces_by_sinad(self, sinad: str) -> List[LogEntry]:
         """
@@ -451,10 +792,10 @@ class TraceLogger:
         Returns:
             Lista de LogEntry ordenados cronológicamente.
         """
-        entries = []
-        for log_file in sorted(self.log_dir.glob(f"{self.log_prefix}_*.jsonl")):
-            entries.extend(self._read_entries_from_file(log_file, sinad=sinad))
-        return entries
+        self.flush()
+        if not sinad:
+            return self._scan_entries()
+        return self._indexed_entries("sinad", sinad)
 
     def get_recent_entries(
         self,
@@ -469,31 +810,20 @@ class TraceLogger:
             level: Filtrar por nivel mínimo (ej: "WARNING" incluye WARNING+ERROR+CRITICAL).
 
         Returns:
-            Lista de LogEntry más recientes.
+            Lista de LogEntry más recientes, en orden cronológico.
         """
+        self.flush()
         min_weight = _LEVEL_WEIGHTS.get(level.upper(), 0) if level else 0
-        entries = []
-
-        # Leer archivos en orden inverso (más recientes primero)
-        log_files = sorted(
-            self.log_dir.glob(f"{self.log_prefix}_*.jsonl"),
-            reverse=True,
-        )
-
-        for log_file in log_files:
-            file_entries = self._read_entries_from_file(log_file)
-
-            if min_weight > 0:
-                file_entries = [
-                    e for e in file_entries if _LEVEL_WEIGHTS.get(e.level, 0) >= min_weight
-                ]
+        entries: List[LogEntry] = []
 
-            entries.extend(file_entries)
+        # Leer archivos desde el final, más recientes primero, hasta juntar
+        # `limit` entradas: no se parsean los archivos completos.
+        for log_file in reversed(self._list_log_files()):
             if len(entries) >= limit:
                 break
+            entries = self._read_tail(log_file, limit - len(entries), min_weight) + entries
 
-        # Retornar las más recientes, ordenadas cronológicamente
-        entries = entries[-limit:] if len(entries) > limit else entries
+        # Retornar ordenadas cronológicamente
         return sorted(entries, key=lambda e: e.timestamp)
 
     def get_stats(self) -> Dict[str, Any]:
@@ -503,30 +833,27 @@ class TraceLogger:
         Returns:
             Dict con total de archivos, entradas, traces únicos, etc.
         """
-        log_files = list(self.log_dir.glob(f"{self.log_prefix}_*.jsonl"))
-        total_entries = 0
-        trace_ids = set()
-        level_counts: Dict[str, int] = {}
-        error_count = 0
-
-        for log_file in log_files:
-            entries = self._read_entries_from_file(log_file)
-            total_entries += len(entries)
-            for entry in entries:
-                trace_ids.add(entry.trace_id)
-                level_counts[entry.level] = level_counts.get(entry.level, 0) + 1
-                if entry.error:
-                    error_count += 1
+        self.flush()
+        log_files = self._list_log_files()
+        with self._index_lock:
+            conn = self._trace_index_db()
+            total_entries, unique_traces, error_count = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT trace_id), COALESCE(SUM(has_error), 0) "
+                "FROM entries"
+            ).fetchone()
+            level_counts: Dict[str, int] = dict(
+                conn.execute("SELECT level, COUNT(*) FROM entries GROUP BY level")
+            )
 
         return {
             "log_dir": str(self.log_dir),
             "log_files_count": len(log_files),
             "total_entries": total_entries,
-            "unique_traces": len(trace_ids),
+            "unique_traces": unique_traces,
             "level_counts": level_counts,
             "error_entries": error_count,
             "has_active_trace": self.has_active_trace,
-            "active_trace_id": (self._active_context.trace_id if self._active_context else None),
+            "active_trace_id": (self.active_trace.trace_id if self.has_active_trace else None),
         }
 
     # ------------------------------------------------------------------
@@ -541,22 +868,25 @@ class TraceLogger:
         context: Optional[Dict[str, Any]] = None,
         duration_ms: Optional[float] = None,
         error: Optional[str] = None,
-    ) -> LogEntry:
+        pooled: bool = False,
+    ) -> Optional[LogEntry]:
         """
         Crea y escribe una entrada al archivo JSONL.
 
         Combina los datos explícitos con el contexto activo del trace.
+        Con pooled=True la entrada sale del pool de LogEntry, vuelve a él
+        tras serializarse y se retorna None (para eventos internos).
         """
         timestamp = datetime.now(timezone.utc).isoformat()
 
         # Resolver valores desde contexto activo si no se proporcionan
-        ctx = self._active_context
+        ctx = self.active_trace
         resolved_trace_id = ctx.trace_id if ctx else ""
         resolved_agent_id = agent_id or (ctx.agent_id if ctx else "")
         resolved_operation = operation or (ctx.operation if ctx else "")
         resolved_sinad = ctx.sinad if ctx else ""
 
-        entry = LogEntry(
+        entry = (LogEntry.acquire if pooled else LogEntry)(
             timestamp=timestamp,
             trace_id=resolved_trace_id,
             level=level,
@@ -569,14 +899,366 @@ class TraceLogger:
             duration_ms=duration_ms,
             error=error,
         )
+        line = entry.to_jsonl_bytes(self._logger_json) + b"\n"
+        if pooled:
+            entry.release()
+            entry = None
 
-        # Escribir al archivo del día (append-only)
-        log_file = self.current_log_file
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(entry.to_jsonl_line() + "\n")
+        # Encolar para el hilo escritor (append-only al archivo del día)
+        self._enqueue((self.current_log_file, line))
+        if level in _FLUSH_LEVELS:
+            self.flush()
 
         return entry
 
+    def flush(self) -> None:
+        """
+        Espera a que todas las entradas encoladas estén escritas.
+
+        Raises:
+            OSError: Si el hilo escritor no pudo escribir alguna entrada.
+        """
+        with self._lock:
+            idle = self._writer_thread is None
+        if not idle:
+            done = threading.Event()
+            self._enqueue(done)
+            done.wait()
+        self._raise_write_error()
+
+    def close(self) -> None:
+        """Escribe lo pendiente, detiene el hilo escritor y cierra archivo e índice."""
+        with self._lock:
+            thread = self._writer_thread
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            thread.join()
+        self._close_fd()
+        with self._index_lock:
+            if self._index_db is not None:
+                self._index_db.close()
+                self._index_db = None
+        self._raise_write_error()
+
+    def _raise_write_error(self) -> None:
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    def _enqueue(self, item: Any) -> None:
+        """Encola un ítem y arranca el hilo escritor si no está corriendo."""
+        with self._lock:
+            self._queue.put(item)
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop,
+                    name=f"TraceLogger-{self.log_prefix}",
+                    daemon=True,
+                )
+                self._writer_thread.start()
+
+    def _writer_loop(self) -> None:
+        """
+        Consumidor único de la cola: escribe lotes de líneas.
+
+        Ítems: (ruta, bytes) a escribir; threading.Event que se marca cuando
+        todo lo anterior está escrito; None para terminar. Solo termina con
+        la cola vacía (comprobado bajo _lock, igual que _enqueue).
+        """
+        while True:
+            try:
+                batch = [self._queue.get(timeout=WRITER_IDLE_S)]
+            except queue.Empty:
+                batch = []
+            while len(batch) < WRITER_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = self._write_batch(batch) or not batch
+            if stop:
+                with self._lock:
+                    if self._queue.empty():
+                        self._writer_thread = None
+                        return
+
+    def _write_batch(self, batch: List[Any]) -> bool:
+        """Escribe un lote; retorna True si contenía la señal de parada."""
+        stop = False
+        pending: List[bytes] = []
+        pending_file: Optional[Path] = None
+        for item in batch:
+            if item is None:
+                stop = True
+            elif isinstance(item, threading.Event):
+                self._write_lines(pending_file, pending)
+                pending = []
+                item.set()
+            else:
+                log_file, line = item
+                if log_file != pending_file:
+                    self._write_lines(pending_file, pending)
+                    pending = []
+                    pending_file = log_file
+                pending.append(line)
+        self._write_lines(pending_file, pending)
+        return stop
+
+    def _write_lines(self, log_file: Optional[Path], lines: List[bytes]) -> None:
+        """Agrega líneas al archivo indicado."""
+        if not lines:
+            return
+        try:
+            _write_all(self._get_fd(log_file), lines)
+        except OSError as e:
+            # Se reporta en el siguiente flush()/close() del productor
+            self._write_error = e
+            self._close_fd()
+
+    def _get_fd(self, log_file: Path) -> int:
+        """
+        Descriptor del archivo del día, abierto una vez y reabierto al rotar.
+
+        O_APPEND hace que cada write se agregue al final de forma atómica,
+        también frente a otros procesos que escriban el mismo archivo.
+        """
+        if self._open_file != log_file.name:
+            self._close_fd()
+            self._open_fd = os.open(str(log_file), _APPEND_FLAGS, 0o644)
+            self._open_file = log_file.name
+        return self._open_fd
+
+    def _close_fd(self) -> None:
+        fd, self._open_fd, self._open_file = self._open_fd, None, None
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "TraceLogger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _list_log_files(self) -> List[Path]:
+        """Archivos JSONL de este logger, ordenados por nombre (fecha)."""
+        mtime = self.log_dir.stat().st_mtime_ns
+        if self._files_cache is None or mtime != self._files_cache_mtime:
+            self._files_cache = sorted(self.log_dir.glob(f"{self.log_prefix}_*.jsonl"))
+            self._files_cache_mtime = mtime
+        return self._files_cache
+
+    def _scan_entries(self) -> List[LogEntry]:
+        """Lee todas las entradas de todos los archivos, en orden."""
+        entries = []
+        for log_file in self._list_log_files():
+            entries.extend(self._read_entries_from_file(log_file))
+        return entries
+
+    def _indexed_entries(self, column: str, value: str) -> List[LogEntry]:
+        """
+        Recupera vía índice las entradas con ``column == value``.
+
+        Args:
+            column: Columna indexada ("trace_id" o "sinad").
+            value: Valor buscado.
+        """
+        with self._index_lock:
+            rows = (
+                self._trace_index_db()
+                .execute(
+                    f"SELECT file, offset FROM entries WHERE {column} = ? ORDER BY file, offset",
+                    (value,),
+                )
+                .fetchall()
+            )
+
+        entries = []
+        by_file: Dict[str, List[int]] = {}
+        for name, offset in rows:
+            by_file.setdefault(name, []).append(offset)
+        for name, offsets in by_file.items():
+            try:
+                with open(self.log_dir / name, "rb") as f:
+                    for offset in offsets:
+                        f.seek(offset)
+                        try:
+                            entries.append(LogEntry.from_dict(_loads_jsonl(f.readline())))
+                        except (ValueError, TypeError):
+                            continue
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def _trace_index_db(self) -> sqlite3.Connection:
+        """
+        Retorna la conexión al índice de entradas, al día con los JSONL.
+
+        El índice guarda, por archivo, hasta qué byte está indexado; en cada
+        consulta solo se leen las líneas agregadas desde entonces (por este
+        u otro logger). Un archivo que encogió se reindexa desde cero y uno
+        que desapareció se quita del índice. Llamar con _index_lock tomado.
+        """
+        if self._index_db is None:
+            conn = sqlite3.connect(
+                str(self._index_path), isolation_level=None, check_same_thread=False
+            )
+            # Journal persistente (truncado, no borrado): cada transacción no
+            # crea/borra archivos en log_dir, lo que invalidaría _list_log_files
+            conn.execute("PRAGMA journal_mode=TRUNCATE")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "trace_id TEXT, sinad TEXT, ts TEXT, level TEXT, has_error INTEGER, "
+                "file TEXT, offset INTEGER)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_trace ON entries(trace_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sinad ON entries(sinad)")
+            conn.execute("CREATE TABLE IF NOT EXISTS files (file TEXT PRIMARY KEY, size INTEGER)")
+            self._index_db = conn
+
+        conn = self._index_db
+        # BEGIN IMMEDIATE: otro proceso no puede indexar lo mismo en paralelo
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            indexed = dict(conn.execute("SELECT file, size FROM files"))
+            current = {p.name: p for p in self._list_log_files()}
+            for name in indexed.keys() - current.keys():
+                conn.execute("DELETE FROM entries WHERE file = ?", (name,))
+                conn.execute("DELETE FROM files WHERE file = ?", (name,))
+            for name, path in current.items():
+                start = indexed.get(name, 0)
+                size = path.stat().st_size
+                if size == start:
+                    continue
+                if size < start:
+                    conn.execute("DELETE FROM entries WHERE file = ?", (name,))
+                    start = 0
+                end = self._index_file(conn, path, start)
+                conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?)", (name, end))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return conn
+
+    def _index_file(self, conn: sqlite3.Connection, file_path: Path, start: int) -> int:
+        """
+        Indexa las líneas completas de un archivo desde ``start``.
+
+        Las filas se generan en streaming hacia executemany: no se
+        construyen LogEntry ni se acumulan filas en memoria.
+
+        Returns:
+            Offset hasta donde quedó indexado el archivo.
+        """
+        name = file_path.name
+        indexed_to = start
+
+        def rows() -> Iterator[tuple]:
+            nonlocal indexed_to
+            for offset, end, data in self._iter_raw(file_path, start):
+                indexed_to = end
+                if data is not None:
+                    yield (
+                        data["trace_id"],
+                        data.get("sinad", ""),
+                        data["timestamp"],
+                        data["level"],
+                        1 if data.get("error") else 0,
+                        name,
+                        offset,
+                    )
+
+        conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", rows())
+        return indexed_to
+
+    @staticmethod
+    def _iter_raw(
+        file_path: Path, start: int = 0
+    ) -> Iterator[Tuple[int, int, Optional[Dict[str, Any]]]]:
+        """
+        Recorre las líneas completas de un JSONL desde ``start`` como dicts.
+
+        Yields:
+            (offset, offset_siguiente, datos) por línea; datos es None si la
+            línea está vacía, corrupta o no es una entrada válida. Una última
+            línea sin salto final (escritura en curso) no se entrega.
+        """
+        pos = start
+        with open(file_path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return
+                offset = pos
+                pos += len(line)
+                try:
+                    data = _loads_jsonl(line)
+                except ValueError:
+                    data = None
+                if not isinstance(data, dict) or not all(k in data for k in _REQUIRED_ENTRY_KEYS):
+                    data = None
+                yield offset, pos, data
+
+    def _read_tail(self, file_path: Path, n: int, min_weight: int = 0) -> List[LogEntry]:
+        """
+        Lee las últimas ``n`` entradas de un archivo JSONL (como ``tail -n``).
+
+        Recorre el archivo hacia atrás en bloques de TAIL_BLOCK_SIZE y se
+        detiene al juntar ``n`` entradas válidas con nivel >= min_weight.
+
+        Returns:
+            Lista de LogEntry en el orden del archivo.
+        """
+        tail: List[LogEntry] = []  # De la más reciente a la más antigua
+        try:
+            f = open(file_path, "rb")
+        except FileNotFoundError:
+            return tail
+
+        # Búsquedas globales/atributos resueltos una vez, no por línea
+        loads = _loads_jsonl
+        weight = _LEVEL_WEIGHTS.get
+        from_dict = LogEntry.from_dict
+        append = tail.append
+
+        def add(line: bytes) -> None:
+            line = line.strip()
+            if not line:
+                return
+            try:
+                data = loads(line)
+                # Filtrar por nivel antes de construir el LogEntry
+                if min_weight and weight(data.get("level"), 0) < min_weight:
+                    return
+                append(from_dict(data))
+            except (ValueError, TypeError, AttributeError):
+                pass  # Línea corrupta — saltar
+
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            leftover = b""
+            while pos > 0 and len(tail) < n:
+                step = min(TAIL_BLOCK_SIZE, pos)
+                pos -= step
+                f.seek(pos)
+                lines = (f.read(step) + leftover).split(b"\n")
+                # La primera puede estar cortada: se completa con el bloque previo
+                leftover = lines[0]
+                for line in reversed(lines[1:]):
+                    if len(tail) >= n:
+                        break
+                    add(line)
+            if pos == 0 and len(tail) < n:
+                add(leftover)
+
+        tail.reverse()
+        return tail
+
     def _read_entries_from_file(
         self,
         file_path: Path,
@@ -594,27 +1276,41 @@ class TraceLogger:
         Returns:
             Lista de LogEntry que cumplen los filtros.
         """
+        try:
+            size = file_path.stat().st_size
+        except FileNotFoundError:
+            return []
+
+        # Líneas en bytes: orjson (si está) las parsea sin decodificar antes.
+        # Archivos grandes vía mmap: el SO pagina y no hay capa io por línea.
+        with open(file_path, "rb") as f:
+            if size > MMAP_READ_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._parse_entries(_mmap_lines(mm), trace_id, sinad)
+            return self._parse_entries(f, trace_id, sinad)
+
+    @staticmethod
+    def _parse_entries(
+        lines: Iterable[bytes],
+        trace_id: Optional[str] = None,
+        sinad: Optional[str] = None,
+    ) -> List[LogEntry]:
+        """Parsea líneas JSONL a LogEntry, aplicando filtros y saltando corruptas."""
         entries = []
-        if not file_path.exists():
-            return entries
-
-        with open(file_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                data = _loads_jsonl(line)
+                # Aplicar filtros
+                if trace_id and data.get("trace_id") != trace_id:
                     continue
-                try:
-                    data = json.loads(line)
-                    # Aplicar filtros
-                    if trace_id and data.get("trace_id") != trace_id:
-                        continue
-                    if sinad and data.get("sinad") != sinad:
-                        continue
-                    entries.append(LogEntry.from_dict(data))
-                except (json.JSONDecodeError, TypeError):
-                    # Log corrupto — saltar sin detener lectura
+                if sinad and data.get("sinad") != sinad:
                     continue
-
+                entries.append(LogEntry.from_dict(data))
+            except (ValueError, TypeError, AttributeError):
+                # Log corrupto (JSON o UTF-8 inválido) — saltar sin detener lectura
+                continue
         return entries
 
     # ------------------------------------------------------------------
@@ -15,6 +15,8 @@ from .core import (
     LineaOCR,
     calcular_metricas_imagen,
     ejecutar_ocr,
+    ejecutar_ocr_lote,
+    ejecutar_ocr_paginas,
     ensure_lang_available,
     preprocesar_rotacion,
     renderizar_pagina,
@@ -26,6 +28,8 @@ from .core import (
 __all__ = [
     "renderizar_pagina",
     "ejecutar_ocr",
+    "ejecutar_ocr_paginas",
+    "ejecutar_ocr_lote",
     "preprocesar_rotacion",
     "calcular_metricas_imagen",
     "verificar_tesseract",
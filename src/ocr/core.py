@@ -17,14 +17,20 @@ Version: 4.0.0
 Fecha: 2026-02-17
 """
 
+import hashlib
 import io
 import logging
+import os
+import queue
+import sqlite3
 import subprocess
+import threading
 import time
-from collections import defaultdict
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +75,17 @@ except ImportError:
     pytesseract = None
     _ERRORES_DEPS.append("pytesseract no instalado")
 
+# tesserocr (API nativa de Tesseract, opcional): si esta instalado junto a
+# pytesseract, las llamadas a Tesseract reutilizan una API cargada por hilo
+# en vez de lanzar un proceso y recargar el traineddata en cada llamada
+try:
+    import tesserocr
+
+    TESSEROCR_DISPONIBLE = True
+except ImportError:
+    tesserocr = None
+    TESSEROCR_DISPONIBLE = False
+
 # OpenCV + NumPy (metricas de imagen, deskew)
 try:
     import cv2
@@ -93,6 +110,12 @@ elif TESSERACT_DISPONIBLE:
 else:
     _ACTIVE_ENGINE = "none"
 
+# Con Tesseract como motor se corren varios procesos en paralelo; el
+# OpenMP interno de cada uno solo compite por los mismos nucleos. No se
+# fija con PaddleOCR activo: el limite afectaria tambien a su inferencia.
+if _ACTIVE_ENGINE == "tesseract":
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
 
 __version__ = "4.0.0"
 
@@ -138,6 +161,37 @@ class LineaOCR:
         return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
 
 
+@dataclass
+class _BufferPagina:
+    """
+    Arrays NumPy de una pagina, convertidos una sola vez.
+
+    ``rgb`` se obtiene con np.asarray (sin copia para modos RGB/L) y
+    ``gris`` se calcula en el primer acceso con cv2.cvtColor y se reutiliza
+    en deskew, metricas y correccion.
+    """
+
+    rgb: Any  # np.ndarray HxWx3 (o HxW si la pagina ya es gris)
+    _gris: Any = field(default=None, repr=False)
+
+    @classmethod
+    def desde_imagen(cls, img: "Image.Image") -> "_BufferPagina":
+        """Crea el buffer desde una imagen PIL (RGB o L sin conversion)."""
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        return cls(rgb=np.asarray(img))
+
+    @property
+    def gris(self) -> Any:
+        """Escala de grises (uint8 HxW), calculada una vez."""
+        if self._gris is None:
+            if self.rgb.ndim == 2:
+                self._gris = self.rgb
+            else:
+                self._gris = cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY)
+        return self._gris
+
+
 # =============================================================================
 # HELPERS PRIVADOS — BBOX Y TRACELOGGER
 # =============================================================================
@@ -174,55 +228,67 @@ def _agrupar_palabras_en_lineas(data: Dict[str, Any]) -> List[LineaOCR]:
     Returns:
         List[LineaOCR] con una entrada por linea detectada.
     """
-    # Agrupar por (block_num, line_num)
-    lineas_agrupadas: Dict[Tuple[int, int], List[int]] = defaultdict(list)
-
-    n = len(data.get("text", []))
-    for i in range(n):
-        texto = data["text"][i]
+    textos = data.get("text", [])
+    n = len(textos)
+    # Columnas resueltas una sola vez (no una lista [0]*n por acceso)
+    ceros = [0] * n
+    blocks = data.get("block_num", ceros)
+    lines = data.get("line_num", ceros)
+    lefts = data.get("left", ceros)
+    tops = data.get("top", ceros)
+    widths = data.get("width", ceros)
+    heights = data.get("height", ceros)
+    confs = data.get("conf", [-1] * n)
+
+    # Una pasada: por (block_num, line_num) se acumulan textos, union de
+    # bboxes y suma/cantidad de confianzas validas
+    acumulados: Dict[Tuple[int, int], List[Any]] = {}
+    for i, texto in enumerate(textos):
         if not texto.strip():
             continue
-        block = data.get("block_num", [0] * n)[i]
-        line = data.get("line_num", [0] * n)[i]
-        lineas_agrupadas[(block, line)].append(i)
+        left = lefts[i]
+        top = tops[i]
+        right = left + widths[i]
+        bottom = top + heights[i]
+        conf = confs[i]
+        valida = conf != -1
+        key = (blocks[i], lines[i])
+        acc = acumulados.get(key)
+        if acc is None:
+            acumulados[key] = [
+                [texto],
+                left,
+                top,
+                right,
+                bottom,
+                conf if valida else 0,
+                1 if valida else 0,
+            ]
+            continue
+        acc[0].append(texto)
+        if left < acc[1]:
+            acc[1] = left
+        if top < acc[2]:
+            acc[2] = top
+        if right > acc[3]:
+            acc[3] = right
+        if bottom > acc[4]:
+            acc[4] = bottom
+        if valida:
+            acc[5] += conf
+            acc[6] += 1
 
     resultado: List[LineaOCR] = []
-    for key in sorted(lineas_agrupadas.keys()):
-        indices = lineas_agrupadas[key]
-        textos = [data["text"][i] for i in indices]
-        texto_linea = " ".join(textos)
-
-        # Union de bboxes
-        x_mins, y_mins, x_maxs, y_maxs = [], [], [], []
-        for i in indices:
-            left = data.get("left", [0] * n)[i]
-            top = data.get("top", [0] * n)[i]
-            width = data.get("width", [0] * n)[i]
-            height = data.get("height", [0] * n)[i]
-            x_mins.append(float(left))
-            y_mins.append(float(top))
-            x_maxs.append(float(left + width))
-            y_maxs.append(float(top + height))
-
-        bbox: Optional[Tuple[float, float, float, float]] = None
-        if x_mins:
-            bbox = (min(x_mins), min(y_mins), max(x_maxs), max(y_maxs))
-
+    for key in sorted(acumulados):
+        palabras, x_min, y_min, x_max, y_max, suma_conf, num_conf = acumulados[key]
         # Promedio de confianzas (Tesseract: 0-100, normalizar a 0-1)
-        confs = []
-        for i in indices:
-            conf = data.get("conf", [-1] * n)[i]
-            if conf != -1:
-                confs.append(conf / 100.0)
-
         confianza: Optional[float] = None
-        if confs:
-            confianza = sum(confs) / len(confs)
-
+        if num_conf:
+            confianza = suma_conf / num_conf / 100.0
         resultado.append(
             LineaOCR(
-                texto=texto_linea,
-                bbox=bbox,
+                texto=" ".join(palabras),
+                bbox=(float(x_min), float(y_min), float(x_max), float(y_max)),
                 confianza=confianza,
                 motor="tesseract",
             )
@@ -546,19 +612,105 @@ def _validar_dimensiones(img: "Image.Image", max_dim: Optional[int] = None) -> "
     return img.resize((nuevo_ancho, nuevo_alto), resample)
 
 
-def renderizar_pagina(pdf_path: Path, page_num: int, dpi: int = 200) -> Optional["Image.Image"]:
+# Cache LRU de paginas renderizadas (ya validadas por Regla 2), acotada por
+# bytes. Se guardan los bytes crudos de la imagen (inmutables) y cada hit
+# entrega una imagen PIL nueva, que el llamador puede modificar.
+_RENDER_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[str, Tuple[int, int], bytes]]" = OrderedDict()
+_RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_render_cache_bytes = 0
+_RENDER_CACHE_LOCK = threading.Lock()
+
+
+def _clave_render(pdf_path: Any, page_num: int, dpi: int) -> Optional[Tuple[Any, ...]]:
+    """
+    Clave de cache para una pagina: (ruta, mtime_ns, tamaño, pagina, dpi).
+
+    Acepta ruta o fitz.Document abierto desde archivo (usa doc.name).
+    Retorna None si no hay archivo en disco que identifique al PDF.
+    """
+    nombre = str(pdf_path) if isinstance(pdf_path, (str, Path)) else getattr(pdf_path, "name", "")
+    if not isinstance(nombre, str) or not nombre:
+        return None
+    try:
+        st = os.stat(nombre)
+    except (OSError, ValueError):
+        return None
+    return (os.path.abspath(nombre), st.st_mtime_ns, st.st_size, page_num, dpi)
+
+
+def _render_cache_get(clave: Tuple[Any, ...]) -> Optional["Image.Image"]:
+    """Imagen cacheada para ``clave`` (copia nueva) o None."""
+    with _RENDER_CACHE_LOCK:
+        entrada = _RENDER_CACHE.get(clave)
+        if entrada is None:
+            return None
+        _RENDER_CACHE.move_to_end(clave)
+    mode, size, data = entrada
+    return Image.frombytes(mode, size, data)
+
+
+def _render_cache_put(clave: Tuple[Any, ...], img: "Image.Image") -> None:
+    """Guarda ``img`` en la cache, desalojando las entradas mas antiguas."""
+    global _render_cache_bytes
+    data = img.tobytes()
+    if len(data) > _RENDER_CACHE_MAX_BYTES:
+        return
+    with _RENDER_CACHE_LOCK:
+        anterior = _RENDER_CACHE.pop(clave, None)
+        if anterior is not None:
+            _render_cache_bytes -= len(anterior[2])
+        _RENDER_CACHE[clave] = (img.mode, img.size, data)
+        _render_cache_bytes += len(data)
+        while _render_cache_bytes > _RENDER_CACHE_MAX_BYTES:
+            _, (_, _, viejo) = _RENDER_CACHE.popitem(last=False)
+            _render_cache_bytes -= len(viejo)
+
+
+def _escala_render(page: Any, dpi: int) -> float:
+    """
+    Escala (px por punto PDF) para renderizar ``page`` a ``dpi`` sin exceder
+    VISION_CONFIG["max_dimension_px"] en ningun lado.
+    """
+    from config.settings import VISION_CONFIG
+
+    escala = dpi / 72
+    max_dim = VISION_CONFIG.get("max_dimension_px", 2000)
+    ancho_pt = float(page.rect.width)
+    alto_pt = float(page.rect.height)
+    if ancho_pt <= 0 or alto_pt <= 0:
+        return escala
+    if ancho_pt * escala > max_dim or alto_pt * escala > max_dim:
+        escala = min(max_dim / ancho_pt, max_dim / alto_pt)
+    return escala
+
+
+def renderizar_pagina(
+    pdf_path: Union[Path, str, Any],
+    page_num: int,
+    dpi: int = 200,
+    matrix: Optional[Any] = None,
+) -> Optional["Image.Image"]:
     """
     Renderiza una pagina PDF a imagen PIL usando PyMuPDF.
 
-    Incluye validacion obligatoria de dimensiones (Regla 2):
-    si la imagen renderizada excede el limite configurado en
-    VISION_CONFIG["max_dimension_px"], se redimensiona automaticamente
-    antes de retornarla. El PDF original no se modifica.
+    Incluye validacion obligatoria de dimensiones (Regla 2): si a ``dpi``
+    la pagina excederia VISION_CONFIG["max_dimension_px"], se rasteriza
+    directamente a la escala maxima permitida; _validar_dimensiones se
+    aplica igual antes de retornar. El PDF original no se modifica.
+
+    La imagen se construye directamente desde las muestras RGB del
+    pixmap (sin codificar/decodificar un PNG intermedio). Las paginas de
+    PDFs en disco se cachean por (ruta, mtime, tamaño, pagina, dpi): pedir
+    otra vez la misma pagina no vuelve a rasterizar.
 
     Args:
-        pdf_path: Ruta al archivo PDF (Path o str)
+        pdf_path: Ruta al archivo PDF (Path o str), o un fitz.Document
+            ya abierto. Un documento abierto se reutiliza y no se cierra,
+            para no re-parsear el PDF en cada pagina.
         page_num: Numero de pagina (1-indexed)
         dpi: Resolucion de renderizado
+        matrix: fitz.Matrix precalculada para ``dpi`` (opcional). Permite
+            compartir una sola matriz al renderizar varias paginas.
 
     Returns:
         Imagen PIL (dentro del limite de dimensiones) o None si hay error
@@ -566,140 +718,603 @@ def renderizar_pagina(pdf_path: Path, page_num: int, dpi: int = 200) -> Optional
     if fitz is None or Image is None:
         return None
 
-    try:
-        doc = fitz.open(str(pdf_path))
-
-        if page_num < 1 or page_num > len(doc):
-            doc.close()
-            return None
-
-        page = doc[page_num - 1]
-        mat = fitz.Matrix(dpi / 72, dpi / 72)
-        pix = page.get_pixmap(matrix=mat)
-        img_data = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_data))
+    doc_propio = isinstance(pdf_path, (str, Path))
 
-        doc.close()
+    try:
+        clave = _clave_render(pdf_path, page_num, dpi)
+        if clave is not None:
+            cacheada = _render_cache_get(clave)
+            if cacheada is not None:
+                return cacheada
 
-        # Regla 2: validacion obligatoria de dimensiones
+        doc = fitz.open(str(pdf_path)) if doc_propio else pdf_path
+        try:
+            if page_num < 1 or page_num > len(doc):
+                return None
+
+            page = doc[page_num - 1]
+            # Rasterizar directo a la resolucion final: si a ``dpi`` la
+            # pagina excede el limite de Regla 2, se baja la escala aqui
+            # en vez de renderizar grande y reducir despues con LANCZOS
+            escala = _escala_render(page, dpi)
+            if escala != dpi / 72:
+                matrix = fitz.Matrix(escala, escala)
+            elif matrix is None:
+                matrix = fitz.Matrix(dpi / 72, dpi / 72)
+            pix = page.get_pixmap(matrix=matrix, alpha=False)
+            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        finally:
+            if doc_propio:
+                doc.close()
+
+        # Regla 2: validacion obligatoria de dimensiones (red de seguridad;
+        # con la escala ya acotada normalmente no redimensiona)
         img = _validar_dimensiones(img)
 
+        if clave is not None:
+            _render_cache_put(clave, img)
         return img
 
     except Exception:
         return None
 
 
+# =============================================================================
+# TESSERACT — tesserocr (API persistente) o pytesseract (subproceso)
+# =============================================================================
+
+# Modos de segmentacion usados (valores de tesseract --psm)
+_PSM_OSD_ONLY = 0
+_PSM_AUTO = 3
+_PSM_SINGLE_BLOCK = 6
+# Default de Tesseract para min_characters_to_try en OSD
+_OSD_MIN_CARACTERES_DEFAULT = 50
+
+_tess_local = threading.local()
+
+
+def _get_tess_api(lang: str, psm: int) -> Any:
+    """
+    Obtiene (o crea) la PyTessBaseAPI de este hilo para (lang, psm).
+
+    Crear la API carga el traineddata (100-300 MB): se hace una vez por
+    hilo y combinacion, no por pagina. PyTessBaseAPI no es thread-safe,
+    por eso no se comparte entre hilos.
+    """
+    apis = getattr(_tess_local, "apis", None)
+    if apis is None:
+        apis = _tess_local.apis = {}
+    api = apis.get((lang, psm))
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(lang=lang, psm=psm)
+        apis[(lang, psm)] = api
+    return api
+
+
+def _tess_image_to_data(img: "Image.Image", lang: str, psm: int = _PSM_AUTO) -> Dict[str, list]:
+    """
+    Palabras reconocidas con el formato de pytesseract.image_to_data (DICT).
+
+    Con tesserocr recorre el iterador a nivel palabra en una sola pasada y
+    arma las columnas text, conf, block_num, line_num, left, top, width y
+    height (line_num se numera dentro de cada bloque).
+    """
+    if not TESSEROCR_DISPONIBLE:
+        config = "" if psm == _PSM_AUTO else f"--psm {psm}"
+        return pytesseract.image_to_data(
+            img, lang=lang, output_type=pytesseract.Output.DICT, config=config
+        )
+
+    data: Dict[str, list] = {
+        k: [] for k in ("text", "conf", "block_num", "line_num", "left", "top", "width", "height")
+    }
+    api = _get_tess_api(lang, psm)
+    api.SetImage(img)
+    api.Recognize()
+    iterador = api.GetIterator()
+    if iterador is None:
+        return data
+
+    nivel = tesserocr.RIL.WORD
+    block = line = 0
+    for palabra in tesserocr.iterate_level(iterador, nivel):
+        if palabra.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+            block += 1
+            line = 0
+        if palabra.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+            line += 1
+        caja = palabra.BoundingBox(nivel)
+        if caja is None:
+            continue
+        x1, y1, x2, y2 = caja
+        data["text"].append(palabra.GetUTF8Text(nivel) or "")
+        data["conf"].append(palabra.Confidence(nivel))
+        data["block_num"].append(block)
+        data["line_num"].append(line)
+        data["left"].append(x1)
+        data["top"].append(y1)
+        data["width"].append(x2 - x1)
+        data["height"].append(y2 - y1)
+    return data
+
+
+def _tess_osd_rotate(img: "Image.Image", min_caracteres: Optional[int] = None) -> int:
+    """
+    Grados a rotar (sentido horario) segun OSD de Tesseract.
+
+    Args:
+        min_caracteres: min_characters_to_try para OSD; None usa el default
+            de Tesseract.
+
+    Raises:
+        Exception: si OSD no puede determinar la orientacion.
+    """
+    if not TESSEROCR_DISPONIBLE:
+        if min_caracteres is None:
+            osd = pytesseract.image_to_osd(img, output_type=pytesseract.Output.DICT)
+        else:
+            osd = pytesseract.image_to_osd(
+                img,
+                config=f"--psm 0 -c min_characters_to_try={min_caracteres}",
+                output_type=pytesseract.Output.DICT,
+            )
+        return int(osd.get("rotate", 0))
+
+    api = _get_tess_api("osd", _PSM_OSD_ONLY)
+    api.SetVariable("min_characters_to_try", str(min_caracteres or _OSD_MIN_CARACTERES_DEFAULT))
+    api.SetImage(img)
+    osd = api.DetectOrientationScript()
+    if not osd:
+        raise RuntimeError("OSD sin resultado")
+    # orient_deg es la orientacion detectada (antihoraria); Rotate = 360 - orient
+    return (360 - int(osd["orient_deg"])) % 360
+
+
 # =============================================================================
 # ROTACION Y DESKEW (Tesseract-only helpers, usados en fallback)
 # =============================================================================
 
 
+# Cache LRU de resultados OSD por huella visual de la imagen
+_OSD_CACHE: "OrderedDict[bytes, Tuple[int, str]]" = OrderedDict()
+_OSD_CACHE_MAX = 1024
+_OSD_CACHE_LOCK = threading.Lock()
+
+
+def _huella_imagen(img: "Image.Image") -> Optional[bytes]:
+    """
+    Huella perceptual barata: miniatura 32x32 en grises + dimensiones.
+
+    Paginas visualmente identicas (reintentos, reprocesos) comparten
+    huella. Retorna None si no se puede calcular.
+    """
+    try:
+        miniatura = img.resize((32, 32), Image.BILINEAR)
+        if miniatura.mode != "L":
+            miniatura = miniatura.convert("L")
+        miniatura = miniatura.tobytes()
+        h = hashlib.blake2b(miniatura, digest_size=16)
+        h.update(f"{img.size[0]}x{img.size[1]}".encode("ascii"))
+        return h.digest()
+    except Exception:
+        return None
+
+
+# Cache OSD persistente (SQLite) para sobrevivir reinicios del proceso:
+# huella -> rotate, con desalojo LRU por fecha de uso
+_OCR_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cache" / "ocr"
+_OSD_DISCO_MAX_FILAS = 100_000
+_OSD_DISCO_PODA_CADA = 1000
+_osd_db: Any = None  # sqlite3.Connection, False si no se pudo abrir
+_osd_db_inserciones = 0
+
+
+def _osd_disco() -> Optional[sqlite3.Connection]:
+    """
+    Conexion perezosa a la cache OSD en disco (llamar con _OSD_CACHE_LOCK).
+
+    Retorna None si el archivo no se puede abrir; la cache en memoria
+    sigue funcionando igual.
+    """
+    global _osd_db
+    if _osd_db is None:
+        try:
+            _OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(_OCR_CACHE_DIR / "osd.sqlite"),
+                timeout=5,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS osd ("
+                "huella BLOB PRIMARY KEY, rotate INTEGER NOT NULL, usado REAL NOT NULL)"
+            )
+            _osd_db = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Cache OSD en disco no disponible: %s", e)
+            _osd_db = False
+    return _osd_db or None
+
+
+def _osd_disco_get(clave: bytes) -> Optional[int]:
+    """Rotacion guardada en disco para ``clave`` (llamar con _OSD_CACHE_LOCK)."""
+    conn = _osd_disco()
+    if conn is None:
+        return None
+    try:
+        fila = conn.execute("SELECT rotate FROM osd WHERE huella = ?", (clave,)).fetchone()
+        if fila is None:
+            return None
+        conn.execute("UPDATE osd SET usado = ? WHERE huella = ?", (time.time(), clave))
+        return int(fila[0])
+    except sqlite3.Error:
+        return None
+
+
+def _osd_disco_put(clave: bytes, rotate: int) -> None:
+    """Guarda en disco y poda periodicamente (llamar con _OSD_CACHE_LOCK)."""
+    global _osd_db_inserciones
+    conn = _osd_disco()
+    if conn is None:
+        return
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO osd (huella, rotate, usado) VALUES (?, ?, ?)",
+            (clave, rotate, time.time()),
+        )
+        _osd_db_inserciones += 1
+        if _osd_db_inserciones >= _OSD_DISCO_PODA_CADA:
+            _osd_db_inserciones = 0
+            conn.execute(
+                "DELETE FROM osd WHERE huella IN ("
+                "SELECT huella FROM osd ORDER BY usado DESC LIMIT -1 OFFSET ?)",
+                (_OSD_DISCO_MAX_FILAS,),
+            )
+    except sqlite3.Error as e:
+        logger.debug("No se pudo guardar OSD en disco: %s", e)
+
+
 def _detectar_rotacion_osd(img: "Image.Image") -> Tuple[int, str]:
-    """Detecta rotacion usando Tesseract OSD."""
+    """
+    Detecta rotacion usando Tesseract OSD.
+
+    OSD es deterministico para una imagen: los resultados exitosos se
+    memorizan por huella visual, en memoria (_OSD_CACHE) y en disco
+    (SQLite bajo _OCR_CACHE_DIR, persiste entre procesos). Los fallos no
+    se cachean.
+    """
     if not TESSERACT_DISPONIBLE:
         return 0, "no_tesseract"
+
+    clave = _huella_imagen(img)
+    if clave is not None:
+        with _OSD_CACHE_LOCK:
+            cacheado = _OSD_CACHE.get(clave)
+            if cacheado is not None:
+                _OSD_CACHE.move_to_end(clave)
+                return cacheado
+            rotate = _osd_disco_get(clave)
+            if rotate is not None:
+                resultado = (rotate, "osd")
+                _guardar_osd_memoria(clave, resultado)
+                return resultado
+
     try:
-        osd = pytesseract.image_to_osd(img, output_type=pytesseract.Output.DICT)
-        rotate = osd.get("rotate", 0)
-        return int(rotate), "osd"
+        resultado = (_tess_osd_rotate(img), "osd")
     except Exception as e:
         return 0, f"osd_failed:{str(e)[:50]}"
 
+    if clave is not None:
+        with _OSD_CACHE_LOCK:
+            _guardar_osd_memoria(clave, resultado)
+            _osd_disco_put(clave, resultado[0])
+    return resultado
+
+
+def _guardar_osd_memoria(clave: bytes, resultado: Tuple[int, str]) -> None:
+    """Inserta en la cache LRU en memoria (llamar con _OSD_CACHE_LOCK)."""
+    _OSD_CACHE[clave] = resultado
+    if len(_OSD_CACHE) > _OSD_CACHE_MAX:
+        _OSD_CACHE.popitem(last=False)
+
+
+_executor_rotacion: Optional[ThreadPoolExecutor] = None
+_executor_rotacion_lock = threading.Lock()
+
+
+def _get_executor_rotacion() -> ThreadPoolExecutor:
+    """Pool de hilos (uno por angulo candidato) para el OCR de prueba."""
+    global _executor_rotacion
+    with _executor_rotacion_lock:
+        if _executor_rotacion is None:
+            _executor_rotacion = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="ocr_rotacion"
+            )
+        return _executor_rotacion
+
+
+def _puntuar_angulo(img: "Image.Image", angulo: int, lang: str) -> Optional[Tuple[int, float]]:
+    """OCR de prueba con la imagen rotada; retorna (palabras, confianza) o None si falla."""
+    img_rotada = _aplicar_rotacion(img, angulo)
+    try:
+        data = _tess_image_to_data(img_rotada, lang, _PSM_SINGLE_BLOCK)
+        textos = data["text"]
+        palabras = len(textos) - list(map(str.strip, textos)).count("")
+        confianzas = [c for c in data["conf"] if c > 0]
+        confianza = sum(confianzas) / len(confianzas) / 100 if confianzas else 0
+        return palabras, confianza
+    except Exception:
+        return None
+
+
+# OSD con umbral de caracteres reducido: el default de Tesseract (50) es lo
+# que hace fallar OSD en paginas con poco texto.
+_OSD_MIN_CARACTERES_BAJO_UMBRAL = 5
+
 
-def _detectar_rotacion_bruteforce(img: "Image.Image", lang: str = "eng") -> Tuple[int, str]:
-    """Detecta rotacion probando 0, 90, 180, 270."""
+def _detectar_rotacion_bruteforce(
+    img: "Image.Image", lang: str = "eng", angulos: Tuple[int, ...] = (0, 90, 180, 270)
+) -> Tuple[int, str]:
+    """
+    Detecta rotacion cuando OSD normal fallo.
+
+    Primero reintenta OSD con umbral de caracteres reducido (solo el
+    clasificador de orientacion, sin reconocimiento de texto). Si aun asi
+    falla, prueba OCR en cada angulo de ``angulos`` y elige por
+    palabras/confianza.
+    """
     if not TESSERACT_DISPONIBLE:
         return 0, "no_tesseract"
 
+    try:
+        return _tess_osd_rotate(img, _OSD_MIN_CARACTERES_BAJO_UMBRAL), "osd_bajo_umbral"
+    except Exception:
+        pass
+
+    # OCR de prueba en paralelo: pytesseract lanza un proceso por llamada y
+    # tesserocr libera el GIL al reconocer. El pool es persistente para que
+    # cada hilo conserve su API de tesserocr entre paginas. El ranking se
+    # aplica en el orden de ``angulos``: no depende del orden de llegada.
+    puntajes: Dict[int, Tuple[int, float]] = {}
+    futuros = {
+        _get_executor_rotacion().submit(_puntuar_angulo, img, angulo, lang): angulo
+        for angulo in angulos
+    }
+    for futuro in as_completed(futuros):
+        puntaje = futuro.result()
+        if puntaje is None:
+            continue
+        palabras, confianza = puntaje
+        if palabras >= 20 and confianza >= 0.75:
+            for pendiente in futuros:
+                pendiente.cancel()
+            return futuros[futuro], "bruteforce_early"
+        puntajes[futuros[futuro]] = puntaje
+
     mejor_angulo = 0
     mejor_palabras = 0
     mejor_confianza = 0.0
+    for angulo in angulos:
+        if angulo not in puntajes:
+            continue
+        palabras, confianza = puntajes[angulo]
+        if palabras > mejor_palabras or (
+            palabras == mejor_palabras and confianza > mejor_confianza
+        ):
+            mejor_angulo = angulo
+            mejor_palabras = palabras
+            mejor_confianza = confianza
 
-    for angulo in [0, 90, 180, 270]:
-        if angulo == 0:
-            img_rotada = img
-        else:
-            img_rotada = img.rotate(-angulo, expand=True)
+    return mejor_angulo, "bruteforce"
 
-        try:
-            data = pytesseract.image_to_data(
-                img_rotada, lang=lang, output_type=pytesseract.Output.DICT, config="--psm 6"
+
+# Lado maximo de la imagen binarizada usada por _estimar_angulo_lineas
+_PROYECCION_MAX_PX = 512
+# Relacion minima pico/mediana de la energia de proyeccion para aceptar
+# el angulo estimado (texto real ~2.0, ruido ~1.1)
+_PROYECCION_FUERZA_MIN = 1.5
+
+
+def _estimar_angulo_lineas(img: "Image.Image") -> Tuple[Optional[float], float]:
+    """
+    Estima el angulo dominante de las lineas de texto por proyecciones.
+
+    Transformada de Radon discreta sobre los pixeles de tinta de una version
+    reducida y binarizada (Otsu) de la imagen: para cada angulo se proyectan
+    los pixeles sobre la normal a la linea y se mide la energia del
+    histograma (suma de cuadrados), maxima cuando las lineas de texto quedan
+    alineadas. Barrido grueso de 1 grado en [-90, 90) y refinamiento de
+    0.05 grados en +-1 grado alrededor del pico.
+
+    La proyeccion no distingue 0 de 180 ni 90 de 270: el angulo indica si
+    las lineas son horizontales o verticales y su inclinacion residual.
+
+    Returns:
+        (angulo, fuerza). angulo en grados, [-90, 90), positivo cuando la
+        linea desciende hacia la derecha; None si no hay tinta suficiente.
+        fuerza: relacion entre la energia del pico y la mediana.
+    """
+    if not CV2_DISPONIBLE:
+        return None, 0.0
+
+    try:
+        img_gray = np.asarray(img if img.mode == "L" else img.convert("L"))
+        alto, ancho = img_gray.shape
+        escala = _PROYECCION_MAX_PX / max(alto, ancho)
+        if escala < 1:
+            img_gray = cv2.resize(
+                img_gray,
+                (max(1, int(ancho * escala)), max(1, int(alto * escala))),
+                interpolation=cv2.INTER_AREA,
             )
+        _, binary = cv2.threshold(img_gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+
+        ys, xs = np.nonzero(binary)
+        if ys.size < 100:
+            return None, 0.0
+        ys = ys - ys.mean()
+        xs = xs - xs.mean()
+
+        def energia(angulos: "np.ndarray") -> "np.ndarray":
+            puntajes = np.empty(len(angulos))
+            for k, theta in enumerate(np.deg2rad(angulos)):
+                rho = np.rint(ys * np.cos(theta) - xs * np.sin(theta)).astype(np.intp)
+                hist = np.bincount(rho - rho.min())
+                puntajes[k] = np.dot(hist, hist)
+            return puntajes
+
+        gruesos = np.arange(-90.0, 90.0, 1.0)
+        puntajes = energia(gruesos)
+        pico = int(puntajes.argmax())
+        fuerza = float(puntajes[pico] / np.median(puntajes))
+
+        finos = np.linspace(gruesos[pico] - 1, gruesos[pico] + 1, 41)
+        angulo = float(finos[energia(finos).argmax()])
+        if angulo < -90:
+            angulo += 180
+        elif angulo >= 90:
+            angulo -= 180
+        return angulo, fuerza
 
-            palabras = sum(1 for t in data["text"] if t.strip())
-            confianzas = [c for c in data["conf"] if c != -1 and c > 0]
-            confianza = sum(confianzas) / len(confianzas) / 100 if confianzas else 0
+    except Exception:
+        return None, 0.0
 
-            if palabras > mejor_palabras or (
-                palabras == mejor_palabras and confianza > mejor_confianza
-            ):
-                mejor_angulo = angulo
-                mejor_palabras = palabras
-                mejor_confianza = confianza
 
-            if palabras >= 20 and confianza >= 0.75:
-                return angulo, "bruteforce_early"
+# Lado maximo de la imagen usada para el barrido de deskew
+_DESKEW_MAX_PX = 800
+# Barrido de deskew: grueso cada 1 grado en +-15, fino cada 0.25 alrededor
+_DESKEW_ANGULOS_GRUESOS = tuple(float(a) for a in range(-15, 16))
+_DESKEW_PASO_FINO = 0.25
 
-        except Exception:
-            continue
 
-    return mejor_angulo, "bruteforce"
+def _puntaje_perfil(binary: "np.ndarray", angulo: float) -> int:
+    """
+    Puntaje de alineacion de filas tras rotar ``binary`` por ``angulo``.
+
+    Suma de cuadrados de las diferencias entre filas consecutivas del
+    perfil de proyeccion horizontal: maximo cuando las lineas de texto
+    quedan horizontales, y robusto a columnas de texto desalineadas.
+    """
+    alto, ancho = binary.shape
+    M = cv2.getRotationMatrix2D((ancho / 2, alto / 2), angulo, 1.0)
+    rotada = cv2.warpAffine(binary, M, (ancho, alto), flags=cv2.INTER_NEAREST)
+    # Suma por fila en OpenCV (SIMD): ~10x mas rapida que ndarray.sum(axis=1)
+    perfil = cv2.reduce(rotada, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+    diferencias = np.diff(perfil).astype(np.int64)
+    return int(np.dot(diferencias, diferencias))
 
 
-def _detectar_deskew(img: "Image.Image") -> float:
-    """Detecta inclinacion leve (deskew)."""
+def _detectar_deskew(img: Union["Image.Image", _BufferPagina], rotacion: int = 0) -> float:
+    """
+    Detecta inclinacion leve (deskew) por perfil de proyeccion.
+
+    Barre angulos sobre la imagen reducida (<= _DESKEW_MAX_PX) y binarizada
+    con Otsu, y elige el que maximiza _puntaje_perfil: primero cada 1 grado
+    en +-15, luego cada 0.25 grados alrededor del mejor. El angulo
+    retornado es el que _aplicar_deskew debe aplicar para nivelar el texto.
+
+    Acepta una imagen PIL o un _BufferPagina (reutiliza su gris). Con
+    ``rotacion`` (90/180/270, horario) se mide la inclinacion de la pagina
+    ya rotada: solo se rota el binario reducido, no la pagina completa.
+    """
     if not CV2_DISPONIBLE:
         return 0.0
 
     try:
-        img_gray = img.convert("L")
-        img_array = np.array(img_gray)
-
-        binary = cv2.adaptiveThreshold(
-            img_array, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2
-        )
+        if not isinstance(img, _BufferPagina):
+            img = _BufferPagina.desde_imagen(img)
+        img_array = img.gris
+
+        # Reducir primero y binarizar con Otsu (histograma global): para
+        # estimar la inclinacion no hace falta umbral adaptativo local
+        alto, ancho = img_array.shape
+        escala = _DESKEW_MAX_PX / max(alto, ancho)
+        if escala < 1:
+            img_array = cv2.resize(
+                img_array,
+                (max(1, int(ancho * escala)), max(1, int(alto * escala))),
+                interpolation=cv2.INTER_AREA,
+            )
+        _, binary = cv2.threshold(img_array, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        if rotacion % 360:
+            binary = np.ascontiguousarray(np.rot90(binary, -(rotacion // 90)))
 
-        coords = np.column_stack(np.where(binary > 0))
-        if len(coords) < 100:
+        if cv2.countNonZero(binary) < 100:
             return 0.0
 
-        rect = cv2.minAreaRect(coords)
-        angle = rect[-1]
-
-        if angle < -45:
-            angle = 90 + angle
-        elif angle > 45:
-            angle = angle - 90
+        angle = max(_DESKEW_ANGULOS_GRUESOS, key=lambda a: _puntaje_perfil(binary, a))
+        finos = [angle + k * _DESKEW_PASO_FINO for k in range(-3, 4)]
+        angle = max(finos, key=lambda a: _puntaje_perfil(binary, a))
 
+        # Multiplos exactos de _DESKEW_PASO_FINO: no hace falta redondear
         if abs(angle) <= 15:
-            return round(angle, 2)
+            return float(angle)
         return 0.0
 
     except Exception:
         return 0.0
 
 
+# Lado maximo de la region central usada para detectar orientacion
+_ROI_ROTACION_MAX_PX = 1000
+
+
+def _roi_rotacion(img: "Image.Image") -> "Image.Image":
+    """
+    Recorta la region central de la pagina para detectar orientacion.
+
+    La orientacion es global a la pagina: la mitad central (1/4 del area)
+    basta para OSD/bruteforce, y el costo de Tesseract escala con los
+    pixeles. Si el recorte excede _ROI_ROTACION_MAX_PX se reduce ademas.
+    La imagen original no se modifica.
+    """
+    w, h = img.size
+    roi = img.crop((w // 4, h // 4, 3 * w // 4, 3 * h // 4))
+    if max(roi.size) > _ROI_ROTACION_MAX_PX:
+        roi.thumbnail((_ROI_ROTACION_MAX_PX, _ROI_ROTACION_MAX_PX), Image.BILINEAR)
+    return roi
+
+
+# Transposiciones PIL equivalentes a rotar 90/180/270 grados en sentido
+# horario (Pillow < 9.1 expone las constantes en el propio modulo Image)
+if Image is not None:
+    _Transpose = getattr(Image, "Transpose", Image)
+    _TRANSPOSICION_HORARIA = {
+        90: _Transpose.ROTATE_270,
+        180: _Transpose.ROTATE_180,
+        270: _Transpose.ROTATE_90,
+    }
+else:
+    _TRANSPOSICION_HORARIA = {}
+
+
 def _aplicar_rotacion(img: "Image.Image", angulo: int) -> "Image.Image":
-    """Aplica rotacion de 0, 90, 180 o 270 grados."""
-    if angulo == 0:
+    """
+    Aplica rotacion de 0, 90, 180 o 270 grados (sentido horario).
+
+    Usa transpose: permutacion exacta de pixeles, sin remuestrear.
+    """
+    transposicion = _TRANSPOSICION_HORARIA.get(angulo)
+    if transposicion is None:
         return img
-    elif angulo == 90:
-        return img.rotate(-90, expand=True)
-    elif angulo == 180:
-        return img.rotate(180, expand=True)
-    elif angulo == 270:
-        return img.rotate(-270, expand=True)
-    return img
+    return img.transpose(transposicion)
 
 
-def _aplicar_deskew(img: "Image.Image", angulo: float) -> "Image.Image":
-    """Aplica correccion de inclinacion leve."""
+def _aplicar_deskew(
+    img: "Image.Image", angulo: float, buffer: Optional[_BufferPagina] = None
+) -> "Image.Image":
+    """
+    Aplica correccion de inclinacion leve.
+
+    Si se pasa ``buffer`` (de la misma ``img``), se rota su array en vez
+    de volver a convertir la imagen.
+    """
     if not CV2_DISPONIBLE or abs(angulo) < 0.5:
         return img
 
     try:
-        img_array = np.array(img)
+        img_array = buffer.rgb if buffer is not None else np.asarray(img)
         h, w = img_array.shape[:2]
         center = (w // 2, h // 2)
 
@@ -713,6 +1328,53 @@ def _aplicar_deskew(img: "Image.Image", angulo: float) -> "Image.Image":
         return img
 
 
+def _matriz_rotacion_ortogonal(angulo: int, ancho: int, alto: int) -> "np.ndarray":
+    """
+    Matriz afin 3x3 (origen -> destino) de la rotacion horaria ``angulo``.
+
+    Equivale pixel a pixel a _aplicar_rotacion sobre una imagen ancho x alto.
+    """
+    if angulo == 90:
+        return np.array([[0, -1, alto - 1], [1, 0, 0], [0, 0, 1]], dtype=np.float64)
+    if angulo == 180:
+        return np.array([[-1, 0, ancho - 1], [0, -1, alto - 1], [0, 0, 1]], dtype=np.float64)
+    if angulo == 270:
+        return np.array([[0, 1, 0], [-1, 0, ancho - 1], [0, 0, 1]], dtype=np.float64)
+    return np.eye(3)
+
+
+def _aplicar_rotacion_y_deskew(
+    img: "Image.Image", rotacion: int, deskew: float, buffer: Optional[_BufferPagina] = None
+) -> "Image.Image":
+    """
+    Aplica rotacion ortogonal y deskew con un solo warpAffine.
+
+    Compone ambas transformaciones en una matriz: la pagina se convierte a
+    array una vez y se remuestrea una vez, sin la copia intermedia de la
+    transposicion. Sin deskew significativo solo se transpone. ``buffer``,
+    si se pasa, debe ser el de ``img`` sin rotar.
+    """
+    if not CV2_DISPONIBLE or abs(deskew) < 0.5:
+        return _aplicar_rotacion(img, rotacion)
+    if rotacion not in _TRANSPOSICION_HORARIA:
+        return _aplicar_deskew(img, deskew, buffer)
+
+    try:
+        img_array = buffer.rgb if buffer is not None else np.asarray(img)
+        alto, ancho = img_array.shape[:2]
+        dims = (alto, ancho) if rotacion in (90, 270) else (ancho, alto)
+        D = np.vstack(
+            [cv2.getRotationMatrix2D((dims[0] // 2, dims[1] // 2), deskew, 1.0), [0, 0, 1]]
+        )
+        M = (D @ _matriz_rotacion_ortogonal(rotacion, ancho, alto))[:2]
+        rotated = cv2.warpAffine(
+            img_array, M, dims, flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE
+        )
+        return Image.fromarray(rotated)
+    except Exception:
+        return _aplicar_deskew(_aplicar_rotacion(img, rotacion), deskew)
+
+
 def preprocesar_rotacion(
     img: "Image.Image", lang: str = "eng"
 ) -> Tuple["Image.Image", Dict[str, Any]]:
@@ -721,7 +1383,8 @@ def preprocesar_rotacion(
 
     Si PaddleOCR es el motor activo, delega la rotacion a PaddleOCR
     (use_doc_orientation_classify=True) y retorna info dict indicando
-    metodo "paddleocr_builtin".
+    metodo "paddleocr_builtin". No se hace ningun trabajo de CPU (ni OSD,
+    ni proyecciones, ni deskew): su detector tolera la inclinacion.
 
     Si Tesseract es el motor activo, usa la logica manual de OSD/bruteforce.
 
@@ -738,30 +1401,51 @@ def preprocesar_rotacion(
     # PaddleOCR maneja rotacion internamente
     if _ACTIVE_ENGINE == "paddleocr":
         info["rotacion_metodo"] = "paddleocr_builtin"
+        info["deskew_omitido"] = "paddleocr_builtin"
         # No modificamos la imagen; PaddleOCR la corrige en predict()
         return img, info
 
-    # Tesseract: deteccion manual
-    rotacion, metodo = _detectar_rotacion_osd(img)
+    # Tesseract: deteccion manual sobre la region central; la rotacion
+    # detectada se aplica a la pagina completa
+    img_roi = _roi_rotacion(img)
+    rotacion, metodo = _detectar_rotacion_osd(img_roi)
+
+    # Angulo de las lineas por proyeccion: orientacion horizontal/vertical
+    # e inclinacion residual en una sola pasada, sin Tesseract
+    angulo_lineas, fuerza = _estimar_angulo_lineas(img_roi)
+    proyeccion_valida = angulo_lineas is not None and fuerza >= _PROYECCION_FUERZA_MIN
 
     if "osd_failed" in metodo or metodo == "no_tesseract":
-        rotacion, metodo = _detectar_rotacion_bruteforce(img, lang)
+        angulos = (0, 90, 180, 270)
+        if proyeccion_valida:
+            # La proyeccion descarta la mitad de los candidatos
+            angulos = (0, 180) if abs(angulo_lineas) < 45 else (90, 270)
+        rotacion, metodo = _detectar_rotacion_bruteforce(img_roi, lang, angulos)
 
     info["rotacion_metodo"] = metodo
 
     if rotacion != 0:
-        img = _aplicar_rotacion(img, rotacion)
         info["rotacion_grados"] = rotacion
         info["rotacion_aplicada"] = True
 
-    deskew = _detectar_deskew(img)
+    if proyeccion_valida:
+        # Inclinacion respecto al multiplo de 90 mas cercano; es la misma
+        # tras aplicar cualquier rotacion ortogonal
+        deskew = angulo_lineas - 90 * round(angulo_lineas / 90)
+        if abs(deskew) > 15:
+            deskew = 0.0
+        buffer = None
+    else:
+        # Un solo array (y un solo gris) de la pagina sin rotar para
+        # detectar y corregir; la rotacion se aplica al binario reducido
+        buffer = _BufferPagina.desde_imagen(img) if CV2_DISPONIBLE else None
+        deskew = _detectar_deskew(buffer if buffer is not None else img, rotacion)
     if abs(deskew) >= 0.5:
-        img = _aplicar_deskew(img, deskew)
-        info["deskew_grados"] = deskew
+        # Unico redondeo, al exponer los valores en info
+        info["deskew_grados"] = round(deskew, 2)
         info["rotacion_aplicada"] = True
-        info["rotacion_grados"] = rotacion + deskew
-
-    info["rotacion_grados"] = round(info["rotacion_grados"], 2)
+        info["rotacion_grados"] = round(rotacion + deskew, 2)
+    img = _aplicar_rotacion_y_deskew(img, rotacion, deskew, buffer)
 
     return img, info
 
@@ -771,8 +1455,23 @@ def preprocesar_rotacion(
 # =============================================================================
 
 
-def calcular_metricas_imagen(img: "Image.Image", dpi_render: int = 200) -> Dict[str, Any]:
-    """Calcula metricas de calidad de imagen."""
+# Lado maximo de la imagen sobre la que se calculan contraste y blur
+_METRICAS_MAX_PX = 800
+
+
+def calcular_metricas_imagen(
+    img: "Image.Image", dpi_render: int = 200, buffer: Optional[_BufferPagina] = None
+) -> Dict[str, Any]:
+    """
+    Calcula metricas de calidad de imagen.
+
+    contraste y blur_score se miden sobre una version reducida de la
+    imagen (lado mayor <= _METRICAS_MAX_PX); width_px/height_px son los
+    de la imagen original. Los percentiles del contraste salen de un
+    histograma de 256 niveles (una pasada, sin ordenar).
+
+    Si se pasa ``buffer`` (de la misma ``img``), se reutiliza su gris.
+    """
     metricas = {
         "dpi_estimado": dpi_render,
         "width_px": img.width,
@@ -786,15 +1485,26 @@ def calcular_metricas_imagen(img: "Image.Image", dpi_render: int = 200) -> Dict[
         return metricas
 
     try:
-        img_gray = img.convert("L")
-        img_array = np.array(img_gray)
-
-        p5 = np.percentile(img_array, 5)
-        p95 = np.percentile(img_array, 95)
+        ancho, alto = img.size
+        escala = _METRICAS_MAX_PX / max(ancho, alto)
+        reducido = (max(1, int(ancho * escala)), max(1, int(alto * escala)))
+        if buffer is not None:
+            img_array = buffer.gris
+            if escala < 1:
+                img_array = cv2.resize(img_array, reducido, interpolation=cv2.INTER_AREA)
+        else:
+            if escala < 1:
+                img = img.resize(reducido, Image.BILINEAR)
+            img_array = _BufferPagina.desde_imagen(img).gris
+
+        hist = np.bincount(img_array.ravel(), minlength=256)
+        cdf = hist.cumsum()
+        p5 = int(np.searchsorted(cdf, 0.05 * cdf[-1]))
+        p95 = int(np.searchsorted(cdf, 0.95 * cdf[-1]))
         metricas["contraste"] = round((p95 - p5) / 255.0, 3)
 
-        laplacian = cv2.Laplacian(img_array, cv2.CV_64F)
-        metricas["blur_score"] = round(laplacian.var(), 2)
+        laplacian = cv2.Laplacian(img_array, cv2.CV_32F)
+        metricas["blur_score"] = round(float(laplacian.var()), 2)
     except Exception:
         pass
 
@@ -831,7 +1541,9 @@ def _ejecutar_ocr_paddleocr(img: "Image.Image", lang: str = "eng") -> Dict[str,
 
     inicio = time.time()
 
-    # PaddleOCR 3.x acepta numpy arrays
+    # PaddleOCR 3.x acepta numpy arrays. Copia escribible explicita: el
+    # array de np.asarray(PIL) es de solo lectura y el pipeline de
+    # PaddleOCR puede modificar su entrada
     if np is not None:
         img_input = np.array(img)
     else:
@@ -919,7 +1631,7 @@ def _ejecutar_ocr_tesseract(img: "Image.Image", lang: str = "eng") -> Dict[str,
     try:
         inicio = time.time()
 
-        data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DICT)
+        data = _tess_image_to_data(img, lang)
 
         resultado["tiempo_ms"] = int((time.time() - inicio) * 1000)
 
@@ -1084,3 +1796,164 @@ def ejecutar_ocr(
         "motor_ocr": "none",
         "lineas": [],
     }
+
+
+# =============================================================================
+# OCR MULTIPAGINA — UN PROCESO TESSERACT MONOHILO POR PAGINA
+# =============================================================================
+
+
+def _init_worker_ocr() -> None:
+    """Inicializador de workers: Tesseract monohilo en cada proceso."""
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _ocr_pagina_worker(args: Tuple[str, Tuple[int, int], bytes, str]) -> Dict[str, Any]:
+    """Reconstruye la imagen desde bytes crudos y ejecuta OCR (en un worker)."""
+    mode, size, datos, lang = args
+    return ejecutar_ocr(Image.frombytes(mode, size, datos), lang)
+
+
+def ejecutar_ocr_paginas(
+    imgs: List["Image.Image"],
+    lang: str = "eng",
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Ejecuta OCR sobre varias paginas, repartiendolas entre procesos.
+
+    El OpenMP interno de Tesseract escala mal: rinde mas un Tesseract
+    monohilo por pagina con varios procesos en paralelo. Cada worker fija
+    OMP_THREAD_LIMIT=1 antes de invocar Tesseract. Las imagenes viajan como
+    bytes crudos (mode, size, tobytes), sin recomprimir a PNG.
+
+    Con PaddleOCR como motor (modelo pesado, posiblemente en GPU), con una
+    sola pagina o con workers=1 se procesa en serie en este proceso.
+
+    Args:
+        imgs: Paginas a procesar (imagenes PIL).
+        lang: Codigo de idioma Tesseract (ej: "spa", "eng").
+        workers: Numero de procesos (default: os.cpu_count()).
+
+    Returns:
+        Lista de resultados de ejecutar_ocr, en el mismo orden que ``imgs``.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(imgs))
+    if _ACTIVE_ENGINE != "tesseract" or workers <= 1:
+        return [ejecutar_ocr(img, lang) for img in imgs]
+
+    tareas = [(img.mode, img.size, img.tobytes(), lang) for img in imgs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_ocr) as executor:
+        return list(executor.map(_ocr_pagina_worker, tareas))
+
+
+# =============================================================================
+# PIPELINE PDF — RENDER, PREPROCESO Y OCR SOLAPADOS
+# =============================================================================
+
+# Paginas en vuelo entre etapas: acota la memoria (cada pagina ~12 MB RGB)
+_PIPELINE_COLA_MAX = 4
+_FIN_PIPELINE = object()
+
+
+def ejecutar_ocr_lote(
+    pdf_path: Union[Path, str, Any],
+    paginas: List[int],
+    lang: str = "spa",
+    dpi: int = 200,
+    trace_logger: Any = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    OCR de varias paginas de un PDF con etapas solapadas en un pipeline.
+
+    Tres etapas conectadas por colas acotadas (_PIPELINE_COLA_MAX):
+    render (PyMuPDF, hilo propio), preproceso (preprocesar_rotacion +
+    _validar_dimensiones, hilo propio) y OCR (hilo llamador). Mientras el
+    motor reconoce una pagina (p.ej. PaddleOCR en GPU), las siguientes ya
+    se estan rasterizando y corrigiendo en CPU. Un solo modelo OCR en el
+    proceso: es el camino indicado para PaddleOCR; con Tesseract escala
+    mas ejecutar_ocr_paginas (varios procesos).
+
+    Args:
+        pdf_path: Ruta al PDF o fitz.Document ya abierto (no se cierra).
+            Solo el hilo de render accede al documento.
+        paginas: Numeros de pagina (1-indexed) a procesar.
+        lang: Codigo de idioma Tesseract (ej: "spa", "eng").
+        dpi: Resolucion de renderizado.
+        trace_logger: TraceLogger opcional, se pasa a ejecutar_ocr.
+
+    Returns:
+        Lista alineada con ``paginas``: dict con rotacion_info y ocr
+        (resultado de ejecutar_ocr), o None si la pagina no se pudo
+        renderizar o preprocesar.
+    """
+    paginas = list(paginas)
+    resultados: List[Optional[Dict[str, Any]]] = [None] * len(paginas)
+    renderizadas: "queue.Queue[Any]" = queue.Queue(maxsize=_PIPELINE_COLA_MAX)
+    preprocesadas: "queue.Queue[Any]" = queue.Queue(maxsize=_PIPELINE_COLA_MAX)
+    cancelado = threading.Event()
+
+    def _render() -> None:
+        doc_propio = fitz is not None and isinstance(pdf_path, (str, Path))
+        doc = None
+        try:
+            doc = fitz.open(str(pdf_path)) if doc_propio else pdf_path
+            matriz = fitz.Matrix(dpi / 72, dpi / 72) if fitz is not None else None
+            for indice, page_num in enumerate(paginas):
+                if cancelado.is_set():
+                    break
+                renderizadas.put((indice, renderizar_pagina(doc, page_num, dpi, matrix=matriz)))
+        except Exception as e:
+            logger.warning("Pipeline OCR: render interrumpido (%s)", str(e)[:100])
+        finally:
+            if doc_propio and doc is not None:
+                doc.close()
+            renderizadas.put(_FIN_PIPELINE)
+
+    def _preprocesar() -> None:
+        try:
+            while True:
+                item = renderizadas.get()
+                if item is _FIN_PIPELINE:
+                    break
+                indice, img = item
+                if img is None or cancelado.is_set():
+                    continue
+                try:
+                    img, rot_info = preprocesar_rotacion(img, lang)
+                    # Regla 2: validacion post-rotacion obligatoria
+                    img = _validar_dimensiones(img)
+                except Exception as e:
+                    logger.warning("Pipeline OCR: preproceso fallo (%s)", str(e)[:100])
+                    continue
+                preprocesadas.put((indice, img, rot_info))
+        finally:
+            preprocesadas.put(_FIN_PIPELINE)
+
+    hilos = [
+        threading.Thread(target=_render, name="ocr-render", daemon=True),
+        threading.Thread(target=_preprocesar, name="ocr-preproceso", daemon=True),
+    ]
+    for hilo in hilos:
+        hilo.start()
+
+    try:
+        while True:
+            item = preprocesadas.get()
+            if item is _FIN_PIPELINE:
+                break
+            indice, img, rot_info = item
+            resultados[indice] = {
+                "rotacion_info": rot_info,
+                "ocr": ejecutar_ocr(img, lang, trace_logger),
+            }
+    finally:
+        # Si el OCR lanzo una excepcion: detener el render y vaciar la cola
+        # de salida; el preproceso descarta lo pendiente hasta el centinela
+        cancelado.set()
+        while any(hilo.is_alive() for hilo in hilos):
+            try:
+                preprocesadas.get(timeout=0.05)
+            except queue.Empty:
+                pass
+    return resultados
@@ -80,10 +80,12 @@ class ArchivoDetectado:
 
 
 def _sha256_archivo(ruta: Path) -> str:
-    """Calcula SHA-256 de un archivo."""
-    h = hashlib.sha256()
-    with open(ruta, "rb") as f:
-        for bloque in iter(lambda: f.read(8192), b""):
+    """Calcula SHA-256 de un archivo (hashlib.file_digest en Python 3.11+)."""
+    with open(ruta, "rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        for bloque in iter(lambda: f.read(65536), b""):
             h.update(bloque)
     return h.hexdigest()
 
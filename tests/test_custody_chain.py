@@ -10,6 +10,7 @@ Verifica:
   - Manejo de errores
 """
 
+import hashlib
 import json
 import os
 import shutil
@@ -19,10 +20,14 @@ from pathlib import Path
 import pytest
 
 from src.ingestion.custody_chain import (
+    BUFFER_SIZE,
+    COPY_CHUNK_SIZE,
     HASH_ALGORITHM,
+    MMAP_THRESHOLD,
     CustodyChain,
     CustodyRecord,
     VerificationResult,
+    _copy_and_hash,
     compute_sha256,
 )
 
@@ -140,6 +145,74 @@ class TestComputeSHA256:
         with pytest.raises(FileNotFoundError):
             compute_sha256("/ruta/que/no/existe.pdf")
 
+    def test_hash_matches_hashlib_multi_block(self, temp_dirs):
+        """Archivo mayor que BUFFER_SIZE coincide con hashlib directo."""
+        base, _, _ = temp_dirs
+        path = os.path.join(base, "grande.bin")
+        data = os.urandom(BUFFER_SIZE * 3 + 123)
+        with open(path, "wb") as f:
+            f.write(data)
+        assert compute_sha256(path) == hashlib.sha256(data).hexdigest()
+
+    def test_hash_fallback_sin_file_digest(self, temp_dirs, monkeypatch):
+        """Sin hashlib.file_digest (Python < 3.11) el resultado es el mismo."""
+        base, _, _ = temp_dirs
+        path = os.path.join(base, "grande.bin")
+        data = os.urandom(BUFFER_SIZE * 2 + 7)
+        with open(path, "wb") as f:
+            f.write(data)
+        monkeypatch.setattr("src.ingestion.custody_chain.MMAP_THRESHOLD", 0)
+        monkeypatch.delattr(hashlib, "file_digest", raising=False)
+        assert compute_sha256(path) == hashlib.sha256(data).hexdigest()
+
+    def test_hash_streaming_sobre_umbral_mmap(self, temp_dirs, monkeypatch):
+        """Archivos sobre MMAP_THRESHOLD se hashean por streaming, mismo resultado."""
+        base, _, _ = temp_dirs
+        path = os.path.join(base, "grande.bin")
+        data = os.urandom(BUFFER_SIZE + 1)
+        with open(path, "wb") as f:
+            f.write(data)
+        assert len(data) <= MMAP_THRESHOLD
+        via_mmap = compute_sha256(path)
+        monkeypatch.setattr("src.ingestion.custody_chain.MMAP_THRESHOLD", BUFFER_SIZE)
+        assert compute_sha256(path) == via_mmap == hashlib.sha256(data).hexdigest()
+
+    def test_drop_cache_llama_fadvise_dontneed(self, sample_pdf, monkeypatch):
+        """Con drop_cache=True se pide DONTNEED sobre el archivo completo."""
+        llamadas = []
+        monkeypatch.setattr(
+            os, "posix_fadvise", lambda *args: llamadas.append(args[1:]), raising=False
+        )
+        monkeypatch.setattr(os, "POSIX_FADV_DONTNEED", 4, raising=False)
+
+        h = compute_sha256(sample_pdf)
+        assert llamadas == []
+        assert compute_sha256(sample_pdf, drop_cache=True) == h
+        assert llamadas == [(0, 0, 4)]
+
+    def test_drop_cache_sin_posix_fadvise(self, sample_pdf, monkeypatch):
+        """En plataformas sin posix_fadvise drop_cache es un no-op."""
+        h = compute_sha256(sample_pdf)
+        monkeypatch.delattr(os, "posix_fadvise", raising=False)
+        assert compute_sha256(sample_pdf, drop_cache=True) == h
+
+    def test_copy_and_hash_multi_bloque(self, temp_dirs):
+        """Copia + hash en una pasada: bytes idénticos y hash correcto."""
+        base, _, _ = temp_dirs
+        src = Path(base) / "origen.bin"
+        dst = Path(base) / "destino.bin"
+        data = os.urandom(COPY_CHUNK_SIZE * 2 + 5)
+        src.write_bytes(data)
+        assert _copy_and_hash(src, dst) == hashlib.sha256(data).hexdigest()
+        assert dst.read_bytes() == data
+
+    def test_hash_archivo_vacio(self, temp_dirs):
+        """Un archivo vacío no pasa por mmap y da el hash de b''."""
+        base, _, _ = temp_dirs
+        path = os.path.join(base, "vacio.bin")
+        open(path, "wb").close()
+        assert compute_sha256(path) == hashlib.sha256(b"").hexdigest()
+
 
 # ==============================================================================
 # TESTS: INGESTA
@@ -168,7 +241,8 @@ class TestIngest:
             notes="Test de ingesta",
         )
         assert isinstance(record, CustodyRecord)
-        assert record.custody_id  # UUID generado
+        assert len(record.custody_id) == 32  # UUID4 en hex, sin guiones
+        assert record.vault_filename == f"{record.custody_id}.pdf"
         assert record.sinad == "EXP-2026-0001"
         assert record.original_filename == "expediente_test.pdf"
         assert record.original_size_bytes > 0
@@ -212,6 +286,73 @@ class TestIngest:
         with pytest.raises(ValueError, match="ya registrado"):
             chain.ingest(sample_pdf, sinad="EXP-002")
 
+    def test_ingest_duplicate_no_deja_copia_huerfana(self, chain, sample_pdf):
+        """El rechazo por duplicado elimina la copia creada en bóveda."""
+        chain.ingest(sample_pdf, sinad="EXP-001")
+        with pytest.raises(ValueError, match="ya registrado"):
+            chain.ingest(sample_pdf, sinad="EXP-002")
+        assert len(list(chain.vault_dir.iterdir())) == 1
+
+    def test_ingest_preserva_metadata_como_copy2(self, chain, sample_pdf):
+        """La copia en bóveda conserva el mtime del original."""
+        os.utime(sample_pdf, (1_600_000_000, 1_600_000_000))
+        record = chain.ingest(sample_pdf, sinad="EXP-001")
+        assert int(os.stat(record.vault_path).st_mtime) == 1_600_000_000
+
+    def test_try_reflink_sin_soporte_no_deja_archivo(self, temp_dirs, sample_pdf, monkeypatch):
+        """Si el clon falla (FS sin reflink), no queda archivo destino."""
+        from src.ingestion import custody_chain as mod
+
+        base, _, _ = temp_dirs
+        dst = Path(base) / "clon.pdf"
+
+        def ioctl_no_soportado(*args):
+            raise OSError(95, "Operation not supported")
+
+        if mod.fcntl is not None:
+            monkeypatch.setattr(mod.fcntl, "ioctl", ioctl_no_soportado)
+        assert mod._try_reflink(Path(sample_pdf), dst) is False
+        assert not dst.exists()
+
+    def test_ingest_con_reflink_hashea_una_vez(self, chain, sample_pdf, monkeypatch):
+        """Con reflink la copia no se rehashea: un solo cálculo de hash."""
+        from src.ingestion import custody_chain as mod
+
+        def fake_reflink(src, dst):
+            shutil.copy2(str(src), str(dst))
+            return True
+
+        llamadas = []
+        original = mod.compute_hash
+        monkeypatch.setattr(mod, "_try_reflink", fake_reflink)
+        monkeypatch.setattr(
+            mod, "compute_hash", lambda *a, **k: llamadas.append(a[0]) or original(*a, **k)
+        )
+
+        record = chain.ingest(sample_pdf, sinad="EXP-001")
+        assert llamadas == [record.vault_path]
+        assert record.hash_sha256 == compute_sha256(sample_pdf)
+
+    def test_ingest_sin_verify_copy_no_rehashea(self, chain, sample_pdf, monkeypatch):
+        """Por defecto la copia en bóveda se valida por tamaño, sin re-hash."""
+        from src.ingestion import custody_chain as mod
+
+        llamadas = []
+        monkeypatch.setattr(mod, "compute_hash", lambda *a, **k: llamadas.append(a[0]))
+        record = chain.ingest(sample_pdf, sinad="EXP-001")
+        assert llamadas == []
+        assert record.hash_sha256 == compute_sha256(sample_pdf)
+
+    def test_ingest_verify_copy_detecta_corrupcion(self, chain, sample_pdf, monkeypatch):
+        """Con verify_copy=True se re-hashea la bóveda y se rechaza si difiere."""
+        from src.ingestion import custody_chain as mod
+
+        monkeypatch.setattr(mod, "compute_hash", lambda *a, **k: "0" * 64)
+        with pytest.raises(RuntimeError, match="NO coincide"):
+            chain.ingest(sample_pdf, sinad="EXP-001", verify_copy=True)
+        assert os.listdir(chain.vault_dir) == []
+        assert chain.list_records() == []
+
     def test_ingest_file_not_found(self, chain):
         """Archivo inexistente lanza FileNotFoundError."""
         with pytest.raises(FileNotFoundError):
@@ -312,6 +453,59 @@ class TestVerify:
         assert len(results) == 2
         assert all(r.is_intact for r in results)
 
+    def test_verify_all_paralelo_conserva_orden_y_actualiza(self, chain, sample_pdf, second_pdf):
+        """En paralelo: resultados en orden de registro y JSONL actualizado."""
+        r1 = chain.ingest(sample_pdf, sinad="EXP-001")
+        r2 = chain.ingest(second_pdf, sinad="EXP-002")
+        vault_path = Path(r2.vault_path)
+        os.chmod(str(vault_path), 0o644)
+        with open(vault_path, "ab") as f:
+            f.write(b"TAMPERED DATA")
+
+        results = chain.verify_all(max_workers=4)
+        assert [r.custody_id for r in results] == [r1.custody_id, r2.custody_id]
+        assert [r.is_intact for r in results] == [True, False]
+
+        fresh = CustodyChain(vault_dir=str(chain.vault_dir), registry_dir=str(chain.registry_dir))
+        assert fresh.get_record(r1.custody_id).is_verified is True
+        assert fresh.get_record(r2.custody_id).is_verified is False
+        assert fresh.get_record(r2.custody_id).verified_at == results[1].verified_at
+
+    def test_verify_all_reescribe_jsonl_una_vez(self, chain, sample_pdf, second_pdf, monkeypatch):
+        """verify_all reescribe el registro una sola vez, no una por registro."""
+        chain.ingest(sample_pdf, sinad="EXP-001")
+        chain.ingest(second_pdf, sinad="EXP-002")
+
+        escrituras = []
+        original = chain._flush_updates
+        monkeypatch.setattr(
+            chain,
+            "_flush_updates",
+            lambda: escrituras.append(len(chain._pending_updates)) or original(),
+        )
+        chain.verify_all()
+        assert escrituras == [2]
+
+    def test_batch_updates_difiere_escritura(self, chain, sample_pdf):
+        """Dentro de batch_updates el JSONL se escribe solo al salir."""
+        record = chain.ingest(sample_pdf, sinad="EXP-001")
+        antes = chain.registry_file.read_text(encoding="utf-8")
+
+        with chain.batch_updates():
+            chain.verify(record.custody_id)
+            assert chain.get_record(record.custody_id).is_verified is True
+            assert chain.registry_file.read_text(encoding="utf-8") == antes
+
+        data = json.loads(chain.registry_file.read_text(encoding="utf-8"))
+        assert data["is_verified"] is True
+
+    def test_verify_all_serie_equivale(self, chain, sample_pdf, second_pdf):
+        """max_workers=1 verifica en serie con el mismo resultado."""
+        chain.ingest(sample_pdf, sinad="EXP-001")
+        chain.ingest(second_pdf, sinad="EXP-002")
+        results = chain.verify_all(max_workers=1)
+        assert all(r.is_intact for r in results)
+
 
 # ==============================================================================
 # TESTS: CONSULTAS
@@ -333,6 +527,22 @@ class TestQueries:
         assert found is not None
         assert found.original_filename == "expediente_test.pdf"
 
+    def test_get_record_id_con_guiones_legado(self, temp_dirs, sample_pdf, second_pdf):
+        """Registros antiguos con UUID con guiones siguen siendo consultables."""
+        import uuid
+
+        _, vault, registry = temp_dirs
+        with CustodyChain(vault_dir=vault, registry_dir=registry) as chain:
+            legado = chain.ingest(sample_pdf, sinad="EXP-001")
+            nuevo = chain.ingest(second_pdf, sinad="EXP-002")
+        dashed = str(uuid.UUID(legado.custody_id))
+        texto = chain.registry_file.read_text(encoding="utf-8")
+        chain.registry_file.write_text(texto.replace(legado.custody_id, dashed), encoding="utf-8")
+
+        fresh = CustodyChain(vault_dir=vault, registry_dir=registry)
+        assert fresh.get_record(dashed).sinad == "EXP-001"
+        assert fresh.get_record(nuevo.custody_id).sinad == "EXP-002"
+
     def test_get_record_not_found(self, chain):
         """Buscar ID inexistente retorna None."""
         assert chain.get_record("no-existe") is None
@@ -377,6 +587,39 @@ class TestSerialization:
         data = json.loads(line)
         assert data["sinad"] == "EXP-001"
 
+    def test_to_dict_equivale_a_asdict(self, chain, sample_pdf):
+        """to_dict produce lo mismo que dataclasses.asdict, en el mismo orden."""
+        from dataclasses import asdict
+
+        record = chain.ingest(sample_pdf, sinad="EXP-001")
+        result = chain.verify(record.custody_id)
+        assert list(record.to_dict().items()) == list(asdict(record).items())
+        assert list(result.to_dict().items()) == list(asdict(result).items())
+
+    @pytest.mark.parametrize("con_orjson", [True, False])
+    def test_jsonl_roundtrip_con_y_sin_orjson(self, chain, sample_pdf, monkeypatch, con_orjson):
+        """El JSONL se escribe y relee igual con orjson o con json estándar."""
+        from src.ingestion import custody_chain as mod
+
+        if con_orjson and not mod.ORJSON_DISPONIBLE:
+            pytest.skip("orjson no instalado")
+        if not con_orjson:
+            monkeypatch.setattr(mod, "orjson", None)
+
+        record = chain.ingest(sample_pdf, sinad="EXP-ñandú-001", notes="Año fiscal")
+        chain.verify(record.custody_id)
+
+        raw = chain.registry_file.read_bytes()
+        assert "ñandú".encode("utf-8") in raw
+        data = json.loads(raw.decode("utf-8"))
+        assert data["notes"] == "Año fiscal"
+        assert data["is_verified"] is True
+
+        fresh = CustodyChain(vault_dir=str(chain.vault_dir), registry_dir=str(chain.registry_dir))
+        assert fresh.get_record(record.custody_id).to_dict() == (
+            chain.get_record(record.custody_id).to_dict()
+        )
+
     def test_from_dict_roundtrip(self, chain, sample_pdf):
         """from_dict reconstuye correctamente desde to_dict."""
         record = chain.ingest(sample_pdf, sinad="EXP-001")
@@ -386,3 +629,312 @@ class TestSerialization:
         assert restored.custody_id == record.custody_id
         assert restored.sinad == record.sinad
         assert restored.hash_sha256 == record.hash_sha256
+
+    def test_from_dict_ignora_claves_extra(self, chain, sample_pdf):
+        """Claves desconocidas (p. ej. de otra versión) se descartan."""
+        record = chain.ingest(sample_pdf, sinad="EXP-001")
+        d = dict(record.to_dict(), campo_futuro="x", otro=1)
+        assert CustodyRecord.from_dict(d) == record
+
+    def test_from_dict_faltan_requeridos(self):
+        """Sin campos obligatorios se sigue lanzando TypeError."""
+        with pytest.raises(TypeError):
+            CustodyRecord.from_dict({"custody_id": "x", "extra": 1})
+
+
+# ==============================================================================
+# TESTS: CACHÉ DEL REGISTRO
+# ==============================================================================
+class TestRegistryCache:
+    """Tests para la caché en memoria del JSONL."""
+
+    def test_lookups_no_releen_jsonl(self, chain, sample_pdf, second_pdf, monkeypatch):
+        """Tras la primera carga, ingest y consultas no reparsean el archivo."""
+        chain.ingest(sample_pdf, sinad="EXP-001")
+        chain.list_records()
+
+        lecturas = []
+        original = chain._iter_records
+        monkeypatch.setattr(chain, "_iter_records", lambda: lecturas.append(1) or original())
+
+        record = chain.ingest(second_pdf, sinad="EXP-002")
+        assert chain.get_record(record.custody_id) is record
+        assert chain.get_record_by_sinad("EXP-001") is not None
+        chain.verify(record.custody_id)
+        assert chain.get_record(record.custody_id).is_verified is True
+        assert lecturas == []
+
+    def test_invalida_si_otra_instancia_escribe(self, temp_dirs, sample_pdf, second_pdf):
+        """Cambios hechos por otra instancia sobre el mismo JSONL se detectan."""
+        _, vault, registry = temp_dirs
+        chain_a = CustodyChain(vault_dir=vault, registry_dir=registry)
+        chain_b = CustodyChain(vault_dir=vault, registry_dir=registry)
+
+        chain_a.ingest(sample_pdf, sinad="EXP-001")
+        assert len(chain_b.list_records()) == 1
+
+        r2 = chain_b.ingest(second_pdf, sinad="EXP-002")
+        assert chain_a.get_record(r2.custody_id) is not None
+        with pytest.raises(ValueError, match="ya registrado"):
+            chain_a.ingest(second_pdf, sinad="EXP-003")
+
+    def test_sinad_retorna_primer_registro(self, chain, sample_pdf, second_pdf):
+        """Con SINAD repetido se conserva el primer registro, como antes."""
+        r1 = chain.ingest(sample_pdf, sinad="EXP-001")
+        chain.ingest(second_pdf, sinad="EXP-001")
+        assert chain.get_record_by_sinad("EXP-001").custody_id == r1.custody_id
+
+
+# ==============================================================================
+# TESTS: ÍNDICE DE HASHES (SQLite)
+# ==============================================================================
+class TestHashIndex:
+    """Tests para el índice persistente de detección de duplicados."""
+
+    def test_duplicado_sin_leer_jsonl(self, temp_dirs, sample_pdf, second_pdf, monkeypatch):
+        """Una instancia nueva detecta (o descarta) duplicados vía índice."""
+        _, vault, registry = temp_dirs
+        CustodyChain(vault_dir=vault, registry_dir=registry).ingest(sample_pdf, sinad="EXP-001")
+
+        chain = CustodyChain(vault_dir=vault, registry_dir=registry)
+        assert chain._find_by_hash(compute_sha256(sample_pdf)) is not None
+
+        chain._cache = None
+        monkeypatch.setattr(chain, "_iter_records", lambda: pytest.fail("lectura completa"))
+        assert chain._find_by_hash(compute_sha256(second_pdf)) is None
+
+    def test_reconstruye_indice_borrado(self, chain, sample_pdf):
+        """Si el índice se elimina, se reconstruye desde el JSONL."""
+        chain.ingest(sample_pdf, sinad="EXP-001")
+        chain.close()
+        chain._index_path.unlink()
+
+        with pytest.raises(ValueError, match="ya registrado"):
+            chain.ingest(sample_pdf, sinad="EXP-002")
+        assert chain._index_path.exists()
+
+    def test_indice_desfasado_no_da_falsos_duplicados(self, chain, sample_pdf):
+        """Un índice que no corresponde al JSONL actual se descarta."""
+        record = chain.ingest(sample_pdf, sinad="EXP-001")
+        chain.registry_file.unlink()
+        os.chmod(record.vault_path, 0o644)
+        os.remove(record.vault_path)
+
+        nuevo = chain.ingest(sample_pdf, sinad="EXP-001")
+        assert nuevo.custody_id != record.custody_id
+
+
+class TestPageCount:
+    """Tests para el conteo de páginas con documento ya abierto."""
+
+    def test_usa_documento_abierto(self):
+        """Con un documento abierto no se reabre el archivo."""
+        from src.ingestion.custody_chain import _get_pdf_page_count
+
+        assert _get_pdf_page_count("/no/existe.pdf", doc=[object()] * 3) == 3
+
+
+class TestIterRecords:
+    """Tests para la lectura en streaming del JSONL."""
+
+    def test_es_generador_y_omite_lineas_corruptas(self, chain, sample_pdf):
+        """_iter_records es perezoso y salta líneas inválidas."""
+        import types
+
+        record = chain.ingest(sample_pdf, sinad="EXP-001")
+        chain.flush()
+        with open(chain.registry_file, "a", encoding="utf-8") as f:
+            f.write("\n{no es json\n")
+
+        it = chain._iter_records()
+        assert isinstance(it, types.GeneratorType)
+        assert [r.custody_id for r in it] == [record.custody_id]
+
+    def test_reconstruye_indice_sin_materializar(self, temp_dirs, sample_pdf, monkeypatch):
+        """Una instancia nueva reconstruye el índice sin poblar la caché."""
+        _, vault, registry = temp_dirs
+        with CustodyChain(vault_dir=vault, registry_dir=registry) as chain:
+            chain.ingest(sample_pdf, sinad="EXP-001")
+        os.remove(chain._index_path)
+
+        fresh = CustodyChain(vault_dir=vault, registry_dir=registry)
+        assert fresh._find_by_hash("0" * 64) is None
+        assert fresh._cache is None
+        assert fresh._find_by_hash(compute_sha256(sample_pdf)) is not None
+
+
+class TestRegistryWriter:
+    """Tests para el handle persistente de escritura del JSONL."""
+
+    def test_reutiliza_handle_entre_ingestas(self, chain, sample_pdf, second_pdf):
+        """Varias ingestas escriben por el mismo handle abierto."""
+        chain.ingest(sample_pdf, sinad="EXP-001")
+        writer = chain._writer
+        chain.ingest(second_pdf, sinad="EXP-002")
+        assert chain._writer is writer
+        assert len(chain.registry_file.read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_flush_sync_hace_fsync(self, chain, sample_pdf, monkeypatch):
+        """flush(sync=True) fuerza fsync; flush(sync=False) no."""
+        chain.ingest(sample_pdf, sinad="EXP-001")
+        llamadas = []
+        monkeypatch.setattr(os, "fsync", llamadas.append)
+        chain.flush(sync=False)
+        assert llamadas == []
+        chain.flush()
+        assert llamadas == [chain._writer.fileno()]
+
+    def test_reescritura_y_nueva_ingesta(self, temp_dirs, sample_pdf, second_pdf):
+        """Tras reescribir el JSONL (verify) el writer apunta al archivo nuevo."""
+        _, vault, registry = temp_dirs
+        with CustodyChain(vault_dir=vault, registry_dir=registry) as chain:
+            r1 = chain.ingest(sample_pdf, sinad="EXP-001")
+            chain.verify(r1.custody_id)
+            chain.ingest(second_pdf, sinad="EXP-002")
+        assert chain._writer is None
+
+        fresh = CustodyChain(vault_dir=vault, registry_dir=registry)
+        records = fresh.list_records()
+        assert [r.sinad for r in records] == ["EXP-001", "EXP-002"]
+        assert records[0].is_verified is True
+
+
+class TestIngestMany:
+    """Tests para la ingesta por lotes."""
+
+    def test_lote_registra_en_orden(self, chain, sample_pdf, second_pdf, monkeypatch):
+        """Resultados alineados con la entrada; un solo fsync para el lote."""
+        llamadas = []
+        monkeypatch.setattr(os, "fsync", llamadas.append)
+        results = chain.ingest_many(
+            [(sample_pdf, "EXP-001"), (second_pdf, "EXP-002")], max_workers=2
+        )
+        assert [r.sinad for r in results] == ["EXP-001", "EXP-002"]
+        assert all(r.source == "batch" for r in results)
+        assert len(llamadas) == 1
+        with open(sample_pdf, "rb") as f:
+            assert results[0].hash_sha256 == hashlib.sha256(f.read()).hexdigest()
+        assert [r.sinad for r in chain.list_records()] == ["EXP-001", "EXP-002"]
+        assert chain.get_record_by_sinad("EXP-002").custody_id == results[1].custody_id
+
+    def test_errores_por_archivo(self, chain, temp_dirs, sample_pdf):
+        """Un archivo inválido no impide registrar los demás."""
+        base, _, _ = temp_dirs
+        results = chain.ingest_many(
+            [(os.path.join(base, "no_existe.pdf"), "EXP-001"), (sample_pdf, "EXP-002")]
+        )
+        assert isinstance(results[0], FileNotFoundError)
+        assert isinstance(results[1], CustodyRecord)
+        assert len(chain.list_records()) == 1
+
+    def test_duplicados_en_lote_y_registro(self, chain, temp_dirs, sample_pdf, second_pdf):
+        """Duplicados contra el registro y dentro del lote se rechazan sin dejar copias."""
+        _, vault, _ = temp_dirs
+        chain.ingest(sample_pdf, sinad="EXP-001")
+        results = chain.ingest_many(
+            [(sample_pdf, "EXP-002"), (second_pdf, "EXP-003"), (second_pdf, "EXP-004")],
+            max_workers=3,
+        )
+        assert isinstance(results[0], ValueError)
+        assert "ya registrado" in str(results[0])
+        assert results[1].sinad == "EXP-003"
+        assert isinstance(results[2], ValueError)
+        assert results[1].custody_id in str(results[2])
+        assert len(os.listdir(vault)) == 2
+        assert [r.sinad for r in chain.list_records()] == ["EXP-001", "EXP-003"]
+
+    def test_lote_vacio(self, chain):
+        assert chain.ingest_many([]) == []
+        assert not chain.registry_file.exists()
+
+    def test_persistencia_e_indice(self, temp_dirs, sample_pdf, second_pdf):
+        """Otra instancia ve el lote y detecta duplicados por el índice."""
+        _, vault, registry = temp_dirs
+        with CustodyChain(vault_dir=vault, registry_dir=registry) as chain:
+            chain.ingest_many([(sample_pdf, "EXP-001"), (second_pdf, "EXP-002")])
+
+        fresh = CustodyChain(vault_dir=vault, registry_dir=registry)
+        assert len(fresh.list_records()) == 2
+        with pytest.raises(ValueError, match="ya registrado"):
+            fresh.ingest(second_pdf, sinad="EXP-003")
+
+
+# ==============================================================================
+# TESTS: ALGORITMO DE HASH CONFIGURABLE (BLAKE3 opcional)
+# ==============================================================================
+class _FakeBlake3:
+    """Sustituto de blake3.blake3 (sobre blake2b) para probar la integración."""
+
+    AUTO = -1
+
+    def __init__(self, max_threads=1):
+        self._h = hashlib.blake2b()
+
+    def update(self, data):
+        self._h.update(data)
+
+    def update_mmap(self, path):
+        with open(path, "rb") as f:
+            self._h.update(f.read())
+
+    def hexdigest(self):
+        return self._h.hexdigest()
+
+
+@pytest.fixture
+def fake_blake3(monkeypatch):
+    """Simula el paquete blake3 instalado."""
+    import types
+
+    from src.ingestion import custody_chain as mod
+
+    monkeypatch.setattr(mod, "blake3", types.SimpleNamespace(blake3=_FakeBlake3))
+    return mod
+
+
+class TestHashAlgorithm:
+    """Tests para compute_hash y el algoritmo por cadena."""
+
+    def test_compute_hash_sha256_por_defecto(self, sample_pdf):
+        from src.ingestion.custody_chain import compute_hash
+
+        assert compute_hash(sample_pdf) == compute_sha256(sample_pdf)
+
+    def test_algoritmo_no_soportado(self, temp_dirs, sample_pdf):
+        from src.ingestion.custody_chain import compute_hash
+
+        _, vault, registry = temp_dirs
+        with pytest.raises(ValueError, match="no soportado"):
+            compute_hash(sample_pdf, "md5")
+        with pytest.raises(ValueError, match="no soportado"):
+            CustodyChain(vault_dir=vault, registry_dir=registry, hash_algorithm="md5")
+
+    def test_blake3_sin_paquete(self, temp_dirs, monkeypatch):
+        from src.ingestion import custody_chain as mod
+
+        _, vault, registry = temp_dirs
+        monkeypatch.setattr(mod, "blake3", None)
+        with pytest.raises(ValueError, match="blake3"):
+            CustodyChain(vault_dir=vault, registry_dir=registry, hash_algorithm="blake3")
+
+    def test_registros_mixtos_se_verifican_con_su_algoritmo(
+        self, temp_dirs, sample_pdf, second_pdf, fake_blake3
+    ):
+        """Registros SHA-256 antiguos y BLAKE3 nuevos conviven en el registro."""
+        _, vault, registry = temp_dirs
+        r_sha = CustodyChain(vault_dir=vault, registry_dir=registry).ingest(
+            sample_pdf, sinad="EXP-001"
+        )
+        chain = CustodyChain(vault_dir=vault, registry_dir=registry, hash_algorithm="blake3")
+        r_b3 = chain.ingest(second_pdf, sinad="EXP-002")
+
+        assert r_sha.hash_algorithm == "sha256"
+        assert r_b3.hash_algorithm == "blake3"
+        with open(second_pdf, "rb") as f:
+            assert r_b3.hash_sha256 == hashlib.blake2b(f.read()).hexdigest()
+
+        results = chain.verify_all()
+        assert [r.is_intact for r in results] == [True, True]
+
+        with pytest.raises(ValueError, match="ya registrado"):
+            chain.ingest(second_pdf, sinad="EXP-003")
@@ -18,9 +18,13 @@ Cobertura:
 ≥50 tests requeridos por criterio de aceptación de Tarea #17.
 """
 
+import hashlib
+import json
 import os
 import sys
 
+import pytest
+
 # Asegurar path del proyecto
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if _PROJECT_ROOT not in sys.path:
@@ -827,6 +831,27 @@ class TestIntegridadExpediente:
         assert r.cadena_custodia_verificada is True
         assert len(r.alertas) == 1
 
+    def test_from_dict_interna_status(self):
+        """status se interna: misma instancia para el mismo valor."""
+        r = IntegridadExpediente.from_dict({"status": "".join(["WARN", "ING"])})
+        assert r.status is sys.intern("WARNING")
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass(slots=True) requiere 3.10+")
+class TestSlotsDataclassesHoja:
+    """Las dataclasses hoja no llevan __dict__ por instancia."""
+
+    def test_sin_dict_por_instancia(self):
+        for cls in (ArchivoFuente, ResumenExtraccion, IntegridadExpediente, DocumentosConvenio):
+            assert not hasattr(cls(), "__dict__"), cls.__name__
+
+    def test_convenio_to_dict_conserva_orden_de_campos(self):
+        dc = DocumentosConvenio(convenio_vigente=_crear_campo("convenio_vigente", "CONV-01"))
+        d = dc.to_dict()
+        assert list(d)[0] == "convenio_vigente"
+        assert list(d)[-2:] == ["conformidad_funcional", "coherencia_economica"]
+        assert d["convenio_vigente"]["valor"] == "CONV-01"
+
 
 # ==============================================================================
 # 21. ExpedienteJSON — Serialización
@@ -959,6 +984,22 @@ class TestExpedienteJSONUnicidad:
         duplicados = exp.verificar_unicidad_comprobantes()
         assert len(duplicados) == 0
 
+    def test_duplicados_multiples_en_orden_de_aparicion(self):
+        """Cada repetición referencia la primera posición, en orden."""
+        otro = ComprobanteExtraido(
+            grupo_b=DatosComprobante(
+                serie=_crear_campo("serie", "B001"),
+                numero=_crear_campo("numero", "00000001"),
+            ),
+        )
+        f001 = _crear_comprobante_minimo
+        exp = ExpedienteJSON(comprobantes=[otro, f001(), f001(), otro, f001()])
+        assert exp.verificar_unicidad_comprobantes() == [
+            "Comprobante duplicado: F001-00000468 (posiciones 2 y 3)",
+            "Comprobante duplicado: B001-00000001 (posiciones 1 y 4)",
+            "Comprobante duplicado: F001-00000468 (posiciones 2 y 5)",
+        ]
+
 
 # ==============================================================================
 # 24. ExpedienteJSON — Hash
@@ -989,6 +1030,15 @@ class TestExpedienteJSONHash:
         h2 = exp2.generar_hash()
         assert h1 != h2
 
+    def test_hash_compatible_con_serializacion_completa(self):
+        """El hash incremental coincide con el de json.dumps del dict completo."""
+        exp = _crear_expediente_completo()
+        data = exp.to_dict()
+        data["integridad"]["hash_expediente"] = ""
+        contenido = json.dumps(data, sort_keys=True, ensure_ascii=False)
+        esperado = hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+        assert exp.generar_hash() == esperado
+
 
 # ==============================================================================
 # 25. ExpedienteJSON — Resumen de Extracción
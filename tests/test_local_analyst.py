@@ -28,6 +28,8 @@ from src.extraction.local_analyst import (
     _bloquear_valores_probatorios,
     _process_ia_output,
     analyze_evidence,
+    analyze_evidence_batch,
+    reload_config,
 )
 
 
@@ -166,6 +168,15 @@ class TestBloqueoCamposProbatorios:
         assert clean["notas"] == ["Revisar"]
         assert len(bloqueados) == 3
 
+    def test_bloqueo_por_subcadena_en_ambos_sentidos(self):
+        """Clave que contiene un campo, o contenida en uno, se bloquea."""
+        output = {"Monto_Total_Soles": "250.00", "razon": "X", "nota": "ok"}
+        clean, bloqueados = _bloquear_valores_probatorios(output)
+        assert clean["Monto_Total_Soles"] == "NO_AUTORIZADO"
+        assert clean["razon"] == "NO_AUTORIZADO"
+        assert clean["nota"] == "ok"
+        assert len(bloqueados) == 2
+
     def test_valor_bloqueado_truncado(self):
         """Valor bloqueado se trunca a 100 chars en el registro."""
         output = {"ruc": "X" * 200}
@@ -204,6 +215,49 @@ class TestFeatureFlag:
         )
         assert notes.is_empty() is True
 
+    def test_reload_config_aplica_cambio_de_flag(self, monkeypatch):
+        """El flag se resuelve al importar; reload_config() lo relee."""
+        import config.settings as settings
+
+        monkeypatch.setitem(settings.LOCAL_ANALYST_CONFIG, "enabled", True)
+        try:
+            assert reload_config() is True
+            assert analyze_evidence(records=[], flags=[]).is_empty() is False
+        finally:
+            monkeypatch.undo()
+            assert reload_config() is False
+        assert analyze_evidence(records=[], flags=[]).is_empty() is True
+
+
+# ==============================================================================
+# BATCH
+# ==============================================================================
+class TestAnalyzeEvidenceBatch:
+    """analyze_evidence_batch() resuelve el flag una vez por lote."""
+
+    def test_disabled_retorna_vacio_por_elemento(self, campo_legible):
+        notas = analyze_evidence_batch([([campo_legible], ["X"]), ([], None), ([], [])])
+        assert len(notas) == 3
+        assert all(n.is_empty() for n in notas)
+
+    def test_instancias_independientes(self):
+        """Cada resultado es mutable sin afectar a los demas."""
+        a, b = analyze_evidence_batch([([], []), ([], [])])
+        a.notas.append("solo en a")
+        assert b.notas == []
+
+    def test_enabled_equivale_a_llamadas_individuales(self, monkeypatch, campo_legible):
+        import config.settings as settings
+
+        monkeypatch.setitem(settings.LOCAL_ANALYST_CONFIG, "enabled", True)
+        try:
+            reload_config()
+            notas = analyze_evidence_batch([([campo_legible], ["X"])])
+            assert notas[0].to_dict() == analyze_evidence([campo_legible], ["X"]).to_dict()
+        finally:
+            monkeypatch.undo()
+            reload_config()
+
 
 # ==============================================================================
 # PROCESS IA OUTPUT
@@ -319,5 +373,6 @@ class TestCamposProbatorios:
     def test_no_contiene_tags(self):
         assert "tags_riesgo" not in CAMPOS_PROBATORIOS
 
-    def test_es_set(self):
-        assert isinstance(CAMPOS_PROBATORIOS, set)
+    def test_es_frozenset(self):
+        """Inmutable: la lista de bloqueo no se modifica en tiempo de ejecucion."""
+        assert isinstance(CAMPOS_PROBATORIOS, frozenset)
@@ -56,6 +56,17 @@ def _get_image_or_mock():
     return _create_mock_image()
 
 
+@pytest.fixture(autouse=True)
+def _cache_ocr_aislada(tmp_path):
+    """Redirige la cache OCR en disco a tmp_path (nunca toca data/)."""
+    with patch.object(core, "_OCR_CACHE_DIR", tmp_path / "cache_ocr"), patch.object(
+        core, "_osd_db", None
+    ), patch.object(core, "_osd_db_inserciones", 0):
+        yield
+        if core._osd_db:
+            core._osd_db.close()
+
+
 # =============================================================================
 # 1. TestDependencyFlags
 # =============================================================================
@@ -209,6 +220,23 @@ class TestPreprocesarRotacion:
             _, info = core.preprocesar_rotacion(img, "spa")
             assert info["rotacion_metodo"] == "paddleocr_builtin"
 
+    def test_paddleocr_sin_preprocesamiento_cpu(self):
+        """Con PaddleOCR activo no se ejecuta OSD, proyeccion ni deskew."""
+        img = _create_white_image()
+        if img is None:
+            pytest.skip("PIL no disponible")
+        prohibido = MagicMock(side_effect=AssertionError("preprocesamiento"))
+        with patch.object(core, "_ACTIVE_ENGINE", "paddleocr"), patch.object(
+            core, "_detectar_rotacion_osd", prohibido
+        ), patch.object(core, "_estimar_angulo_lineas", prohibido), patch.object(
+            core, "_detectar_deskew", prohibido
+        ), patch.object(core, "_aplicar_rotacion_y_deskew", prohibido):
+            salida, info = core.preprocesar_rotacion(img, "spa")
+        assert salida is img
+        assert info["rotacion_metodo"] == "paddleocr_builtin"
+        assert info["deskew_omitido"] == "paddleocr_builtin"
+        assert info["rotacion_aplicada"] is False
+
     def test_rotacion_grados_es_numerico(self):
         img = _create_white_image()
         if img is None:
@@ -265,6 +293,24 @@ class TestCalcularMetricas:
         result = core.calcular_metricas_imagen(img, dpi_render=150)
         assert result["dpi_estimado"] == 150
 
+    def test_contraste_y_blur_sobre_imagen_reducida(self):
+        """Imagen grande: dimensiones originales, metricas float sobre la reducida."""
+        if not (_PIL_DISPONIBLE and core.CV2_DISPONIBLE):
+            pytest.skip("PIL u OpenCV no disponible")
+        img = _create_white_image(2400, 1200)
+        img.paste((0, 0, 0), (0, 0, 1200, 1200))
+        result = core.calcular_metricas_imagen(img)
+        assert (result["width_px"], result["height_px"]) == (2400, 1200)
+        assert result["contraste"] == 1.0
+        assert type(result["blur_score"]) is float and result["blur_score"] > 0
+
+    def test_imagen_uniforme_sin_contraste(self):
+        if not (_PIL_DISPONIBLE and core.CV2_DISPONIBLE):
+            pytest.skip("PIL u OpenCV no disponible")
+        result = core.calcular_metricas_imagen(_PILImage.new("L", (100, 50), 128))
+        assert result["contraste"] == 0.0
+        assert result["blur_score"] == 0.0
+
 
 # =============================================================================
 # 7. TestEjecutarOCR
@@ -535,6 +581,8 @@ class TestImportsPublicos:
         expected = {
             "renderizar_pagina",
             "ejecutar_ocr",
+            "ejecutar_ocr_paginas",
+            "ejecutar_ocr_lote",
             "preprocesar_rotacion",
             "calcular_metricas_imagen",
             "verificar_tesseract",
@@ -838,6 +886,29 @@ class TestAgruparPalabrasEnLineas:
         lineas = core._agrupar_palabras_en_lineas(data)
         assert lineas == []
 
+    def test_palabras_intercaladas_y_orden_por_bloque_linea(self):
+        """Las lineas se ordenan por (block, line) aunque las palabras vengan mezcladas."""
+        data = self._make_tesseract_data(
+            [
+                ("C", 2, 1, 0, 50, 10, 10, 70),
+                ("A", 1, 1, 0, 0, 10, 10, 90),
+                ("D", 2, 1, 20, 48, 10, 10, -1),
+                ("B", 1, 1, 20, 2, 10, 10, 80),
+            ]
+        )
+        lineas = core._agrupar_palabras_en_lineas(data)
+        assert [l.texto for l in lineas] == ["A B", "C D"]
+        assert lineas[1].bbox == (0.0, 48.0, 30.0, 60.0)
+        assert lineas[1].confianza == pytest.approx(0.70)
+
+    def test_columnas_opcionales_ausentes(self):
+        """Sin columnas de ubicacion/confianza se usan los defaults."""
+        lineas = core._agrupar_palabras_en_lineas({"text": ["a", "b"]})
+        assert len(lineas) == 1
+        assert lineas[0].texto == "a b"
+        assert lineas[0].bbox == (0.0, 0.0, 0.0, 0.0)
+        assert lineas[0].confianza is None
+
 
 # =============================================================================
 # 16. TestEjecutarOCR_Lineas — Integracion con lineas
@@ -1315,14 +1386,15 @@ class TestRenderizarPaginaValidaDimensiones:
             mock_doc.__len__ = MagicMock(return_value=5)
             mock_page = MagicMock()
             mock_pix = MagicMock()
-            mock_pix.tobytes.return_value = b"fake_png_data"
+            mock_pix.width, mock_pix.height = 3000, 2000
+            mock_pix.samples = b"fake_rgb_samples"
             mock_page.get_pixmap.return_value = mock_pix
             mock_doc.__getitem__ = MagicMock(return_value=mock_page)
             mock_fitz.open.return_value = mock_doc
             mock_fitz.Matrix.return_value = MagicMock()
 
             # Setup mock PIL
-            mock_pil.open.return_value = mock_img
+            mock_pil.frombytes.return_value = mock_img
 
             result = core.renderizar_pagina(Path("/fake.pdf"), 1, dpi=200)
 
@@ -1344,14 +1416,783 @@ class TestRenderizarPaginaValidaDimensiones:
             mock_doc.__len__ = MagicMock(return_value=5)
             mock_page = MagicMock()
             mock_pix = MagicMock()
-            mock_pix.tobytes.return_value = b"fake"
+            mock_pix.width, mock_pix.height = 4000, 3000
+            mock_pix.samples = b"fake"
             mock_page.get_pixmap.return_value = mock_pix
             mock_doc.__getitem__ = MagicMock(return_value=mock_page)
             mock_fitz.open.return_value = mock_doc
             mock_fitz.Matrix.return_value = MagicMock()
-            mock_pil.open.return_value = mock_img_original
+            mock_pil.frombytes.return_value = mock_img_original
 
             result = core.renderizar_pagina(Path("/fake.pdf"), 1)
 
             # El resultado debe ser la imagen validada, no la original
             assert result is mock_img_validada
+
+    def test_renderizar_reutiliza_documento_abierto(self):
+        """Con un fitz.Document abierto no se reabre ni se cierra el PDF."""
+        mock_img = _create_mock_image()
+
+        with patch.object(core, "fitz") as mock_fitz, patch.object(
+            core, "Image"
+        ) as mock_pil, patch.object(core, "_validar_dimensiones", return_value=mock_img):
+            mock_doc = MagicMock()
+            mock_doc.__len__ = MagicMock(return_value=2)
+            mock_page = MagicMock()
+            mock_doc.__getitem__ = MagicMock(return_value=mock_page)
+            mock_pil.frombytes.return_value = mock_img
+
+            assert core.renderizar_pagina(mock_doc, 1) is mock_img
+            assert core.renderizar_pagina(mock_doc, 3) is None
+
+            mock_fitz.open.assert_not_called()
+            mock_doc.close.assert_not_called()
+
+    def test_renderizar_usa_matriz_precalculada_y_muestras_rgb(self):
+        """Con matrix dada no se construye otra; la imagen sale de pix.samples."""
+        mock_img = _create_mock_image()
+
+        with patch.object(core, "fitz") as mock_fitz, patch.object(
+            core, "Image"
+        ) as mock_pil, patch.object(core, "_validar_dimensiones", return_value=mock_img):
+            mock_doc = MagicMock()
+            mock_doc.__len__ = MagicMock(return_value=1)
+            mock_page = MagicMock()
+            mock_pix = mock_page.get_pixmap.return_value
+            mock_pix.width, mock_pix.height = 10, 20
+            mock_pix.samples = b"rgb"
+            mock_doc.__getitem__ = MagicMock(return_value=mock_page)
+            matriz = object()
+
+            core.renderizar_pagina(mock_doc, 1, dpi=300, matrix=matriz)
+
+            mock_fitz.Matrix.assert_not_called()
+            mock_page.get_pixmap.assert_called_once_with(matrix=matriz, alpha=False)
+            mock_pil.frombytes.assert_called_once_with("RGB", (10, 20), b"rgb")
+
+
+# =============================================================================
+# 21. TestDetectarRotacionBruteforce
+# =============================================================================
+
+
+class TestDetectarRotacionBruteforce:
+    """Tests para _detectar_rotacion_bruteforce con pytesseract mockeado."""
+
+    def test_osd_bajo_umbral_evita_ocr_por_angulo(self):
+        """Si OSD con umbral reducido responde, no se corre OCR por angulo."""
+        mock_tess = MagicMock()
+        mock_tess.image_to_osd.return_value = {"rotate": 90}
+        img = _create_mock_image()
+
+        with patch.object(core, "TESSERACT_DISPONIBLE", True), patch.object(
+            core, "pytesseract", mock_tess
+        ):
+            assert core._detectar_rotacion_bruteforce(img, "spa") == (90, "osd_bajo_umbral")
+
+        _, kwargs = mock_tess.image_to_osd.call_args
+        assert "min_characters_to_try=5" in kwargs["config"]
+        mock_tess.image_to_data.assert_not_called()
+
+    @staticmethod
+    def _tesseract_por_angulo(palabras_por_angulo, conf=50):
+        """Mock de pytesseract con OSD fallido y OCR que depende del angulo."""
+        mock_tess = MagicMock()
+        mock_tess.image_to_osd.side_effect = RuntimeError("Too few characters")
+        img = _create_mock_image()
+        angulo_de = {t: a for a, t in core._TRANSPOSICION_HORARIA.items()}
+        img.transpose.side_effect = lambda transposicion: ("rotada", angulo_de[transposicion])
+
+        def image_to_data(imagen, **kwargs):
+            angulo = 0 if imagen is img else imagen[1]
+            return {"text": ["w"] * palabras_por_angulo[angulo], "conf": [conf]}
+
+        mock_tess.image_to_data.side_effect = image_to_data
+        return mock_tess, img
+
+    def test_osd_falla_recurre_a_cuatro_rotaciones(self):
+        """Si OSD falla tambien, se elige el angulo con mas palabras."""
+        mock_tess, img = self._tesseract_por_angulo({0: 1, 90: 0, 180: 5, 270: 2})
+
+        with patch.object(core, "TESSERACT_DISPONIBLE", True), patch.object(
+            core, "pytesseract", mock_tess
+        ):
+            assert core._detectar_rotacion_bruteforce(img) == (180, "bruteforce")
+
+        assert mock_tess.image_to_data.call_count == 4
+
+    def test_empate_resuelto_en_orden_de_angulos(self):
+        """El resultado no depende del orden en que terminan los hilos."""
+        mock_tess, img = self._tesseract_por_angulo({0: 0, 90: 3, 180: 0, 270: 3})
+
+        with patch.object(core, "TESSERACT_DISPONIBLE", True), patch.object(
+            core, "pytesseract", mock_tess
+        ):
+            for _ in range(5):
+                assert core._detectar_rotacion_bruteforce(img) == (90, "bruteforce")
+
+    def test_sin_palabras_no_rota(self):
+        mock_tess, img = self._tesseract_por_angulo({90: 0, 270: 0}, conf=-1)
+
+        with patch.object(core, "TESSERACT_DISPONIBLE", True), patch.object(
+            core, "pytesseract", mock_tess
+        ):
+            assert core._detectar_rotacion_bruteforce(img, "eng", (90, 270)) == (0, "bruteforce")
+
+    def test_resultado_temprano(self):
+        mock_tess, img = self._tesseract_por_angulo({0: 0, 90: 0, 180: 25, 270: 0}, conf=90)
+
+        with patch.object(core, "TESSERACT_DISPONIBLE", True), patch.object(
+            core, "pytesseract", mock_tess
+        ):
+            assert core._detectar_rotacion_bruteforce(img) == (180, "bruteforce_early")
+
+
+# =============================================================================
+# 22. TestRoiRotacion
+# =============================================================================
+
+
+class TestRoiRotacion:
+    """Tests para la region central usada en deteccion de rotacion."""
+
+    def test_recorta_mitad_central(self):
+        img = _create_white_image(400, 200)
+        if img is None:
+            pytest.skip("PIL no disponible")
+        assert core._roi_rotacion(img).size == (200, 100)
+        assert img.size == (400, 200)
+
+    def test_reduce_roi_grande(self):
+        img = _create_white_image(3000, 1500)
+        if img is None:
+            pytest.skip("PIL no disponible")
+        roi = core._roi_rotacion(img)
+        assert max(roi.size) == core._ROI_ROTACION_MAX_PX
+
+    def test_deteccion_usa_roi_y_rotacion_aplica_a_pagina(self):
+        """OSD recibe el recorte; la rotacion se aplica a la imagen completa."""
+        img = _create_mock_image()
+        roi = _create_mock_image()
+        rotada = _create_mock_image()
+
+        with patch.object(core, "_ACTIVE_ENGINE", "tesseract"), patch.object(
+            core, "_roi_rotacion", return_value=roi
+        ), patch.object(
+            core, "_detectar_rotacion_osd", return_value=(90, "osd")
+        ) as mock_osd, patch.object(
+            core, "_aplicar_rotacion", return_value=rotada
+        ) as mock_aplicar, patch.object(core, "_detectar_deskew", return_value=0.0):
+            resultado, info = core.preprocesar_rotacion(img)
+
+        mock_osd.assert_called_once_with(roi)
+        mock_aplicar.assert_called_once_with(img, 90)
+        assert resultado is rotada
+        assert info["rotacion_grados"] == 90
+
+
+# =============================================================================
+# 23. TestEstimarAnguloLineas — proyecciones
+# =============================================================================
+
+
+def _pagina_con_lineas(angulo=0.0):
+    """Pagina sintetica con lineas de 'palabras' (rectangulos) rotada angulo CCW."""
+    from PIL import ImageDraw
+
+    img = _PILImage.new("RGB", (1000, 1300), "white")
+    draw = ImageDraw.Draw(img)
+    for i in range(25):
+        x = 80 + (i * 37) % 60
+        y = 80 + i * 45
+        for j in range(8):
+            ancho = 40 + (i * 7 + j * 13) % 60
+            draw.rectangle((x, y, x + ancho, y + 14), fill="black")
+            x += ancho + 18
+    return img.rotate(angulo, expand=True, fillcolor="white")
+
+
+@pytest.mark.skipif(
+    not (_PIL_DISPONIBLE and core.CV2_DISPONIBLE), reason="PIL u OpenCV no disponible"
+)
+class TestEstimarAnguloLineas:
+    """Tests para _estimar_angulo_lineas y su uso en preprocesar_rotacion."""
+
+    @pytest.mark.parametrize(
+        "rotacion_ccw, esperado",
+        [(0, 0.0), (3, -3.0), (-6, 6.0), (90, -90.0), (93, 87.0)],
+    )
+    def test_angulo_de_lineas(self, rotacion_ccw, esperado):
+        angulo, fuerza = core._estimar_angulo_lineas(_pagina_con_lineas(rotacion_ccw))
+        assert fuerza >= core._PROYECCION_FUERZA_MIN
+        diferencia = (angulo - esperado + 90) % 180 - 90
+        assert abs(diferencia) <= 0.3
+
+    def test_pagina_en_blanco_sin_angulo(self):
+        assert core._estimar_angulo_lineas(_create_white_image()) == (None, 0.0)
+
+    def test_deskew_desde_proyeccion(self):
+        """Con proyeccion valida no se usa _detectar_deskew y la pagina queda nivelada."""
+        with patch.object(core, "_ACTIVE_ENGINE", "tesseract"), patch.object(
+            core, "_detectar_rotacion_osd", return_value=(0, "osd")
+        ), patch.object(core, "_detectar_deskew") as mock_deskew:
+            img, info = core.preprocesar_rotacion(_pagina_con_lineas(4))
+
+        mock_deskew.assert_not_called()
+        assert abs(info["deskew_grados"] + 4) <= 0.3
+        angulo, _ = core._estimar_angulo_lineas(img)
+        assert abs(angulo) <= 0.3
+
+    @pytest.mark.parametrize("rotacion_ccw, candidatos", [(0, (0, 180)), (90, (90, 270))])
+    def test_bruteforce_limitado_por_proyeccion(self, rotacion_ccw, candidatos):
+        """Si OSD falla, solo se prueban los dos angulos compatibles con las lineas."""
+        with patch.object(core, "_ACTIVE_ENGINE", "tesseract"), patch.object(
+            core, "_detectar_rotacion_osd", return_value=(0, "osd_failed:x")
+        ), patch.object(
+            core, "_detectar_rotacion_bruteforce", return_value=(0, "bruteforce")
+        ) as mock_bf:
+            core.preprocesar_rotacion(_pagina_con_lineas(rotacion_ccw))
+
+        assert mock_bf.call_args[0][2] == candidatos
+
+    def test_pagina_gris_sin_convertir(self):
+        """Una pagina ya en modo L no se vuelve a convertir."""
+        pagina = _pagina_con_lineas(3).convert("L")
+        esperado = core._estimar_angulo_lineas(pagina)
+        with patch.object(type(pagina), "convert", side_effect=AssertionError("convert")):
+            assert core._estimar_angulo_lineas(pagina) == esperado
+
+
+# =============================================================================
+# 24. TestCacheOSD
+# =============================================================================
+
+
+@pytest.mark.skipif(not _PIL_DISPONIBLE, reason="PIL no disponible")
+class TestCacheOSD:
+    """Tests para la cache de resultados OSD por huella visual."""
+
+    @pytest.fixture
+    def tesseract_osd(self):
+        """pytesseract mockeado con cache OSD vacia."""
+        from collections import OrderedDict
+
+        mock_tess = MagicMock()
+        mock_tess.image_to_osd.return_value = {"rotate": 270}
+        with patch.object(core, "TESSERACT_DISPONIBLE", True), patch.object(
+            core, "pytesseract", mock_tess
+        ), patch.object(core, "_OSD_CACHE", OrderedDict()):
+            yield mock_tess
+
+    def test_segunda_llamada_usa_cache(self, tesseract_osd):
+        assert core._detectar_rotacion_osd(_create_white_image()) == (270, "osd")
+        assert core._detectar_rotacion_osd(_create_white_image()) == (270, "osd")
+        assert tesseract_osd.image_to_osd.call_count == 1
+
+    def test_imagen_distinta_no_comparte_entrada(self, tesseract_osd):
+        core._detectar_rotacion_osd(_create_white_image(200, 200))
+        core._detectar_rotacion_osd(_PILImage.new("RGB", (200, 200), "black"))
+        core._detectar_rotacion_osd(_create_white_image(300, 200))
+        assert tesseract_osd.image_to_osd.call_count == 3
+
+    def test_fallo_no_se_cachea(self, tesseract_osd):
+        tesseract_osd.image_to_osd.side_effect = [RuntimeError("sin texto"), {"rotate": 90}]
+        metodo = core._detectar_rotacion_osd(_create_white_image())[1]
+        assert metodo.startswith("osd_failed")
+        assert core._detectar_rotacion_osd(_create_white_image()) == (90, "osd")
+
+    def test_desalojo_lru(self, tesseract_osd):
+        # Solo memoria: sin disco la entrada desalojada vuelve a OSD
+        with patch.object(core, "_OSD_CACHE_MAX", 2), patch.object(core, "_osd_db", False):
+            for lado in (100, 110, 120):
+                core._detectar_rotacion_osd(_create_white_image(lado, lado))
+            assert len(core._OSD_CACHE) == 2
+            core._detectar_rotacion_osd(_create_white_image(100, 100))
+        assert tesseract_osd.image_to_osd.call_count == 4
+
+    def test_disco_sobrevive_reinicio(self, tesseract_osd):
+        core._detectar_rotacion_osd(_create_white_image())
+        # Simula un proceso nuevo: memoria vacia y conexion reabierta
+        core._OSD_CACHE.clear()
+        core._osd_db.close()
+        core._osd_db = None
+        assert core._detectar_rotacion_osd(_create_white_image()) == (270, "osd")
+        assert tesseract_osd.image_to_osd.call_count == 1
+        assert len(core._OSD_CACHE) == 1
+        assert (core._OCR_CACHE_DIR / "osd.sqlite").exists()
+
+    def test_disco_poda_entradas_antiguas(self, tesseract_osd):
+        with patch.object(core, "_OSD_DISCO_MAX_FILAS", 2), patch.object(
+            core, "_OSD_DISCO_PODA_CADA", 3
+        ):
+            for lado in (100, 110, 120):
+                core._detectar_rotacion_osd(_create_white_image(lado, lado))
+        filas = core._osd_db.execute("SELECT COUNT(*) FROM osd").fetchone()[0]
+        assert filas == 2
+
+    def test_disco_no_disponible_no_rompe(self, tesseract_osd, tmp_path):
+        bloqueo = tmp_path / "archivo"
+        bloqueo.write_text("x")
+        with patch.object(core, "_OCR_CACHE_DIR", bloqueo / "sub"):
+            assert core._detectar_rotacion_osd(_create_white_image()) == (270, "osd")
+            assert core._osd_db is False
+
+
+# =============================================================================
+# 25. TestDetectarDeskew — perfil de proyeccion
+# =============================================================================
+
+
+@pytest.mark.skipif(
+    not (_PIL_DISPONIBLE and core.CV2_DISPONIBLE), reason="PIL u OpenCV no disponible"
+)
+class TestDetectarDeskew:
+    """Tests para _detectar_deskew por perfil de proyeccion."""
+
+    @pytest.mark.parametrize("rotacion_ccw", [0, 2, -4, 7.5, -12])
+    def test_angulo_nivela_la_pagina(self, rotacion_ccw):
+        """El angulo detectado, aplicado con _aplicar_deskew, deja el texto horizontal."""
+        img = _pagina_con_lineas(rotacion_ccw)
+        deskew = core._detectar_deskew(img)
+        assert abs(deskew + rotacion_ccw) <= 0.25
+        if deskew:
+            angulo, _ = core._estimar_angulo_lineas(core._aplicar_deskew(img, deskew))
+            assert abs(angulo) <= 0.3
+
+    def test_pagina_en_blanco(self):
+        assert core._detectar_deskew(_create_white_image()) == 0.0
+
+    def test_puntaje_perfil_igual_a_referencia_numpy(self):
+        """El puntaje con cv2.reduce coincide con la suma de filas en NumPy."""
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        binary = (rng.random((300, 200)) > 0.8).astype(np.uint8) * 255
+        perfil = binary.sum(axis=1, dtype=np.int64)
+        esperado = int((np.diff(perfil) ** 2).sum())
+        assert core._puntaje_perfil(binary, 0.0) == esperado
+
+
+# =============================================================================
+# 26. TestTesserocr — API persistente (tesserocr mockeado)
+# =============================================================================
+
+
+def _palabra_tesserocr(texto, caja, conf, inicio_bloque=False, inicio_linea=False):
+    """Mock de un elemento del iterador de tesserocr a nivel palabra."""
+    palabra = MagicMock()
+    palabra.GetUTF8Text.return_value = texto
+    palabra.BoundingBox.return_value = caja
+    palabra.Confidence.return_value = conf
+    inicios = {"bloque": inicio_bloque, "linea": inicio_linea or inicio_bloque}
+    palabra.IsAtBeginningOf.side_effect = lambda nivel: inicios[nivel]
+    return palabra
+
+
+class TestTesserocr:
+    """Tests para los helpers _get_tess_api / _tess_image_to_data / _tess_osd_rotate."""
+
+    @pytest.fixture
+    def fake_tesserocr(self):
+        import threading
+
+        fake = MagicMock()
+        fake.RIL.WORD = "palabra"
+        fake.RIL.BLOCK = "bloque"
+        fake.RIL.TEXTLINE = "linea"
+        fake.PyTessBaseAPI.side_effect = lambda lang, psm: MagicMock(name=f"api-{lang}-{psm}")
+        with patch.object(core, "TESSEROCR_DISPONIBLE", True), patch.object(
+            core, "tesserocr", fake
+        ), patch.object(core, "_tess_local", threading.local()):
+            yield fake
+
+    def test_flag_es_bool(self):
+        assert isinstance(core.TESSEROCR_DISPONIBLE, bool)
+
+    def test_api_reutilizada_por_hilo(self, fake_tesserocr):
+        import threading
+
+        api = core._get_tess_api("spa", 3)
+        assert core._get_tess_api("spa", 3) is api
+        assert core._get_tess_api("spa", 6) is not api
+
+        otro = []
+        hilo = threading.Thread(target=lambda: otro.append(core._get_tess_api("spa", 3)))
+        hilo.start()
+        hilo.join()
+        assert otro[0] is not api
+        assert fake_tesserocr.PyTessBaseAPI.call_count == 3
+
+    def test_image_to_data_formato_pytesseract(self, fake_tesserocr):
+        palabras = [
+            _palabra_tesserocr("Hola", (10, 10, 50, 30), 91.0, inicio_bloque=True),
+            _palabra_tesserocr("mundo", (60, 12, 120, 30), 89.0),
+            _palabra_tesserocr("Total", (10, 40, 60, 60), 70.0, inicio_linea=True),
+            _palabra_tesserocr("S/", (5, 100, 20, 115), 60.0, inicio_bloque=True),
+        ]
+        fake_tesserocr.iterate_level.side_effect = lambda it, nivel: iter(palabras)
+
+        data = core._tess_image_to_data(_create_mock_image(), "spa")
+
+        assert data["text"] == ["Hola", "mundo", "Total", "S/"]
+        assert data["block_num"] == [1, 1, 1, 2]
+        assert data["line_num"] == [1, 1, 2, 1]
+        assert data["width"][1] == 60 and data["height"][1] == 18
+        lineas = core._agrupar_palabras_en_lineas(data)
+        assert [l.texto for l in lineas] == ["Hola mundo", "Total", "S/"]
+        assert lineas[0].bbox == (10.0, 10.0, 120.0, 30.0)
+        assert lineas[0].confianza == pytest.approx(0.90)
+
+    def test_image_to_data_sin_texto(self, fake_tesserocr):
+        api = core._get_tess_api("eng", 3)
+        api.GetIterator.return_value = None
+        data = core._tess_image_to_data(_create_mock_image(), "eng")
+        assert data["text"] == [] and data["conf"] == []
+
+    def test_osd_rotate_desde_orientacion(self, fake_tesserocr):
+        api = core._get_tess_api("osd", core._PSM_OSD_ONLY)
+        api.DetectOrientationScript.return_value = {"orient_deg": 90, "orient_conf": 5.0}
+        assert core._tess_osd_rotate(_create_mock_image()) == 270
+        api.SetVariable.assert_called_with("min_characters_to_try", "50")
+
+        api.DetectOrientationScript.return_value = {"orient_deg": 0}
+        assert core._tess_osd_rotate(_create_mock_image(), 5) == 0
+        api.SetVariable.assert_called_with("min_characters_to_try", "5")
+
+    def test_osd_sin_resultado_falla(self, fake_tesserocr):
+        api = core._get_tess_api("osd", core._PSM_OSD_ONLY)
+        api.DetectOrientationScript.return_value = None
+        with patch.object(core, "TESSERACT_DISPONIBLE", True), patch.object(core, "_OSD_CACHE", {}):
+            rotacion, metodo = core._detectar_rotacion_osd(_create_mock_image())
+        assert rotacion == 0 and metodo.startswith("osd_failed")
+
+
+# =============================================================================
+# 27. TestRenderCache — cache de paginas renderizadas
+# =============================================================================
+
+
+@pytest.mark.skipif(not _PIL_DISPONIBLE, reason="PIL no disponible")
+class TestRenderCache:
+    """Tests para la cache de renderizar_pagina."""
+
+    @pytest.fixture
+    def pdf_falso(self, tmp_path, monkeypatch):
+        """PDF en disco con fitz mockeado (paginas de 4x3 px) y cache vacia."""
+        from collections import OrderedDict
+
+        ruta = tmp_path / "doc.pdf"
+        ruta.write_bytes(b"%PDF-1.4")
+        monkeypatch.setattr(core, "_RENDER_CACHE", OrderedDict())
+        monkeypatch.setattr(core, "_render_cache_bytes", 0)
+
+        mock_fitz = MagicMock()
+        mock_doc = mock_fitz.open.return_value
+        mock_doc.__len__ = MagicMock(return_value=3)
+        mock_pix = mock_doc.__getitem__.return_value.get_pixmap.return_value
+        mock_pix.width, mock_pix.height = 4, 3
+        mock_pix.samples = bytes(range(36))
+        monkeypatch.setattr(core, "fitz", mock_fitz)
+        return ruta, mock_fitz
+
+    def test_segunda_llamada_no_rasteriza(self, pdf_falso):
+        ruta, mock_fitz = pdf_falso
+        primera = core.renderizar_pagina(ruta, 1)
+        segunda = core.renderizar_pagina(str(ruta), 1)
+        assert mock_fitz.open.call_count == 1
+        assert segunda is not primera
+        assert segunda.tobytes() == primera.tobytes() == bytes(range(36))
+
+        core.renderizar_pagina(ruta, 1, dpi=300)
+        core.renderizar_pagina(ruta, 2)
+        assert mock_fitz.open.call_count == 3
+
+    def test_documento_abierto_usa_su_nombre(self, pdf_falso):
+        ruta, mock_fitz = pdf_falso
+        doc = MagicMock()
+        doc.name = str(ruta)
+        doc.__len__ = MagicMock(return_value=1)
+        doc.__getitem__.return_value.get_pixmap.return_value = (
+            mock_fitz.open.return_value.__getitem__.return_value.get_pixmap.return_value
+        )
+        core.renderizar_pagina(doc, 1)
+        core.renderizar_pagina(ruta, 1)
+        mock_fitz.open.assert_not_called()
+
+    def test_archivo_modificado_invalida(self, pdf_falso):
+        ruta, mock_fitz = pdf_falso
+        core.renderizar_pagina(ruta, 1)
+        ruta.write_bytes(b"%PDF-1.4 modificado")
+        core.renderizar_pagina(ruta, 1)
+        assert mock_fitz.open.call_count == 2
+
+    def test_limite_de_bytes(self, pdf_falso, monkeypatch):
+        ruta, _ = pdf_falso
+        monkeypatch.setattr(core, "_RENDER_CACHE_MAX_BYTES", 2 * 36)
+        for pagina in (1, 2, 3):
+            core.renderizar_pagina(ruta, pagina)
+        assert len(core._RENDER_CACHE) == 2
+        assert core._render_cache_bytes == 2 * 36
+
+
+# =============================================================================
+# 28. TestEscalaRender — DPI acotado antes de rasterizar
+# =============================================================================
+
+
+class TestEscalaRender:
+    """Tests para _escala_render y su uso en renderizar_pagina."""
+
+    @staticmethod
+    def _pagina(ancho_pt, alto_pt):
+        page = MagicMock()
+        page.rect.width, page.rect.height = ancho_pt, alto_pt
+        return page
+
+    def test_pagina_dentro_de_limite_usa_dpi(self):
+        with patch.dict("config.settings.VISION_CONFIG", {"max_dimension_px": 2000}):
+            assert core._escala_render(self._pagina(595, 842), 150) == pytest.approx(150 / 72)
+
+    def test_pagina_grande_acota_escala(self):
+        with patch.dict("config.settings.VISION_CONFIG", {"max_dimension_px": 2000}):
+            escala = core._escala_render(self._pagina(595, 842), 300)
+        assert escala == pytest.approx(2000 / 842)
+        assert 842 * escala <= 2000 and 595 * escala < 2000
+
+    def test_renderizar_con_escala_acotada_ignora_matriz_dada(self):
+        mock_img = _create_mock_image()
+        with patch.object(core, "fitz") as mock_fitz, patch.object(core, "Image"), patch.object(
+            core, "_validar_dimensiones", return_value=mock_img
+        ), patch.dict("config.settings.VISION_CONFIG", {"max_dimension_px": 2000}):
+            mock_doc = MagicMock()
+            mock_doc.__len__ = MagicMock(return_value=1)
+            page = self._pagina(1190, 1684)
+            mock_doc.__getitem__ = MagicMock(return_value=page)
+
+            core.renderizar_pagina(mock_doc, 1, dpi=200, matrix=object())
+
+            mock_fitz.Matrix.assert_called_once_with(2000 / 1684, 2000 / 1684)
+            page.get_pixmap.assert_called_once_with(
+                matrix=mock_fitz.Matrix.return_value, alpha=False
+            )
+
+
+# =============================================================================
+# 29. TestBufferPagina — gris calculado una sola vez
+# =============================================================================
+
+
+@pytest.mark.skipif(
+    not (_PIL_DISPONIBLE and core.CV2_DISPONIBLE), reason="PIL u OpenCV no disponible"
+)
+class TestBufferPagina:
+    """Tests para _BufferPagina y su reutilizacion en deskew/metricas."""
+
+    def test_gris_se_calcula_una_vez(self):
+        buf = core._BufferPagina.desde_imagen(_pagina_con_lineas(0))
+        with patch.object(core.cv2, "cvtColor", wraps=core.cv2.cvtColor) as mock_cvt:
+            gris = buf.gris
+            assert buf.gris is gris
+        assert mock_cvt.call_count == 1
+        assert gris.shape == buf.rgb.shape[:2]
+
+    def test_imagen_gris_sin_conversion(self):
+        buf = core._BufferPagina.desde_imagen(_PILImage.new("L", (30, 20), 100))
+        assert buf.gris is buf.rgb
+        assert buf.gris.shape == (20, 30)
+
+    def test_modo_rgba_se_convierte(self):
+        buf = core._BufferPagina.desde_imagen(_PILImage.new("RGBA", (10, 10)))
+        assert buf.rgb.shape == (10, 10, 3)
+
+    def test_deskew_y_metricas_con_buffer(self):
+        img = _pagina_con_lineas(3)
+        buf = core._BufferPagina.desde_imagen(img)
+        deskew = core._detectar_deskew(buf)
+        assert deskew == core._detectar_deskew(img)
+
+        corregida = core._aplicar_deskew(img, deskew, buf)
+        assert corregida.tobytes() == core._aplicar_deskew(img, deskew).tobytes()
+
+        con_buffer = core.calcular_metricas_imagen(img, buffer=buf)
+        sin_buffer = core.calcular_metricas_imagen(img)
+        assert con_buffer["contraste"] == sin_buffer["contraste"]
+        assert con_buffer["blur_score"] > 0
+
+
+# =============================================================================
+# 30. TestAplicarRotacion — transposiciones ortogonales
+# =============================================================================
+
+
+@pytest.mark.skipif(not _PIL_DISPONIBLE, reason="PIL no disponible")
+class TestAplicarRotacion:
+    """Tests para _aplicar_rotacion con transpose."""
+
+    @pytest.mark.parametrize("angulo", [90, 180, 270])
+    def test_identica_a_rotate(self, angulo):
+        img = _pagina_con_lineas(0).resize((101, 67))
+        esperado = img.rotate(-angulo, expand=True)
+        rotada = core._aplicar_rotacion(img, angulo)
+        assert rotada.size == esperado.size
+        assert rotada.tobytes() == esperado.tobytes()
+
+    @pytest.mark.parametrize("angulo", [0, 45])
+    def test_angulo_no_ortogonal_sin_cambios(self, angulo):
+        img = _create_white_image()
+        assert core._aplicar_rotacion(img, angulo) is img
+
+
+# =============================================================================
+# 31. TestEjecutarOcrPaginas — OCR multipagina en procesos
+# =============================================================================
+
+
+def _ocr_por_tamano(img, lang="eng"):
+    """Sustituto de _ejecutar_ocr_tesseract: identifica la pagina por tamano."""
+    return {"texto_completo": f"{img.size[0]}x{img.size[1]}:{lang}", "motor_ocr": "tesseract"}
+
+
+@pytest.mark.skipif(not _PIL_DISPONIBLE, reason="PIL no disponible")
+class TestEjecutarOcrPaginas:
+    """Tests para ejecutar_ocr_paginas."""
+
+    @pytest.fixture
+    def tesseract_activo(self):
+        with patch.object(core, "_ACTIVE_ENGINE", "tesseract"), patch.object(
+            core, "PADDLEOCR_DISPONIBLE", False
+        ), patch.object(core, "TESSERACT_DISPONIBLE", True), patch.object(
+            core, "_ejecutar_ocr_tesseract", side_effect=_ocr_por_tamano
+        ):
+            yield
+
+    def _paginas(self):
+        return [_create_white_image(100 + i, 50) for i in range(4)]
+
+    def test_pool_conserva_orden(self, tesseract_activo):
+        from concurrent.futures import ThreadPoolExecutor
+
+        def pool_en_hilos(max_workers, initializer):
+            assert max_workers == 3
+            assert initializer is core._init_worker_ocr
+            return ThreadPoolExecutor(max_workers=max_workers)
+
+        with patch.object(core, "ProcessPoolExecutor", side_effect=pool_en_hilos):
+            resultados = core.ejecutar_ocr_paginas(self._paginas(), "spa", workers=3)
+        textos = [r["texto_completo"] for r in resultados]
+        assert textos == ["100x50:spa", "101x50:spa", "102x50:spa", "103x50:spa"]
+
+    def test_un_worker_en_serie(self, tesseract_activo):
+        with patch.object(core, "ProcessPoolExecutor") as pool:
+            resultados = core.ejecutar_ocr_paginas(self._paginas(), "spa", workers=1)
+        pool.assert_not_called()
+        assert len(resultados) == 4
+
+    def test_paddleocr_en_serie(self, tesseract_activo):
+        with patch.object(core, "_ACTIVE_ENGINE", "paddleocr"), patch.object(
+            core, "ProcessPoolExecutor"
+        ) as pool:
+            core.ejecutar_ocr_paginas(self._paginas(), "spa")
+        pool.assert_not_called()
+
+    def test_worker_reconstruye_imagen(self, tesseract_activo):
+        img = _pagina_con_lineas(0).resize((90, 40)).convert("L")
+        with patch.object(core, "ejecutar_ocr", side_effect=lambda i, lang: i) as ocr:
+            reconstruida = core._ocr_pagina_worker((img.mode, img.size, img.tobytes(), "spa"))
+        assert ocr.call_args[0][1] == "spa"
+        assert reconstruida.mode == "L"
+        assert reconstruida.tobytes() == img.tobytes()
+
+    def test_init_worker_fija_omp(self, monkeypatch):
+        monkeypatch.setenv("OMP_THREAD_LIMIT", "8")
+        core._init_worker_ocr()
+        assert core.os.environ["OMP_THREAD_LIMIT"] == "1"
+
+
+# =============================================================================
+# 32. TestRotacionYDeskew — una sola transformacion afin
+# =============================================================================
+
+
+@pytest.mark.skipif(not core.CV2_DISPONIBLE, reason="opencv no disponible")
+class TestRotacionYDeskew:
+    """Tests para _aplicar_rotacion_y_deskew y _detectar_deskew con rotacion."""
+
+    @pytest.mark.parametrize("rotacion", [0, 90, 180, 270])
+    def test_equivale_a_rotar_y_luego_corregir(self, rotacion):
+        import numpy as np
+
+        img = _pagina_con_lineas(0).resize((101, 67))
+        combinada = core._aplicar_rotacion_y_deskew(img, rotacion, 3.0)
+        secuencial = core._aplicar_deskew(core._aplicar_rotacion(img, rotacion), 3.0)
+        assert combinada.size == secuencial.size
+        diferencia = np.abs(np.asarray(combinada, int) - np.asarray(secuencial, int))
+        assert diferencia.max() <= 1
+
+    def test_sin_deskew_solo_transpone(self):
+        img = _create_white_image(120, 80)
+        with patch.object(core.cv2, "warpAffine") as warp:
+            rotada = core._aplicar_rotacion_y_deskew(img, 90, 0.2)
+        warp.assert_not_called()
+        assert rotada.size == (80, 120)
+
+    @pytest.mark.parametrize("rotacion", [90, 180, 270])
+    def test_deskew_sobre_pagina_sin_rotar(self, rotacion):
+        pagina = core._aplicar_rotacion(_pagina_con_lineas(4), (360 - rotacion) % 360)
+        esperado = core._detectar_deskew(core._aplicar_rotacion(pagina, rotacion))
+        assert core._detectar_deskew(pagina, rotacion) == esperado
+        assert esperado == pytest.approx(-4.0, abs=0.5)
+
+
+# =============================================================================
+# 33. TestEjecutarOcrLote — pipeline render / preproceso / OCR
+# =============================================================================
+
+
+class TestEjecutarOcrLote:
+    """Tests para ejecutar_ocr_lote (etapas en hilos con colas acotadas)."""
+
+    @staticmethod
+    def _render(doc, page_num, dpi, matrix=None):
+        return None if page_num == 2 else f"img{page_num}"
+
+    def _ejecutar(self, paginas, ocr=None, preproceso=None):
+        ocr = ocr or (lambda img, lang, trace_logger=None: {"texto_completo": f"{img}:{lang}"})
+        preproceso = preproceso or (lambda img, lang: (f"{img}r", {"origen": img}))
+        with patch.object(core, "fitz", None), patch.object(
+            core, "renderizar_pagina", side_effect=self._render
+        ), patch.object(core, "preprocesar_rotacion", side_effect=preproceso), patch.object(
+            core, "_validar_dimensiones", side_effect=lambda img: img
+        ), patch.object(core, "ejecutar_ocr", side_effect=ocr):
+            return core.ejecutar_ocr_lote(MagicMock(), paginas, "spa")
+
+    def test_resultados_alineados_con_paginas(self):
+        resultados = self._ejecutar(list(range(1, 9)))
+        assert len(resultados) == 8
+        assert resultados[1] is None
+        assert resultados[0] == {
+            "rotacion_info": {"origen": "img1"},
+            "ocr": {"texto_completo": "img1r:spa"},
+        }
+        assert resultados[7]["ocr"]["texto_completo"] == "img8r:spa"
+
+    def test_fallo_de_preproceso_deja_pagina_en_none(self):
+        def preproceso(img, lang):
+            if img == "img3":
+                raise RuntimeError("cv2")
+            return img, {}
+
+        resultados = self._ejecutar([1, 3, 4], preproceso=preproceso)
+        assert resultados[1] is None
+        assert resultados[2]["ocr"]["texto_completo"] == "img4:spa"
+
+    def test_excepcion_en_ocr_no_bloquea_etapas(self):
+        import threading
+
+        def ocr(img, lang, trace_logger=None):
+            raise RuntimeError("gpu")
+
+        with pytest.raises(RuntimeError, match="gpu"):
+            self._ejecutar(list(range(1, 40)), ocr=ocr)
+        nombres = {h.name for h in threading.enumerate()}
+        assert not nombres & {"ocr-render", "ocr-preproceso"}
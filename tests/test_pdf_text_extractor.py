@@ -134,9 +134,9 @@ class TestOCRPath:
         if pdf_path is None:
             pytest.skip("No hay PDF de prueba disponible")
 
-        resultado = extract_text_with_gating(pdf_path)
+        resultado = extract_text_with_gating(pdf_path, force_ocr_metrics=True)
 
-        # OCR siempre se ejecuta para tener métricas
+        # Con force_ocr_metrics el OCR siempre se ejecuta para tener métricas
         ocr = resultado["ocr"]
         assert "texto" in ocr or "error" in ocr
         assert "confianza_promedio" in ocr
@@ -260,9 +260,9 @@ class TestRegla2PostRotacion:
 
         from src.ingestion import pdf_text_extractor as mod
 
-        source = inspect.getsource(mod._extraer_texto_ocr)
+        source = inspect.getsource(mod._ocr_una_pagina)
         assert "_validar_dimensiones" in source, (
-            "La función _extraer_texto_ocr debe llamar a _validar_dimensiones "
+            "La función _ocr_una_pagina debe llamar a _validar_dimensiones "
             "después de preprocesar_rotacion (Regla 2)"
         )
 
@@ -312,5 +312,114 @@ class TestRegla2PostRotacion:
             mock_val.assert_called_once_with(mock_img_rotada)
 
 
+class TestAperturaUnica:
+    """El PDF se abre una sola vez por extracción."""
+
+    def test_gating_abre_pdf_una_vez(self, tmp_path):
+        """extract_text_with_gating comparte un único fitz.Document."""
+        from unittest.mock import MagicMock, patch
+
+        from src.ingestion import pdf_text_extractor as mod
+
+        pdf = tmp_path / "nativo.pdf"
+        pdf.write_bytes(b"%PDF-1.4 fake")
+
+        mock_page = MagicMock()
+        mock_page.get_text.return_value = "texto de prueba " * 20
+        mock_doc = MagicMock()
+        mock_doc.__len__ = MagicMock(return_value=2)
+        mock_doc.__iter__ = MagicMock(return_value=iter([mock_page, mock_page]))
+
+        with patch.object(mod, "FITZ_DISPONIBLE", True), patch.object(
+            mod, "fitz", create=True
+        ) as mock_fitz:
+            mock_fitz.open.return_value = mock_doc
+            resultado = mod.extract_text_with_gating(pdf)
+
+        assert mock_fitz.open.call_count == 1
+        mock_doc.close.assert_called_once()
+        mock_page.get_text.assert_called_with("text", flags=mod._TEXT_FLAGS, sort=False)
+        assert resultado["metricas_documento"]["num_paginas"] == 2
+
+
+class TestSkipOCR:
+    """El OCR se omite cuando direct_text ya es suficiente."""
+
+    def _gating(self, tmp_path, **kwargs):
+        from unittest.mock import MagicMock, patch
+
+        from src.ingestion import pdf_text_extractor as mod
+
+        pdf = tmp_path / "nativo.pdf"
+        pdf.write_bytes(b"%PDF-1.4 fake")
+        direct = {
+            "texto": "palabra " * 200,
+            "num_chars": 1600,
+            "num_words": 200,
+            "num_paginas": 1,
+            "tiempo_ms": 1,
+            "error": None,
+        }
+        ocr = MagicMock(return_value={"error": "sin motor", "confianza_promedio": 0.0})
+        with patch.object(mod, "FITZ_DISPONIBLE", False), patch.object(
+            mod, "_extraer_texto_directo", return_value=direct
+        ), patch.object(mod, "_extraer_texto_ocr", ocr):
+            return mod.extract_text_with_gating(pdf, **kwargs), ocr
+
+    def test_omite_ocr_si_direct_text_suficiente(self, tmp_path):
+        resultado, ocr = self._gating(tmp_path)
+        ocr.assert_not_called()
+        assert resultado["ocr"] == {"skipped": True, "reason": "direct_text_sufficient"}
+        assert resultado["decision"]["metodo"] == "direct_text"
+
+    def test_force_ocr_metrics_ejecuta_ocr(self, tmp_path):
+        resultado, ocr = self._gating(tmp_path, force_ocr_metrics=True)
+        ocr.assert_called_once()
+        assert resultado["decision"]["metodo"] == "direct_text"
+        assert resultado["ocr"]["error"] == "sin motor"
+
+
+class TestOCRMultipagina:
+    """OCR de varias páginas de muestra despachado a un pool."""
+
+    def test_paginas_en_pool_agregadas_en_orden(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest.mock import MagicMock, patch
+
+        from src.ingestion import pdf_text_extractor as mod
+
+        def fake_pagina(pdf, page_num, lang, dpi):
+            if page_num == 2:
+                return None  # no se pudo renderizar
+            return {
+                "rotacion_info": {"pagina": page_num},
+                "ocr": {
+                    "texto_completo": f"pagina {page_num}",
+                    "num_palabras": 2,
+                    "confianza_promedio": 0.5 + page_num / 10,
+                    "error": None,
+                },
+            }
+
+        mock_doc = MagicMock()
+        mock_doc.__len__ = MagicMock(return_value=5)
+        pool = MagicMock(side_effect=lambda max_workers: ThreadPoolExecutor(max_workers))
+
+        with patch.object(mod, "OCR_DISPONIBLE", True), patch.object(
+            mod, "verificar_ocr", return_value=(True, "ok", "tesseract"), create=True
+        ), patch.object(mod, "_ocr_una_pagina", fake_pagina), patch.object(
+            mod, "ProcessPoolExecutor", pool
+        ):
+            result = mod._extraer_texto_ocr(Path("/fake.pdf"), sample_pages=3, doc=mock_doc)
+
+        pool.assert_called_once()
+        assert result["error"] is None
+        assert result["texto"] == "pagina 1\n\npagina 3"
+        assert [p["pagina"] for p in result["paginas_procesadas"]] == [1, 3]
+        assert result["num_words"] == 4
+        assert result["confianza_promedio"] == 0.7
+        assert result["rotacion_info"] == {"pagina": 3}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
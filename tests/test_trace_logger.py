@@ -14,7 +14,9 @@ Verifica:
 
 import json
 import shutil
+import sys
 import tempfile
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
@@ -93,6 +95,39 @@ class TestTraceContext:
         assert d["sinad"] == "EXP-001"
         assert "metadata" in d
 
+    @pytest.mark.parametrize(
+        "campos",
+        [
+            {},
+            {"message": 'comillas " y \\ barra\ttab\x01 ctrl \u2028 — ñ'},
+            {"context": {"k": [1, 2.5, None]}, "duration_ms": 12},
+            {"duration_ms": 0.1, "error": "falló"},
+            {"duration_ms": float("nan")},
+            {"duration_ms": True},
+            {"sinad": None},
+        ],
+    )
+    def test_plantilla_jsonl_equivale_a_to_dict(self, monkeypatch, campos):
+        """Sin orjson, la línea armada con plantilla decodifica igual que to_dict()."""
+        from src.ingestion import trace_logger as mod
+
+        monkeypatch.setattr(mod, "orjson", None)
+
+        base = dict(
+            timestamp="2026-02-11T00:00:00Z",
+            trace_id="abc",
+            level="INFO",
+            logger="lógger",
+            message="msg",
+            sinad="S-1",
+        )
+        base.update(campos)
+        entry = LogEntry(**base)
+        esperado = json.loads(mod._dumps_jsonl(entry.to_dict()))
+        assert json.loads(entry.to_jsonl_bytes()) == esperado
+        logger_json = mod._encode_json_str("lógger")
+        assert json.loads(entry.to_jsonl_bytes(logger_json)) == esperado
+
     def test_from_dict_roundtrip(self):
         """from_dict reconstruye desde to_dict."""
         original = TraceContext(
@@ -180,6 +215,34 @@ class TestLogEntry:
         assert data["trace_id"] == "abc"
         assert data["context"]["key"] == "value"
 
+    @pytest.mark.parametrize("con_orjson", [True, False])
+    def test_to_jsonl_line_igual_que_asdict(self, monkeypatch, con_orjson):
+        """La serialización coincide con la anterior basada en asdict + json."""
+        from dataclasses import asdict
+
+        from src.ingestion import trace_logger as mod
+
+        if con_orjson and not mod.ORJSON_DISPONIBLE:
+            pytest.skip("orjson no instalado")
+        if not con_orjson:
+            monkeypatch.setattr(mod, "orjson", None)
+
+        entry = LogEntry(
+            timestamp="2026-02-11T00:00:00Z",
+            trace_id="abc",
+            level="ERROR",
+            logger="test",
+            message="Año fiscal — ñandú",
+            context={"ruta": Path("/tmp/x.pdf"), 1: "clave int", "ctx": TraceContext("t", "s")},
+            duration_ms=1.5,
+            error="boom",
+        )
+        antes = {k: v for k, v in asdict(entry).items() if v is not None}
+        esperado = json.loads(json.dumps(antes, ensure_ascii=False, default=str))
+        assert list(entry.to_dict()) == list(antes)
+        assert json.loads(entry.to_jsonl_line()) == esperado
+        assert entry.to_jsonl_bytes() == entry.to_jsonl_line().encode("utf-8")
+
     def test_from_dict_roundtrip(self):
         """from_dict reconstruye desde to_dict."""
         original = LogEntry(
@@ -199,6 +262,53 @@ class TestLogEntry:
         assert restored.level == original.level
         assert restored.agent_id == original.agent_id
 
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass(slots=True) requiere 3.10+")
+    def test_sin_dict_por_instancia(self):
+        assert not hasattr(TraceContext("abc", "EXP"), "__dict__")
+        assert not hasattr(LogEntry("t", "abc", "INFO", "x", "m"), "__dict__")
+
+    def test_from_dict_claves_extra_y_faltantes(self):
+        """Claves extra se ignoran; faltar un campo obligatorio sigue fallando."""
+        base = {"timestamp": "t", "trace_id": "abc", "level": "INFO", "logger": "x", "message": "m"}
+        entry = LogEntry.from_dict({**base, "campo_futuro": 1, 7: "clave no str"})
+        assert entry == LogEntry.from_dict(base)
+        with pytest.raises(TypeError):
+            LogEntry.from_dict({"message": "sin campos obligatorios"})
+        with pytest.raises(TypeError):
+            TraceContext.from_dict({"sinad": "EXP", "extra": 1})
+
+
+class TestEntryPool:
+    """Tests para el pool de LogEntry."""
+
+    def test_acquire_reutiliza_entrada_liberada(self):
+        from src.ingestion import trace_logger as mod
+
+        mod._ENTRY_POOL.clear()
+        entry = LogEntry.acquire("t1", "abc", "INFO", "test", "msg", context={"k": 1})
+        entry.release()
+        assert entry.context == {}
+        reused = LogEntry.acquire("t2", "def", "WARNING", "test", "otro", error="x")
+        assert reused is entry
+        assert (
+            reused.to_dict()
+            == LogEntry("t2", "def", "WARNING", "test", "otro", error="x").to_dict()
+        )
+
+    def test_log_retorna_entradas_nuevas(self, logger):
+        """Las entradas entregadas al llamador nunca vuelven al pool."""
+        from src.ingestion import trace_logger as mod
+
+        ctx = logger.start_trace(sinad="EXP-001")
+        entry = logger.info("Conservada", context={"k": "v"})
+        logger.end_trace(status="success")
+        assert all(e is not entry for e in mod._ENTRY_POOL)
+        assert entry.message == "Conservada"
+
+        messages = [e.message for e in logger.get_trace(ctx.trace_id)]
+        assert messages[1] == "Conservada"
+        assert "Trace finalizado" in messages[2]
+
 
 # ==============================================================================
 # TESTS: TraceLogger — Ciclo de vida
@@ -308,6 +418,70 @@ class TestTraceLifecycle:
         assert len(entries2) == 3
 
 
+class TestConcurrentTraces:
+    """Tests para traces concurrentes por hilo / tarea asyncio."""
+
+    def test_traces_concurrentes_por_hilo(self, logger):
+        """Cada hilo tiene su propio trace activo sin interferir."""
+        barrera = threading.Barrier(3)
+        resultados = {}
+
+        def procesar(sinad):
+            ctx = logger.start_trace(sinad=sinad)
+            barrera.wait()  # Los tres traces abiertos a la vez
+            entry = logger.info(f"procesando {sinad}")
+            barrera.wait()
+            summary = logger.end_trace()
+            resultados[sinad] = (ctx.trace_id, entry.trace_id, entry.sinad, summary["trace_id"])
+
+        hilos = [threading.Thread(target=procesar, args=(f"EXP-{i}",)) for i in range(3)]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+
+        assert len(resultados) == 3
+        for sinad, (tid, entry_tid, entry_sinad, summary_tid) in resultados.items():
+            assert tid == entry_tid == summary_tid
+            assert entry_sinad == sinad
+            assert len(logger.get_trace(tid)) == 3
+        assert not logger.has_active_trace
+
+    def test_worker_sin_trace_ve_el_unico_abierto(self, logger):
+        """Workers de un pool (sin contexto heredado) usan el único trace abierto."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        ctx = logger.start_trace(sinad="EXP-001")
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            entries = list(ex.map(lambda i: logger.info(f"worker {i}"), range(4)))
+        logger.end_trace()
+        assert {e.trace_id for e in entries} == {ctx.trace_id}
+
+    def test_doble_inicio_en_el_mismo_hilo_falla(self, logger):
+        logger.start_trace(sinad="EXP-001")
+        with pytest.raises(RuntimeError, match="Ya hay un trace activo"):
+            logger.start_trace(sinad="EXP-002")
+        logger.end_trace()
+
+    def test_tareas_asyncio(self, logger):
+        import asyncio
+
+        async def procesar(sinad):
+            ctx = logger.start_trace(sinad=sinad)
+            await asyncio.sleep(0)
+            entry = logger.info("paso")
+            await asyncio.sleep(0)
+            logger.end_trace()
+            return ctx.trace_id, entry.trace_id
+
+        async def main():
+            return await asyncio.gather(*(procesar(f"EXP-{i}") for i in range(3)))
+
+        resultados = asyncio.run(main())
+        assert all(tid == entry_tid for tid, entry_tid in resultados)
+        assert len({tid for tid, _ in resultados}) == 3
+
+
 # ==============================================================================
 # TESTS: TraceLogger — Logging
 # ==============================================================================
@@ -396,6 +570,7 @@ class TestJSONLFile:
     def test_creates_log_file(self, logger):
         """El primer log crea el archivo JSONL."""
         logger.start_trace(sinad="EXP-001")
+        logger.flush()
         assert logger.current_log_file.exists()
         logger.end_trace()
 
@@ -442,6 +617,19 @@ class TestJSONLFile:
         assert f"trace_{date_str}.jsonl" in str(log_file)
         logger.end_trace()
 
+    def test_current_log_file_memoizado_por_dia(self, logger, monkeypatch):
+        """La ruta se reutiliza durante el día y cambia a medianoche UTC."""
+        from src.ingestion import trace_logger as mod
+
+        ahora = [1_770_854_399.5]  # 2026-02-11T23:59:59.5Z
+        monkeypatch.setattr(mod.time, "time", lambda: ahora[0])
+        primero = logger.current_log_file
+        assert primero.name == "trace_2026-02-11.jsonl"
+        assert logger.current_log_file is primero
+
+        ahora[0] += 1  # 2026-02-12T00:00:00.5Z
+        assert logger.current_log_file.name == "trace_2026-02-12.jsonl"
+
     def test_custom_prefix(self, temp_log_dir):
         """Prefijo personalizado se refleja en nombre de archivo."""
         logger = TraceLogger(log_dir=temp_log_dir, log_prefix="custom")
@@ -461,6 +649,168 @@ class TestJSONLFile:
         assert "ñoño" in entries[1].message
 
 
+class TestAsyncWriter:
+    """Tests para la escritura asíncrona (cola + hilo escritor)."""
+
+    @pytest.fixture
+    def escritura_lenta(self, monkeypatch):
+        """Retiene al hilo escritor hasta que el test libere el evento."""
+        liberar = threading.Event()
+        original = TraceLogger._write_lines
+
+        def lenta(self, log_file, lines):
+            liberar.wait(5)
+            original(self, log_file, lines)
+
+        monkeypatch.setattr(TraceLogger, "_write_lines", lenta)
+        yield liberar
+        liberar.set()
+
+    def _lineas(self, logger):
+        path = logger.current_log_file
+        return path.read_bytes().splitlines() if path.exists() else []
+
+    def test_info_no_espera_al_disco(self, logger, escritura_lenta):
+        """INFO retorna sin esperar la escritura; flush() sí espera."""
+        logger.info("Evento 1")
+        logger.info("Evento 2")
+        assert self._lineas(logger) == []
+        escritura_lenta.set()
+        logger.flush()
+        assert len(self._lineas(logger)) == 2
+
+    def test_error_espera_al_disco(self, logger):
+        """ERROR/CRITICAL retornan con lo anterior ya escrito."""
+        logger.info("Evento previo")
+        logger.error("Falla", error="boom")
+        lineas = self._lineas(logger)
+        assert [json.loads(l)["level"] for l in lineas] == ["INFO", "ERROR"]
+
+    def test_consultas_ven_lo_pendiente(self, logger):
+        """Las consultas esperan lo encolado antes de leer."""
+        logger.info("Evento suelto")
+        assert logger.get_stats()["total_entries"] == 1
+
+    def test_handle_persistente(self, logger):
+        """Varias escrituras reutilizan el mismo handle abierto."""
+        logger.info("Evento 1")
+        logger.flush()
+        fd = logger._open_fd
+        logger.info("Evento 2")
+        logger.flush()
+        assert fd is not None
+        assert logger._open_fd == fd
+
+    def test_hilo_termina_inactivo(self, logger, monkeypatch):
+        """Sin eventos el hilo escritor termina y se relanza al escribir."""
+        from src.ingestion import trace_logger as mod
+
+        monkeypatch.setattr(mod, "WRITER_IDLE_S", 0.01)
+        logger.info("Evento 1")
+        hilo = logger._writer_thread
+        assert hilo is not None
+        hilo.join(5)
+        assert logger._writer_thread is None
+        logger.info("Evento 2")
+        logger.flush()
+        assert len(self._lineas(logger)) == 2
+
+    def test_productores_concurrentes(self, logger):
+        """Varios hilos escribiendo a la vez no pierden ni mezclan líneas."""
+
+        def producir(n):
+            for i in range(200):
+                logger.info(f"hilo {n} evento {i}", context={"n": n})
+
+        hilos = [threading.Thread(target=producir, args=(n,)) for n in range(4)]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        logger.flush()
+
+        mensajes = [json.loads(l)["message"] for l in self._lineas(logger)]
+        assert len(mensajes) == 800
+        for n in range(4):
+            propios = [m for m in mensajes if m.startswith(f"hilo {n} ")]
+            assert propios == [f"hilo {n} evento {i}" for i in range(200)]
+
+    def test_error_de_escritura_se_reporta_en_flush(self, logger, monkeypatch):
+        """Un fallo del hilo escritor se relanza en el siguiente flush()."""
+        import os
+
+        def falla(*args, **kwargs):
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(os, "open", falla)
+        logger.info("Evento")
+        with pytest.raises(OSError, match="No space"):
+            logger.flush()
+        monkeypatch.undo()
+        logger.flush()  # El error se reporta una sola vez
+
+    @pytest.mark.parametrize("modo", ["writev", "parcial", "sin_writev", "iov_max"])
+    def test_write_all(self, temp_log_dir, monkeypatch, modo):
+        """El lote se escribe completo con o sin writev y ante escrituras parciales."""
+        import os
+
+        from src.ingestion import trace_logger as mod
+
+        if modo != "sin_writev" and mod._WRITEV is None:
+            pytest.skip("os.writev no disponible")
+        if modo == "parcial":
+            monkeypatch.setattr(mod, "_WRITEV", lambda fd, bufs: os.write(fd, bufs[0][:3]))
+        elif modo == "sin_writev":
+            monkeypatch.setattr(mod, "_WRITEV", None)
+        elif modo == "iov_max":
+            monkeypatch.setattr(mod, "_IOV_MAX", 2)
+
+        lineas = [f"línea {i}\n".encode("utf-8") for i in range(5)]
+        path = Path(temp_log_dir) / "salida.jsonl"
+        with open(path, "ab", buffering=0) as f:
+            mod._write_all(f.fileno(), lineas)
+        assert path.read_bytes() == b"".join(lineas)
+
+    def test_rotacion_de_dia(self, logger, monkeypatch):
+        """Al cambiar de día, lo encolado antes va al archivo anterior."""
+        from src.ingestion import trace_logger as mod
+
+        logger.info("Día 1")
+        dia2 = logger.log_dir / f"{logger.log_prefix}_2999-01-01.jsonl"
+        monkeypatch.setattr(mod.TraceLogger, "current_log_file", property(lambda self: dia2))
+        logger.info("Día 2")
+        logger.close()
+
+        archivos = sorted(logger.log_dir.glob("*.jsonl"))
+        assert len(archivos) == 2
+        assert [json.loads(l)["message"] for l in dia2.read_bytes().splitlines()] == ["Día 2"]
+
+    def test_dos_loggers_mismo_archivo(self, temp_log_dir):
+        """Dos instancias con el mismo prefijo agregan al mismo archivo sin pisarse."""
+        logger1 = TraceLogger(log_dir=temp_log_dir, logger_name="AG01")
+        logger2 = TraceLogger(log_dir=temp_log_dir, logger_name="AG02")
+        for i in range(50):
+            logger1.info(f"a{i}")
+            logger2.info(f"b{i}")
+            if i % 10 == 0:
+                logger1.flush()
+                logger2.flush()
+        logger1.close()
+        logger2.close()
+
+        mensajes = [json.loads(l)["message"] for l in self._lineas(logger1)]
+        assert sorted(mensajes) == sorted(
+            [f"a{i}" for i in range(50)] + [f"b{i}" for i in range(50)]
+        )
+
+    def test_context_manager_cierra(self, temp_log_dir):
+        with TraceLogger(log_dir=temp_log_dir) as logger:
+            logger.info("Evento")
+        assert logger._open_fd is None
+        assert logger._writer_thread is None
+        assert len(self._lineas(logger)) == 1
+
+
 # ==============================================================================
 # TESTS: TraceLogger — Consultas
 # ==============================================================================
@@ -548,6 +898,203 @@ class TestQueries:
         assert stats["unique_traces"] == 0
 
 
+class TestTraceIndex:
+    """Tests para el índice SQLite de consultas."""
+
+    def _traza(self, logger, sinad, n=1):
+        ctx = logger.start_trace(sinad=sinad)
+        for i in range(n):
+            logger.info(f"Evento {i}")
+        logger.end_trace()
+        return ctx
+
+    def test_indice_persistente_entre_instancias(self, temp_log_dir):
+        logger = TraceLogger(log_dir=temp_log_dir)
+        ctx = self._traza(logger, "EXP-001", n=2)
+        assert len(logger.get_trace(ctx.trace_id)) == 4
+        logger.close()
+
+        fresh = TraceLogger(log_dir=temp_log_dir)
+        assert [e.message for e in fresh.get_trace(ctx.trace_id)][1:3] == ["Evento 0", "Evento 1"]
+        assert fresh._index_path.exists()
+
+    def test_indexa_solo_lo_nuevo(self, logger, monkeypatch):
+        """Tras indexar, una consulta solo lee lo agregado desde entonces."""
+        self._traza(logger, "EXP-001")
+        logger.get_stats()
+
+        leidos = []
+        original = TraceLogger._iter_raw
+
+        def espia(file_path, start=0):
+            leidos.append(start)
+            return original(file_path, start)
+
+        monkeypatch.setattr(TraceLogger, "_iter_raw", staticmethod(espia))
+        assert logger.get_stats()["total_entries"] == 3
+        assert leidos == []
+        ctx = self._traza(logger, "EXP-002")
+        assert len(logger.get_traces_by_sinad("EXP-002")) == 3
+        assert len(leidos) == 1 and leidos[0] > 0
+        assert logger.get_trace(ctx.trace_id)[0].sinad == "EXP-002"
+
+    def test_escrituras_de_otro_logger(self, temp_log_dir):
+        """Líneas escritas por otra instancia se indexan en la siguiente consulta."""
+        logger1 = TraceLogger(log_dir=temp_log_dir, logger_name="AG01")
+        logger2 = TraceLogger(log_dir=temp_log_dir, logger_name="AG02")
+        self._traza(logger1, "EXP-001")
+        assert logger1.get_stats()["total_entries"] == 3
+        self._traza(logger2, "EXP-001")
+        entries = logger1.get_traces_by_sinad("EXP-001")
+        assert [e.logger for e in entries] == ["AG01"] * 3 + ["AG02"] * 3
+
+    def test_linea_incompleta_se_indexa_despues(self, logger):
+        """Una última línea sin salto final no se indexa hasta completarse."""
+        self._traza(logger, "EXP-001")
+        linea = LogEntry("ts", "tid-x", "INFO", "ext", "externa", sinad="EXP-X").to_jsonl_line()
+        with open(logger.current_log_file, "a", encoding="utf-8") as f:
+            f.write(linea[:10])
+        assert logger.get_traces_by_sinad("EXP-X") == []
+        with open(logger.current_log_file, "a", encoding="utf-8") as f:
+            f.write(linea[10:] + "\n")
+        assert [e.message for e in logger.get_traces_by_sinad("EXP-X")] == ["externa"]
+
+    def test_archivo_truncado_o_borrado(self, logger):
+        ctx = self._traza(logger, "EXP-001")
+        assert logger.get_stats()["total_entries"] == 3
+        logger.close()
+
+        logger.current_log_file.write_text("", encoding="utf-8")
+        assert logger.get_trace(ctx.trace_id) == []
+        ctx2 = self._traza(logger, "EXP-002")
+        assert len(logger.get_trace(ctx2.trace_id)) == 3
+        logger.close()
+
+        logger.current_log_file.unlink()
+        assert logger.get_stats()["total_entries"] == 0
+
+    def test_lineas_corruptas_no_se_releen(self, logger, monkeypatch):
+        """El índice avanza también sobre líneas corruptas finales."""
+        self._traza(logger, "EXP-001")
+        with open(logger.current_log_file, "a", encoding="utf-8") as f:
+            f.write("CORRUPTA\n")
+        assert logger.get_stats()["total_entries"] == 3
+
+        def prohibido(*args):
+            raise AssertionError("no debería releer el archivo")
+
+        monkeypatch.setattr(TraceLogger, "_iter_raw", staticmethod(prohibido))
+        assert logger.get_stats()["total_entries"] == 3
+
+    def test_stats_coinciden_con_lectura_completa(self, logger):
+        self._traza(logger, "EXP-001", n=3)
+        logger.warning("Suelto")
+        logger.error("Falla", error="boom")
+        stats = logger.get_stats()
+        entries = logger._scan_entries()
+        assert stats["total_entries"] == len(entries)
+        assert stats["unique_traces"] == len({e.trace_id for e in entries})
+        assert stats["error_entries"] == 1
+        assert stats["level_counts"] == {"INFO": 5, "WARNING": 1, "ERROR": 1}
+
+
+class TestLogFilesCache:
+    """Tests para el listado cacheado de archivos JSONL."""
+
+    def test_reutiliza_listado_sin_cambios(self, logger, monkeypatch):
+        logger.info("Evento")
+        assert logger.get_stats()["log_files_count"] == 1
+
+        def glob_prohibido(*args):
+            raise AssertionError("no debería listar el directorio")
+
+        monkeypatch.setattr(Path, "glob", glob_prohibido)
+        logger.info("Otro evento")
+        stats = logger.get_stats()
+        assert stats["log_files_count"] == 1
+        assert stats["total_entries"] == 2
+
+    def test_archivo_nuevo_invalida(self, logger):
+        logger.info("Evento")
+        logger.flush()
+        assert len(logger._list_log_files()) == 1
+        otro = logger.log_dir / f"{logger.log_prefix}_2000-01-01.jsonl"
+        otro.write_text(logger.info("Viejo").to_jsonl_line() + "\n", encoding="utf-8")
+        archivos = logger._list_log_files()
+        assert archivos[0] == otro
+        assert logger.get_stats()["log_files_count"] == 2
+        otro.unlink()
+        assert logger._list_log_files() == [logger.current_log_file]
+
+
+class TestRecentTail:
+    """Tests para la lectura desde el final en get_recent_entries."""
+
+    def _escribir(self, path, mensajes, level="INFO"):
+        with open(path, "a", encoding="utf-8") as f:
+            for i, m in enumerate(mensajes):
+                ts = f"{path.stem[-10:]}T00:00:{i:02d}+00:00"
+                f.write(LogEntry(ts, "t", level, "test", m).to_jsonl_line() + "\n")
+
+    @pytest.mark.parametrize("bloque", [7, 64 * 1024])
+    def test_ultimas_n_con_bloques_cortos(self, logger, monkeypatch, bloque):
+        """Líneas partidas entre bloques se reconstruyen correctamente."""
+        from src.ingestion import trace_logger as mod
+
+        monkeypatch.setattr(mod, "TAIL_BLOCK_SIZE", bloque)
+        path = logger.log_dir / "trace_2026-01-01.jsonl"
+        self._escribir(path, [f"m{i} — ñ" for i in range(20)])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("CORRUPTA\n\n")
+
+        assert [e.message for e in logger.get_recent_entries(limit=3)] == [
+            "m17 — ñ",
+            "m18 — ñ",
+            "m19 — ñ",
+        ]
+        assert len(logger.get_recent_entries(limit=50)) == 20
+
+    def test_completa_con_archivos_anteriores(self, logger):
+        """Si el último archivo no alcanza, sigue con el anterior más reciente."""
+        self._escribir(logger.log_dir / "trace_2026-01-01.jsonl", ["a0", "a1", "a2"])
+        self._escribir(logger.log_dir / "trace_2026-01-02.jsonl", ["b0", "b1"])
+        recientes = logger.get_recent_entries(limit=4)
+        assert [e.message for e in recientes] == ["a1", "a2", "b0", "b1"]
+
+    def test_filtro_de_nivel_antes_de_contar(self, logger):
+        path = logger.log_dir / "trace_2026-01-01.jsonl"
+        self._escribir(path, ["w0", "w1"], level="WARNING")
+        self._escribir(path, [f"i{i}" for i in range(10)])
+        recientes = logger.get_recent_entries(limit=5, level="WARNING")
+        assert [e.message for e in recientes] == ["w0", "w1"]
+
+    def test_filtradas_no_construyen_logentry(self, logger, monkeypatch):
+        path = logger.log_dir / "trace_2026-01-01.jsonl"
+        self._escribir(path, [f"i{i}" for i in range(10)])
+        self._escribir(path, ["e0"], level="ERROR")
+        construidas = []
+        original = LogEntry.from_dict.__func__
+        monkeypatch.setattr(
+            LogEntry,
+            "from_dict",
+            classmethod(lambda cls, d: construidas.append(d) or original(cls, d)),
+        )
+        assert [e.message for e in logger.get_recent_entries(level="ERROR")] == ["e0"]
+        assert len(construidas) == 1
+
+    def test_no_lee_el_archivo_completo(self, logger, monkeypatch):
+        from src.ingestion import trace_logger as mod
+
+        monkeypatch.setattr(mod, "TAIL_BLOCK_SIZE", 256)
+        path = logger.log_dir / "trace_2026-01-01.jsonl"
+        self._escribir(path, [f"m{i}" for i in range(500)])
+        leidas = []
+        original = mod._loads_jsonl
+        monkeypatch.setattr(mod, "_loads_jsonl", lambda b: leidas.append(b) or original(b))
+        assert len(logger.get_recent_entries(limit=2)) == 2
+        assert len(leidas) < 10
+
+
 # ==============================================================================
 # TESTS: TraceLogger — set_agent
 # ==============================================================================
@@ -636,6 +1183,37 @@ class TestEdgeCases:
         entries = logger.get_trace(trace_id)
         assert len(entries) >= 2  # start + end, sin crash
 
+    def test_lineas_invalidas_no_detienen_lectura(self, logger):
+        """UTF-8 inválido o JSON que no es objeto se saltan como corruptos."""
+        ctx = logger.start_trace(sinad="EXP-001")
+        logger.end_trace()
+        with open(logger.current_log_file, "ab") as f:
+            f.write(b'{"message": "\xff\xfe"}\n[1, 2]\n"texto"\n')
+        logger.info("Después")
+        logger.flush()
+
+        assert len(logger._scan_entries()) == 3
+        assert len(logger.get_trace(ctx.trace_id)) == 2
+
+    @pytest.mark.parametrize("umbral", [0, 1 << 20])
+    def test_lectura_con_y_sin_mmap(self, logger, monkeypatch, umbral):
+        """Archivos grandes (mmap) y chicos (streaming) se leen igual."""
+        from src.ingestion import trace_logger as mod
+
+        monkeypatch.setattr(mod, "MMAP_READ_THRESHOLD", umbral)
+        ctx = logger.start_trace(sinad="EXP-001")
+        logger.info("Evento — ñ")
+        logger.end_trace()
+        final = LogEntry("ts", ctx.trace_id, "INFO", "ext", "sin salto final")
+        with open(logger.current_log_file, "ab") as f:
+            f.write(b"CORRUPTA\n\n" + final.to_jsonl_bytes())
+
+        mensajes = [e.message for e in logger._read_entries_from_file(logger.current_log_file)]
+        assert mensajes[1:] == ["Evento — ñ", mensajes[2], "sin salto final"]
+        assert len(mensajes) == 4
+        filtradas = logger._read_entries_from_file(logger.current_log_file, trace_id="otro")
+        assert filtradas == []
+
     def test_repr(self, logger):
         """__repr__ retorna string legible."""
         r = repr(logger)